@@ -11,8 +11,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.database.config import Base, DATABASE_URL
 from src.database.models import (
-    FileRegistry, StagingTennisCourt, DwhTennisCourt,
-    StagingCourtAvailability, DwhCourtAvailability
+    FileRegistry, EtlJob, StagingTennisCourt, DwhTennisCourt,
+    StagingCourtAvailability, DwhCourtAvailability, DwhAvailabilitySnapshot,
+    ParkScrapeState, ScrapeLease, DwhCourt, DwhSlotStatus, DwhCourtAvailabilitySlot,
+    DwhParkDayAvailability, DwhDataVersion, DwhAvailabilityChange, DwhSnapshotLoad
 )
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,41 @@
+"""record each snapshot loaded into the history
+
+Revision ID: add_availability_snapshot_loads
+Revises: add_availability_versions
+Create Date: 2025-09-09 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_availability_snapshot_loads'
+down_revision = 'add_availability_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'availability_snapshot_loads',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('file_hash', sa.String(64), nullable=False),
+        sa.Column('snapshot_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('loaded_at', sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint('file_hash', 'snapshot_time', name='uq_availability_snapshot_loads'),
+        schema='dwh'
+    )
+
+    # Snapshots already in the history; ones that loaded no rows left no trace
+    op.execute("""
+        INSERT INTO dwh.availability_snapshot_loads (file_hash, snapshot_time, rows, loaded_at)
+        SELECT file_hash, snapshot_time, count(*), now()
+        FROM dwh.availability_snapshots
+        GROUP BY file_hash, snapshot_time
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('availability_snapshot_loads', schema='dwh')
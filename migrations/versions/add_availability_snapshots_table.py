@@ -0,0 +1,40 @@
+"""add availability snapshots history table
+
+Revision ID: add_availability_snapshots
+Revises: add_etl_jobs_table
+Create Date: 2025-08-13 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_availability_snapshots'
+down_revision = 'add_etl_jobs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'availability_snapshots',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('snapshot_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('park_id', sa.String(50), nullable=False),
+        sa.Column('court_id', sa.String(50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('reservation_link', sa.String(500), nullable=True),
+        sa.Column('file_hash', sa.String(64), nullable=False),
+        schema='dwh'
+    )
+    op.create_index('ix_availability_snapshots_snapshot_time', 'availability_snapshots', ['snapshot_time'], schema='dwh')
+    op.create_index('ix_availability_snapshots_file_hash', 'availability_snapshots', ['file_hash'], schema='dwh')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_availability_snapshots_file_hash', table_name='availability_snapshots', schema='dwh')
+    op.drop_index('ix_availability_snapshots_snapshot_time', table_name='availability_snapshots', schema='dwh')
+    op.drop_table('availability_snapshots', schema='dwh')
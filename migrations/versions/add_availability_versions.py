@@ -0,0 +1,51 @@
+"""data versions and per-version availability changes
+
+Revision ID: add_availability_versions
+Revises: add_park_day_availability
+Create Date: 2025-09-02 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_availability_versions'
+down_revision = 'add_park_day_availability'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('version', sa.BigInteger(), primary_key=True),
+        sa.Column('file_ids', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('changes', sa.Integer(), nullable=False, server_default='0'),
+        schema='dwh'
+    )
+    op.create_table(
+        'availability_changes',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('version', sa.BigInteger(),
+                  sa.ForeignKey('dwh.data_versions.version', ondelete='CASCADE'), nullable=False),
+        sa.Column('park_id', sa.String(50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('court_id', sa.String(50), nullable=False),
+        sa.Column('time', sa.String(50), nullable=False),
+        sa.Column('change', sa.String(10), nullable=False),
+        sa.Column('slot', postgresql.JSONB(), nullable=True),
+        schema='dwh'
+    )
+    op.create_index('ix_availability_changes_version', 'availability_changes', ['version'], schema='dwh')
+
+    # The read model as it stands is version 1; clients start from a full snapshot
+    op.execute("INSERT INTO dwh.data_versions (file_ids, published_at, changes) VALUES (NULL, now(), 0)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_availability_changes_version', table_name='availability_changes', schema='dwh')
+    op.drop_table('availability_changes', schema='dwh')
+    op.drop_table('data_versions', schema='dwh')
@@ -0,0 +1,238 @@
+"""store current availability in compact encoded tables
+
+Revision ID: add_compact_court_availability
+Revises: add_scrape_leases
+Create Date: 2025-08-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_compact_court_availability'
+down_revision = 'add_scrape_leases'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copies of the statements in src/database/views.py as of this
+# revision; importing them would let later edits rewrite this migration
+FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION dwh.parse_slot_time(slot_time text) RETURNS smallint
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT (
+            (split_part(slot_time, ':', 1)::int % 12
+             + CASE WHEN lower(slot_time) LIKE '%p%' THEN 12 ELSE 0 END) * 60
+            + substring(slot_time FROM ':([0-9]{2})')::int
+        )::smallint
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION dwh.format_slot_time(minutes smallint) RETURNS text
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT (CASE WHEN minutes / 60 % 12 = 0 THEN 12 ELSE minutes / 60 % 12 END)::text
+            || ':' || lpad((minutes % 60)::text, 2, '0')
+            || CASE WHEN minutes < 720 THEN ' a.m.' ELSE ' p.m.' END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION dwh.reservation_id(link text) RETURNS integer
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT substring(link FROM '^https://www[.]nycgovparks[.]org/tennisreservation/reserve/([0-9]{1,9})$')::integer
+    $$
+    """,
+]
+
+VIEW = [
+    """
+    CREATE OR REPLACE VIEW dwh.court_availability AS
+    SELECT
+        s.id,
+        tc.park_id,
+        c.court_id,
+        s.date,
+        dwh.format_slot_time(s.slot_time) AS time,
+        st.status,
+        COALESCE('https://www.nycgovparks.org/tennisreservation/reserve/' || s.reservation_id, s.reservation_link) AS reservation_link,
+        s.is_available,
+        s.last_updated
+    FROM dwh.court_availability_slots s
+    JOIN dwh.courts c ON c.id = s.court_key
+    JOIN dwh.tennis_courts tc ON tc.id = c.park_key
+    JOIN dwh.slot_statuses st ON st.id = s.status_id
+    """,
+    """
+    CREATE OR REPLACE FUNCTION dwh.court_availability_write() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        v_park_key integer;
+        v_court_key integer;
+        v_status_id smallint;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM dwh.court_availability_slots WHERE id = OLD.id;
+            RETURN OLD;
+        END IF;
+
+        SELECT id INTO v_park_key FROM dwh.tennis_courts WHERE park_id = NEW.park_id;
+        IF v_park_key IS NULL THEN
+            RAISE foreign_key_violation USING MESSAGE = format('Unknown park_id %s', NEW.park_id);
+        END IF;
+        INSERT INTO dwh.courts (park_key, court_id) VALUES (v_park_key, NEW.court_id)
+            ON CONFLICT (park_key, court_id) DO NOTHING;
+        SELECT id INTO v_court_key FROM dwh.courts WHERE park_key = v_park_key AND court_id = NEW.court_id;
+        INSERT INTO dwh.slot_statuses (status) VALUES (NEW.status) ON CONFLICT (status) DO NOTHING;
+        SELECT id INTO v_status_id FROM dwh.slot_statuses WHERE status = NEW.status;
+
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO dwh.court_availability_slots (
+                court_key, date, slot_time, status_id, reservation_id, reservation_link,
+                is_available, last_updated
+            ) VALUES (
+                v_court_key, NEW.date, dwh.parse_slot_time(NEW.time), v_status_id,
+                dwh.reservation_id(NEW.reservation_link),
+                CASE WHEN dwh.reservation_id(NEW.reservation_link) IS NULL THEN NEW.reservation_link END,
+                COALESCE(NEW.is_available, false), COALESCE(NEW.last_updated, now())
+            ) RETURNING id INTO NEW.id;
+        ELSE
+            UPDATE dwh.court_availability_slots SET
+                court_key = v_court_key,
+                date = NEW.date,
+                slot_time = dwh.parse_slot_time(NEW.time),
+                status_id = v_status_id,
+                reservation_id = dwh.reservation_id(NEW.reservation_link),
+                reservation_link = CASE WHEN dwh.reservation_id(NEW.reservation_link) IS NULL
+                    THEN NEW.reservation_link END,
+                is_available = NEW.is_available,
+                last_updated = COALESCE(NEW.last_updated, now())
+            WHERE id = OLD.id;
+        END IF;
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER court_availability_write
+    INSTEAD OF INSERT OR UPDATE OR DELETE ON dwh.court_availability
+    FOR EACH ROW EXECUTE FUNCTION dwh.court_availability_write()
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'slot_statuses',
+        sa.Column('id', sa.SmallInteger(), primary_key=True),
+        sa.Column('status', sa.String(50), nullable=False, unique=True),
+        schema='dwh'
+    )
+    op.create_table(
+        'courts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('park_key', sa.Integer(), sa.ForeignKey('dwh.tennis_courts.id'), nullable=False),
+        sa.Column('court_id', sa.String(50), nullable=False),
+        sa.UniqueConstraint('park_key', 'court_id', name='uq_courts_park_court'),
+        schema='dwh'
+    )
+    op.create_table(
+        'court_availability_slots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('court_key', sa.Integer(), sa.ForeignKey('dwh.courts.id'), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('slot_time', sa.SmallInteger(), nullable=False),
+        sa.Column('status_id', sa.SmallInteger(), sa.ForeignKey('dwh.slot_statuses.id'), nullable=False),
+        sa.Column('reservation_id', sa.Integer(), nullable=True),
+        sa.Column('reservation_link', sa.String(500), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=False),
+        sa.Column('last_updated', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('court_key', 'date', 'slot_time', name='uq_court_availability_slots'),
+        schema='dwh'
+    )
+    op.create_index(
+        'ix_court_availability_slots_date', 'court_availability_slots', ['date'], schema='dwh'
+    )
+    for statement in FUNCTIONS:
+        op.execute(statement)
+
+    # Encode the existing rows, keeping their IDs
+    op.execute("""
+        INSERT INTO dwh.courts (park_key, court_id)
+        SELECT DISTINCT tc.id, ca.court_id
+        FROM dwh.court_availability ca
+        JOIN dwh.tennis_courts tc ON tc.park_id = ca.park_id
+    """)
+    op.execute("""
+        INSERT INTO dwh.slot_statuses (status)
+        SELECT DISTINCT status FROM dwh.court_availability
+    """)
+    op.execute("""
+        INSERT INTO dwh.court_availability_slots (
+            id, court_key, date, slot_time, status_id, reservation_id, reservation_link,
+            is_available, last_updated
+        )
+        SELECT DISTINCT ON (c.id, ca.date, dwh.parse_slot_time(ca.time))
+            ca.id, c.id, ca.date, dwh.parse_slot_time(ca.time), st.id,
+            dwh.reservation_id(ca.reservation_link),
+            CASE WHEN dwh.reservation_id(ca.reservation_link) IS NULL THEN ca.reservation_link END,
+            ca.is_available, ca.last_updated
+        FROM dwh.court_availability ca
+        JOIN dwh.tennis_courts tc ON tc.park_id = ca.park_id
+        JOIN dwh.courts c ON c.park_key = tc.id AND c.court_id = ca.court_id
+        JOIN dwh.slot_statuses st ON st.status = ca.status
+        ORDER BY c.id, ca.date, dwh.parse_slot_time(ca.time), ca.last_updated DESC NULLS LAST
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('dwh.court_availability_slots', 'id'),
+                      COALESCE((SELECT max(id) FROM dwh.court_availability_slots), 0) + 1, false)
+    """)
+
+    op.drop_table('court_availability', schema='dwh')
+    for statement in VIEW:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW dwh.court_availability")
+    op.execute("DROP FUNCTION dwh.court_availability_write()")
+
+    op.create_table(
+        'court_availability',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('park_id', sa.String(50), sa.ForeignKey('dwh.tennis_courts.park_id', name='fk_court_availability_park_id'), nullable=False),
+        sa.Column('court_id', sa.String(50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('reservation_link', sa.String(500), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=False),
+        sa.Column('last_updated', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('park_id', 'court_id', 'date', 'time', name='uix_court_availability'),
+        schema='dwh'
+    )
+    op.execute("""
+        INSERT INTO dwh.court_availability (
+            id, park_id, court_id, date, time, status, reservation_link, is_available, last_updated
+        )
+        SELECT
+            s.id, tc.park_id, c.court_id, s.date, dwh.format_slot_time(s.slot_time), st.status,
+            COALESCE('https://www.nycgovparks.org/tennisreservation/reserve/' || s.reservation_id, s.reservation_link),
+            s.is_available, s.last_updated
+        FROM dwh.court_availability_slots s
+        JOIN dwh.courts c ON c.id = s.court_key
+        JOIN dwh.tennis_courts tc ON tc.id = c.park_key
+        JOIN dwh.slot_statuses st ON st.id = s.status_id
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('dwh.court_availability', 'id'),
+                      COALESCE((SELECT max(id) FROM dwh.court_availability), 0) + 1, false)
+    """)
+
+    op.drop_index('ix_court_availability_slots_date', table_name='court_availability_slots', schema='dwh')
+    op.drop_table('court_availability_slots', schema='dwh')
+    op.drop_table('courts', schema='dwh')
+    op.drop_table('slot_statuses', schema='dwh')
+    op.execute("DROP FUNCTION dwh.reservation_id(text)")
+    op.execute("DROP FUNCTION dwh.format_slot_time(smallint)")
+    op.execute("DROP FUNCTION dwh.parse_slot_time(text)")
@@ -0,0 +1,40 @@
+"""add etl jobs table
+
+Revision ID: add_etl_jobs_table
+Revises: update_schema_park_court
+Create Date: 2025-08-12 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_etl_jobs_table'
+down_revision = 'update_schema_park_court'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'etl_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_type', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('attached_requests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        schema='raw_files'
+    )
+
+    # Attaching requests look up the in-flight job by status
+    op.create_index('ix_etl_jobs_status', 'etl_jobs', ['status'], schema='raw_files')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_etl_jobs_status', table_name='etl_jobs', schema='raw_files')
+    op.drop_table('etl_jobs', schema='raw_files')
@@ -0,0 +1,24 @@
+"""add archive path to file registry
+
+Revision ID: add_file_registry_archive_path
+Revises: add_availability_snapshots
+Create Date: 2025-08-14 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_file_registry_archive_path'
+down_revision = 'add_availability_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('file_registry', sa.Column('archive_path', sa.String(1000), nullable=True), schema='raw_files')
+
+
+def downgrade() -> None:
+    op.drop_column('file_registry', 'archive_path', schema='raw_files')
@@ -0,0 +1,65 @@
+"""per-park, per-day availability read model
+
+Revision ID: add_park_day_availability
+Revises: partition_availability_staging
+Create Date: 2025-08-26 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_park_day_availability'
+down_revision = 'partition_availability_staging'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'park_day_availability',
+        sa.Column('park_id', sa.String(50), primary_key=True),
+        sa.Column('date', sa.Date(), primary_key=True),
+        sa.Column('slots', postgresql.JSONB(), nullable=False),
+        sa.Column('slot_count', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(32), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        schema='dwh'
+    )
+
+    # Backfill from the current slots
+    op.execute("""
+        INSERT INTO dwh.park_day_availability (park_id, date, slots, slot_count, content_hash, updated_at)
+        SELECT park_id, date, slots, slot_count, md5(slots::text), now()
+        FROM (
+            SELECT
+                tc.park_id,
+                s.date,
+                jsonb_agg(jsonb_build_object(
+                    'court_id', c.court_id,
+                    'time', dwh.format_slot_time(s.slot_time),
+                    'bucket', CASE
+                        WHEN s.slot_time < 720 THEN 'morning'
+                        WHEN s.slot_time < 1020 THEN 'afternoon'
+                        ELSE 'evening'
+                    END,
+                    'status', st.status,
+                    'reservation_link', COALESCE('https://www.nycgovparks.org/tennisreservation/reserve/' || s.reservation_id, s.reservation_link)
+                ) ORDER BY c.court_id, s.slot_time) AS slots,
+                count(*) AS slot_count
+            FROM dwh.tennis_courts tc
+            JOIN dwh.courts c ON c.park_key = tc.id
+            JOIN dwh.court_availability_slots s ON s.court_key = c.id
+            JOIN dwh.slot_statuses st ON st.id = s.status_id
+            WHERE s.date >= current_date
+              AND s.is_available
+              AND (s.reservation_id IS NOT NULL OR s.reservation_link IS NOT NULL)
+            GROUP BY tc.park_id, s.date
+        ) park_days
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('park_day_availability', schema='dwh')
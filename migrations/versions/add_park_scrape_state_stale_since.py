@@ -0,0 +1,24 @@
+"""add stale_since to park scrape state
+
+Revision ID: add_park_scrape_stale_since
+Revises: add_park_scrape_state
+Create Date: 2025-08-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_park_scrape_stale_since'
+down_revision = 'add_park_scrape_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('park_scrape_state', sa.Column('stale_since', sa.DateTime(timezone=True), nullable=True), schema='dwh')
+
+
+def downgrade() -> None:
+    op.drop_column('park_scrape_state', 'stale_since', schema='dwh')
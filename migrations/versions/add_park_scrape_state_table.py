@@ -0,0 +1,32 @@
+"""add park scrape state table
+
+Revision ID: add_park_scrape_state
+Revises: add_file_registry_archive_path
+Create Date: 2025-08-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_park_scrape_state'
+down_revision = 'add_file_registry_archive_path'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'park_scrape_state',
+        sa.Column('park_id', sa.String(50), primary_key=True),
+        sa.Column('last_scraped_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_changed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('change_rate', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('slot_keys', sa.Text(), nullable=True),
+        schema='dwh'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('park_scrape_state', schema='dwh')
@@ -0,0 +1,42 @@
+"""add scrape leases table
+
+Revision ID: add_scrape_leases
+Revises: add_park_scrape_stale_since
+Create Date: 2025-08-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_scrape_leases'
+down_revision = 'add_park_scrape_stale_since'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scrape_leases',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('file_id', sa.Integer(), sa.ForeignKey('raw_files.file_registry.id'), nullable=False),
+        sa.Column('park_id', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False, server_default='pending'),
+        sa.Column('worker_id', sa.String(200), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('file_id', 'park_id', name='uq_scrape_leases_file_park'),
+        schema='raw_files'
+    )
+    op.create_index(
+        'ix_scrape_leases_file_status', 'scrape_leases', ['file_id', 'status'], schema='raw_files'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scrape_leases_file_status', table_name='scrape_leases', schema='raw_files')
+    op.drop_table('scrape_leases', schema='raw_files')
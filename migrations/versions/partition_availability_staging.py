@@ -0,0 +1,48 @@
+"""unlogged per-file availability staging
+
+Revision ID: partition_availability_staging
+Revises: add_compact_court_availability
+Create Date: 2025-08-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_availability_staging'
+down_revision = 'add_compact_court_availability'
+branch_labels = None
+depends_on = None
+
+
+def _create_availability_staging(partitioned: bool) -> None:
+    # A partitioned table's primary key has to include the partition key
+    op.create_table(
+        'court_availability',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('park_id', sa.String(50), sa.ForeignKey('dwh.tennis_courts.park_id'), nullable=False),
+        sa.Column('court_id', sa.String(50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('reservation_link', sa.String(500), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=False),
+        sa.Column('file_id', sa.Integer(), sa.ForeignKey('raw_files.file_registry.id'),
+                  primary_key=partitioned, nullable=False),
+        schema='staging',
+        postgresql_partition_by='LIST (file_id)' if partitioned else None
+    )
+
+
+def upgrade() -> None:
+    # Staging only holds in-flight loads, so it is rebuilt rather than converted
+    op.drop_table('court_availability', schema='staging')
+    _create_availability_staging(partitioned=True)
+    op.execute("ALTER TABLE staging.tennis_courts SET UNLOGGED")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE staging.tennis_courts SET LOGGED")
+    op.drop_table('court_availability', schema='staging')
+    _create_availability_staging(partitioned=False)
@@ -3,10 +3,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import text
-from src.database.config import SessionLocal
+from src.database.config import ReaderSession
 
 def check_availability():
-    session = SessionLocal()
+    session = ReaderSession()
     try:
         # Query latest availability data
         result = session.execute(text("""
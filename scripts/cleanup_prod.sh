@@ -9,6 +9,7 @@ source .env
 # Run cleanup processes
 DB_NAME=nyc_tennis_prod python -c "
 from src.etl.csv_loader import cleanup_old_availability, cleanup_processed_files
+from src.etl.archive import archive_processed_files
 from src.database.config import SessionLocal
 
 session = SessionLocal()
@@ -19,6 +20,10 @@ try:
     print('Cleaning up expired availability slots...')
     cleanup_old_availability(session)
     
+    # Compact processed files into daily Parquet archives before they are deleted
+    print('Archiving processed files...')
+    archive_processed_files(session, days_threshold=7)
+    
     # Clean up old processed files (14 days in production)
     print('Cleaning up old processed files...')
     cleanup_processed_files(session, days_threshold=14)
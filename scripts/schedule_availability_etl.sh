@@ -27,7 +27,9 @@ fi
 # Run the ETL process
 cd "$PROJECT_ROOT"
 echo "Running ETL process..."
-python -m src.etl.run_availability_etl
+# The job runner attaches to an in-flight availability load, and waits for
+# any other running job to finish before starting this one
+python -m src.etl.job_runner submit availability
 
 # Capture the exit status
 ETL_STATUS=$?
@@ -0,0 +1,24 @@
+import { NextResponse } from 'next/server';
+import { getAvailabilitySync, getDataVersion } from '@/utils/database';
+import { conditionalJson, dataDay } from '@/utils/httpCache';
+
+// GET /api/availability-sync?since=<version>
+// Returns the slot changes since the client's data version, or a full
+// snapshot when there is no usable version; either way with the version
+// to send next time. Answers 304 while the data version and day are unchanged.
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const sinceParam = searchParams.get('since');
+    const since = sinceParam !== null && /^\d+$/.test(sinceParam) ? parseInt(sinceParam, 10) : null;
+
+    const etag = `W/"v${await getDataVersion()}-${dataDay()}-since-${since ?? 'none'}"`;
+    return await conditionalJson(request, etag, async () => JSON.stringify(await getAvailabilitySync(since)));
+  } catch (error) {
+    console.error('Error syncing availability:', error);
+    return NextResponse.json(
+      { error: 'Failed to sync availability' },
+      { status: 500 }
+    );
+  }
+}
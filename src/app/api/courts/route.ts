@@ -1,6 +1,10 @@
 import { NextResponse } from 'next/server';
-import { getAllCourts, getCourtAvailability } from '@/utils/database';
+import { getAllCourts, getParkDayAvailability } from '@/utils/database';
+import { conditionalJson, contentETag } from '@/utils/httpCache';
 
+// Responses carry an ETag and answer a matching If-None-Match with 304, so
+// clients that already have the data get it revalidated without a body.
+// ?projection=slim leaves park_details, hours and email out of the court list.
 export async function GET(request: Request) {
   try {
     const { searchParams } = new URL(request.url);
@@ -9,13 +13,16 @@ export async function GET(request: Request) {
 
     // If parkId and date are provided, return availability
     if (parkId && date) {
-      const availability = await getCourtAvailability(parkId, date);
-      return NextResponse.json(availability);
+      const { slots, contentHash } = await getParkDayAvailability(parkId, date);
+      // The read model's hash changes exactly when the park-day's slots do
+      const etag = `W/"${contentHash ?? 'none'}"`;
+      return await conditionalJson(request, etag, () => JSON.stringify(slots));
     }
 
     // Otherwise return all courts
-    const courts = await getAllCourts();
-    return NextResponse.json(courts);
+    const projection = searchParams.get('projection') === 'slim' ? 'slim' : 'full';
+    const body = JSON.stringify(await getAllCourts(projection));
+    return await conditionalJson(request, contentETag(body), () => body);
   } catch (error) {
     console.error('Error fetching courts:', error);
     return NextResponse.json(
@@ -23,4 +30,4 @@ export async function GET(request: Request) {
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
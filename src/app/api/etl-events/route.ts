@@ -0,0 +1,66 @@
+import { getDataVersion } from '@/utils/database';
+import { EtlEvent, subscribeToEtlEvents } from '@/utils/etlEvents';
+
+// Streams must not be cached or rendered at build time
+export const dynamic = 'force-dynamic';
+
+// Proxies drop connections that stay silent for too long
+const HEARTBEAT_MS = 25 * 1000;
+
+// GET /api/etl-events
+// Server-sent events relayed from the ETL's NOTIFYs: a `version` event with
+// the current data version on connect, then a `published` event for every
+// new version and `progress` events while a run is going.
+export async function GET(request: Request) {
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      let closed = false;
+      const write = (chunk: string) => {
+        if (!closed) {
+          controller.enqueue(encoder.encode(chunk));
+        }
+      };
+      const send = (event: EtlEvent) => write(`event: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`);
+
+      // Subscribe before reading the version so nothing published in between is missed
+      const unsubscribe = subscribeToEtlEvents(send);
+      const heartbeat = setInterval(() => write(': keep-alive\n\n'), HEARTBEAT_MS);
+      cleanup = () => {
+        if (closed) {
+          return;
+        }
+        closed = true;
+        clearInterval(heartbeat);
+        unsubscribe();
+        try {
+          controller.close();
+        } catch {
+          // Already closed by the client going away
+        }
+      };
+      request.signal.addEventListener('abort', () => cleanup());
+
+      try {
+        send({ type: 'version', version: await getDataVersion() });
+      } catch (error) {
+        console.error('Error reading data version for ETL events:', error);
+      }
+    },
+    cancel() {
+      cleanup();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+      // Stop nginx from buffering the stream
+      'X-Accel-Buffering': 'no',
+    },
+  });
+}
@@ -36,134 +36,178 @@ function getCleanPythonEnv(projectRoot: string): NodeJS.ProcessEnv {
   return cleanEnv;
 }
 
-export async function POST() {
+const JOB_STATUS_PATTERN = /^ETL job status: (.+)$/m;
+
+interface EtlJobStatus {
+  job_id: number;
+  job_type: string;
+  status: 'running' | 'succeeded' | 'failed';
+  attached_requests: number;
+  details: Record<string, unknown> | null;
+  error: string | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+async function getPythonCommand(projectRoot: string): Promise<string> {
+  // Try to use virtual environment first, fall back to system Python
+  const pythonPath = `${projectRoot}/venv/bin/python`;
   try {
-    // Get the project root directory
-    const projectRoot = process.cwd();
-    
-    // Check if virtual environment exists
-    const venvPath = `${projectRoot}/venv`;
-    const pythonPath = `${venvPath}/bin/python`;
-    
-    // Determine the Python command to use
-    let pythonCommand: string;
-    let args: string[];
-    
-    try {
-      // Try to use virtual environment first
-      await execAsync(`test -f "${pythonPath}"`);
-      pythonCommand = pythonPath;
-      args = ['src/court_availability_finder.py'];
-    } catch {
-      // Fall back to system Python
-      pythonCommand = 'python3';
-      args = ['src/court_availability_finder.py'];
-    }
+    await execAsync(`test -f "${pythonPath}"`);
+    return pythonPath;
+  } catch {
+    return 'python3';
+  }
+}
 
-    // Run the existing ETL process
-    const result = await new Promise<{ success: boolean; message: string; error?: string; details?: string }>((resolve) => {
-      const pythonProcess = spawn(pythonCommand, args, {
-        cwd: projectRoot,
-        stdio: 'pipe',
-        env: getCleanPythonEnv(projectRoot)
-      });
+function parseJobStatus(output: string): EtlJobStatus | null {
+  const match = output.match(JOB_STATUS_PATTERN);
+  if (!match) {
+    return null;
+  }
+  try {
+    return JSON.parse(match[1]) as EtlJobStatus;
+  } catch {
+    return null;
+  }
+}
 
-      let stdout = '';
-      let stderr = '';
+async function runJobRunner(
+  args: string[],
+  timeoutMs: number
+): Promise<{ code: number | null; stdout: string; stderr: string; timedOut: boolean }> {
+  const projectRoot = process.cwd();
+  const pythonCommand = await getPythonCommand(projectRoot);
+
+  return new Promise((resolve) => {
+    const pythonProcess = spawn(pythonCommand, ['-m', 'src.etl.job_runner', ...args], {
+      cwd: projectRoot,
+      stdio: 'pipe',
+      env: getCleanPythonEnv(projectRoot)
+    });
 
-      pythonProcess.stdout?.on('data', (data) => {
-        stdout += data.toString();
-      });
+    let stdout = '';
+    let stderr = '';
+    let settled = false;
 
-      pythonProcess.stderr?.on('data', (data) => {
-        stderr += data.toString();
-      });
+    pythonProcess.stdout?.on('data', (data) => {
+      stdout += data.toString();
+    });
 
-      pythonProcess.on('close', (code) => {
-        if (code === 0) {
-          // Parse the stdout to extract useful information
-          const output = stdout.trim();
-          const collectedNoData =
-            output.includes('No availability data collected!') ||
-            output.includes('Total available slots collected: 0');
-
-          if (collectedNoData) {
-            resolve({
-              success: false,
-              message: 'ETL completed but collected no availability data',
-              error: output || 'No availability data collected'
-            });
-            return;
-          }
-
-          let details = '';
-          
-          // Look for specific patterns in the output
-          if (output.includes('Successfully scraped')) {
-            const match = output.match(/Successfully scraped (\d+) courts/);
-            if (match) {
-              details = `Scraped data from ${match[1]} courts`;
-            }
-          }
-          
-          if (output.includes('Generated CSV file')) {
-            const match = output.match(/Generated CSV file: (.+)/);
-            if (match) {
-              details += details ? ` | CSV: ${match[1]}` : `CSV: ${match[1]}`;
-            }
-          }
-          
-          if (output.includes('ETL process completed successfully')) {
-            details += details ? ' | Database updated' : 'Database updated';
-          }
-          
-          resolve({
-            success: true,
-            message: `Data scraping completed successfully`,
-            details: details || output
-          });
-        } else {
-          resolve({
-            success: false,
-            message: `ETL process failed with exit code ${code}`,
-            error: stderr || stdout
-          });
-        }
-      });
+    pythonProcess.stderr?.on('data', (data) => {
+      stderr += data.toString();
+    });
 
-      pythonProcess.on('error', (error) => {
-        resolve({
-          success: false,
-          message: 'Failed to start ETL process',
-          error: error.message
-        });
-      });
+    // Set a timeout to prevent hanging
+    const timer = setTimeout(() => {
+      pythonProcess.kill();
+      if (!settled) {
+        settled = true;
+        resolve({ code: null, stdout, stderr, timedOut: true });
+      }
+    }, timeoutMs);
+
+    pythonProcess.on('close', (code) => {
+      clearTimeout(timer);
+      if (!settled) {
+        settled = true;
+        resolve({ code, stdout, stderr, timedOut: false });
+      }
+    });
 
-      // Set a timeout to prevent hanging
-      setTimeout(() => {
-        pythonProcess.kill();
-        resolve({
-          success: false,
-          message: 'ETL process timed out after 10 minutes',
-          error: 'Process exceeded maximum execution time'
-        });
-      }, 10 * 60 * 1000); // 10 minutes timeout
+    pythonProcess.on('error', (error) => {
+      clearTimeout(timer);
+      if (!settled) {
+        settled = true;
+        resolve({ code: null, stdout, stderr: error.message, timedOut: false });
+      }
     });
+  });
+}
+
+export async function POST() {
+  try {
+    // Run the refresh through the single-flight job runner. If a refresh is
+    // already in flight, this request attaches to it instead; any other job,
+    // such as the hourly ETL, is waited for first.
+    const result = await runJobRunner(['submit', 'refresh'], 10 * 60 * 1000);
+
+    if (result.timedOut) {
+      return NextResponse.json({
+        success: false,
+        error: 'ETL process timed out after 10 minutes'
+      }, { status: 500 });
+    }
+
+    const output = result.stdout.trim();
+    const job = parseJobStatus(output);
+    const attached = output.includes('Attached to running ETL job');
+
+    if (result.code === 0 && job) {
+      const collectedNoData =
+        output.includes('No availability data collected!') ||
+        output.includes('Total available slots collected: 0');
+
+      if (collectedNoData) {
+        return NextResponse.json({
+          success: false,
+          jobId: job.job_id,
+          error: 'ETL completed but collected no availability data'
+        }, { status: 500 });
+      }
 
-    if (result.success) {
       return NextResponse.json({
         success: true,
-        message: result.message
+        jobId: job.job_id,
+        attached,
+        message: attached
+          ? 'Joined the data refresh that was already running'
+          : 'Data scraping completed successfully',
+        details: job.details ? JSON.stringify(job.details) : undefined
       });
-    } else {
+    }
+
+    return NextResponse.json({
+      success: false,
+      jobId: job?.job_id,
+      error: job?.error || result.stderr || output || `ETL process failed with exit code ${result.code}`
+    }, { status: 500 });
+
+  } catch (error) {
+    console.error('Error in ETL refresh API:', error);
+    return NextResponse.json({
+      success: false,
+      error: error instanceof Error ? error.message : 'Unknown error occurred'
+    }, { status: 500 });
+  }
+}
+
+export async function GET(request: Request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const jobId = searchParams.get('jobId');
+
+    if (!jobId || !/^\d+$/.test(jobId)) {
       return NextResponse.json({
         success: false,
-        error: result.error || result.message
-      }, { status: 500 });
+        error: 'A numeric jobId query parameter is required'
+      }, { status: 400 });
     }
 
+    const result = await runJobRunner(['status', jobId], 30 * 1000);
+    const job = parseJobStatus(result.stdout);
+
+    if (!job) {
+      return NextResponse.json({
+        success: false,
+        error: result.timedOut ? 'Status lookup timed out' : `ETL job ${jobId} not found`
+      }, { status: result.timedOut ? 500 : 404 });
+    }
+
+    return NextResponse.json({ success: true, job });
   } catch (error) {
-    console.error('Error in ETL refresh API:', error);
+    console.error('Error in ETL job status API:', error);
     return NextResponse.json({
       success: false,
       error: error instanceof Error ? error.message : 'Unknown error occurred'
@@ -2,6 +2,8 @@ import { NextResponse } from 'next/server';
 import { spawn } from 'child_process';
 import { promisify } from 'util';
 import { exec } from 'child_process';
+import { getDataVersion } from '@/utils/database';
+import { REVALIDATE, dataDay, etagMatches } from '@/utils/httpCache';
 
 const execAsync = promisify(exec);
 const PROXY_ENV_KEYS = [
@@ -44,8 +46,16 @@ interface ParkAvailability {
   last_updated: string;
 }
 
-export async function GET() {
+export async function GET(request: Request) {
   try {
+    // Summaries only change with the data version or the day, so a client
+    // that has the current ones is answered before Python is started
+    const etag = `W/"v${await getDataVersion()}-${dataDay()}"`;
+    const cacheHeaders = { ETag: etag, 'Cache-Control': REVALIDATE };
+    if (etagMatches(request.headers.get('if-none-match'), etag)) {
+      return new NextResponse(null, { status: 304, headers: cacheHeaders });
+    }
+
     // Get the project root directory
     const projectRoot = process.cwd();
     
@@ -66,12 +76,12 @@ import sys
 import os
 sys.path.insert(0, '${projectRoot}')
 
-from src.database.config import SessionLocal
+from src.database.config import ReaderSession
 from sqlalchemy import text
 from datetime import datetime
 
 def get_park_availability():
-    session = SessionLocal()
+    session = ReaderSession()
     try:
         # Query to get availability counts for each park
         result = session.execute(text("""
@@ -115,12 +125,12 @@ import sys
 import os
 sys.path.insert(0, '${projectRoot}')
 
-from src.database.config import SessionLocal
+from src.database.config import ReaderSession
 from sqlalchemy import text
 from datetime import datetime
 
 def get_park_availability():
-    session = SessionLocal()
+    session = ReaderSession()
     try:
         # Query to get availability counts for each park
         result = session.execute(text("""
@@ -220,7 +230,7 @@ if __name__ == "__main__":
       return NextResponse.json({
         success: true,
         parks: result.data
-      });
+      }, { headers: cacheHeaders });
     } else {
       return NextResponse.json({
         success: false,
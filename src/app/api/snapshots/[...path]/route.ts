@@ -0,0 +1,69 @@
+import { NextResponse } from 'next/server';
+import { readFile } from 'fs/promises';
+import path from 'path';
+
+// Serves the snapshot the ETL exports (src/etl/snapshot_export.py). Files
+// written after the server started can't be served from public/, so they
+// are read from the export directory on every request.
+export const dynamic = 'force-dynamic';
+
+const MANIFEST = 'manifest.json';
+// Content-hashed data files, e.g. files/park-12-0123456789abcdef.json
+const DATA_FILE = /^files\/[A-Za-z0-9_.-]+-[0-9a-f]{16}\.json$/;
+
+// Precompressed variants written next to each data file, most compact first
+const ENCODINGS: [string, string][] = [['br', '.br'], ['gzip', '.gz']];
+
+function exportDir(): string | null {
+  const dir = process.env.SNAPSHOT_EXPORT_DIR ?? path.join(process.cwd(), 'data', 'snapshots');
+  return dir || null;
+}
+
+function notFound() {
+  return NextResponse.json({ error: 'Snapshot file not found' }, { status: 404 });
+}
+
+// GET /api/snapshots/manifest.json, /api/snapshots/files/<name>
+export async function GET(request: Request, { params }: { params: { path: string[] } }) {
+  const dir = exportDir();
+  const name = params.path.join('/');
+  if (!dir || (name !== MANIFEST && !DATA_FILE.test(name))) {
+    return notFound();
+  }
+  const file = path.join(dir, name);
+
+  if (name === MANIFEST) {
+    try {
+      // Replaced in place by every export, so clients check back each time
+      return new NextResponse(await readFile(file), {
+        headers: { 'Content-Type': 'application/json', 'Cache-Control': 'no-cache' },
+      });
+    } catch {
+      return notFound();
+    }
+  }
+
+  const headers = {
+    'Content-Type': 'application/json',
+    'Cache-Control': 'public, max-age=31536000, immutable',
+    Vary: 'Accept-Encoding',
+  };
+  const accepted = request.headers.get('accept-encoding') ?? '';
+  for (const [encoding, suffix] of ENCODINGS) {
+    if (!accepted.includes(encoding)) {
+      continue;
+    }
+    try {
+      return new NextResponse(await readFile(file + suffix), {
+        headers: { ...headers, 'Content-Encoding': encoding },
+      });
+    } catch {
+      // Not written for this file, e.g. .br without the brotli package
+    }
+  }
+  try {
+    return new NextResponse(await readFile(file), { headers });
+  } catch {
+    return notFound();
+  }
+}
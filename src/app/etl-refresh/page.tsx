@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { ArrowPathIcon, CheckCircleIcon, ExclamationTriangleIcon, ClockIcon } from '@heroicons/react/24/outline';
+import { useEtlEvents } from '@/utils/useEtlEvents';
 
 interface ETLStatus {
   status: 'idle' | 'running' | 'completed' | 'failed';
@@ -14,11 +15,10 @@ interface DataStatus {
   hasData: boolean;
   latestFile?: string;
   fileTimestamp?: string;
-  fileSize?: number;
   lastModified?: string;
   ageDescription?: string;
   totalFiles?: number;
-  dataDirectory?: string;
+  dataVersion?: number;
   message?: string;
 }
 
@@ -46,6 +46,19 @@ export default function ETLRefreshPage() {
     fetchParkAvailability();
   }, []);
 
+  // The ETL pushes its progress and each newly published data version, so
+  // the page updates as soon as new data lands instead of polling
+  useEtlEvents(event => {
+    if (event.type === 'published') {
+      fetchDataStatus();
+      fetchParkAvailability();
+    } else if (event.type === 'progress') {
+      setEtlStatus(current => current.status === 'running'
+        ? { ...current, details: `ETL stage: ${event.stage}${typeof event.rows === 'number' ? ` (${event.rows} rows)` : ''}` }
+        : current);
+    }
+  });
+
   const fetchDataStatus = async () => {
     try {
       const response = await fetch('/api/etl-status');
@@ -106,12 +119,8 @@ export default function ETLRefreshPage() {
           timestamp: new Date().toLocaleString(),
           details: result.details || result.message
         });
-        
-        // Refresh the data status to show updated information
-        setTimeout(() => {
-          fetchDataStatus();
-          fetchParkAvailability(); // Refresh park availability data
-        }, 1000); // Wait a bit for the ETL to complete
+
+        // Status and park availability refresh on the ETL's published event
       } else {
         throw new Error(result.error || 'Unknown error occurred');
       }
@@ -234,10 +243,8 @@ export default function ETLRefreshPage() {
                   <span className="text-sm text-gray-900">{dataStatus.ageDescription}</span>
                 </div>
                 <div className="flex justify-between">
-                  <span className="text-sm font-medium text-gray-600">File Size:</span>
-                  <span className="text-sm text-gray-900">
-                    {dataStatus.fileSize ? `${(dataStatus.fileSize / 1024).toFixed(1)} KB` : 'Unknown'}
-                  </span>
+                  <span className="text-sm font-medium text-gray-600">Data Version:</span>
+                  <span className="text-sm text-gray-900">{dataStatus.dataVersion ?? 'Unknown'}</span>
                 </div>
                 <div className="flex justify-between">
                   <span className="text-sm font-medium text-gray-600">Total Files:</span>
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useRef } from 'react';
+import { useState, useRef, useEffect } from 'react';
 import dynamic from 'next/dynamic';
 import { format } from 'date-fns';
 import DatePicker from 'react-datepicker';
@@ -8,6 +8,9 @@ import "react-datepicker/dist/react-datepicker.css";
 import { TennisCourt, CourtAvailability } from '@/utils/database';
 import { MagnifyingGlassIcon, ClockIcon, MapPinIcon, ArrowPathIcon, SunIcon, MoonIcon } from '@heroicons/react/24/outline';
 import { haversineDistanceMiles } from '@/utils/distance';
+import { useNewDataVersion } from '@/utils/useEtlEvents';
+import { fetchSnapshotCourts, fetchSnapshotManifest, fetchSnapshotParkDay } from '@/utils/snapshot';
+import { SYNC_JITTER_MS, applyAvailabilitySync, fetchAvailabilitySync } from '@/utils/availabilitySync';
 
 // Dynamic import of ParksMap with no SSR
 const ParksMap = dynamic(() => import('@/components/ParksMap'), {
@@ -63,6 +66,12 @@ function isTimeInPreference(time: string, preference: TimePreference): boolean {
   }
 }
 
+function isSlotInPreference(slot: CourtAvailability, preference: TimePreference): boolean {
+  return preference === 'no-preference' || (slot.bucket
+    ? slot.bucket === preference
+    : isTimeInPreference(slot.time, preference));
+}
+
 function isCourtTypeMatch(court: TennisCourt, preference: CourtTypePreference): boolean {
   if (preference === 'no-preference') return true;
   return court.court_type?.toLowerCase() === preference;
@@ -81,6 +90,16 @@ export default function Home() {
   const mapRef = useRef<HTMLDivElement>(null);
   const resultsRef = useRef<HTMLDivElement>(null);
 
+  // The search on screen, kept in sync with published versions
+  const search = useRef<{
+    parkIds: string[];
+    date: string;
+    timePreference: TimePreference;
+    version: number | null;
+  } | null>(null);
+  const syncTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const syncOnVisible = useRef(false);
+
   // Location input and state
   const [locationQuery, setLocationQuery] = useState<string>('');
   const [userLocation, setUserLocation] = useState<{ lat: number; lon: number } | null>(null);
@@ -129,14 +148,31 @@ export default function Home() {
   const handleFindSlots = async () => {
     setIsLoading(true);
     setError(null);
+    // The results are at least as new as the latest version seen
+    const version = dataVersion.current;
 
     try {
+      // Read the static snapshot when one has been exported, and the API
+      // otherwise or whenever a snapshot file can't be read
+      let manifest = await fetchSnapshotManifest();
+
       // Fetch all courts
-      const courtsResponse = await fetch('/api/courts');
-      if (!courtsResponse.ok) {
-        throw new Error('Failed to fetch courts');
+      let courtsData: TennisCourt[] | null = null;
+      if (manifest) {
+        try {
+          courtsData = await fetchSnapshotCourts(manifest);
+        } catch (err) {
+          console.error('Snapshot unavailable, using the API:', err);
+          manifest = null;
+        }
+      }
+      if (!courtsData) {
+        const courtsResponse = await fetch('/api/courts');
+        if (!courtsResponse.ok) {
+          throw new Error('Failed to fetch courts');
+        }
+        courtsData = await courtsResponse.json() as TennisCourt[];
       }
-      const courtsData: TennisCourt[] = await courtsResponse.json();
       
       // Filter courts based on court type preference
       let filteredCourts = courtsData.filter(court => isCourtTypeMatch(court, courtTypePreference));
@@ -158,12 +194,19 @@ export default function Home() {
 
       // Fetch availability for filtered courts
       const dateStr = format(selectedDate, 'yyyy-MM-dd');
+      const snapshot = manifest;
       const availabilityPromises = filteredCourts.map(async (court) => {
-        const response = await fetch(`/api/courts?parkId=${court.park_id}&date=${dateStr}`);
-        const data: CourtAvailability[] = await response.json();
+        let data: CourtAvailability[] | null = null;
+        if (snapshot) {
+          data = await fetchSnapshotParkDay(snapshot, court.park_id, dateStr).catch(() => null);
+        }
+        if (!data) {
+          const response = await fetch(`/api/courts?parkId=${court.park_id}&date=${dateStr}`);
+          data = await response.json() as CourtAvailability[];
+        }
         
         // Filter slots based on time preference
-        const filteredData = data.filter(slot => isTimeInPreference(slot.time, timePreference));
+        const filteredData = data.filter(slot => isSlotInPreference(slot, timePreference));
         
         return { parkId: court.park_id, availability: filteredData };
       });
@@ -178,6 +221,12 @@ export default function Home() {
 
       setCourtAvailability(availabilityMap);
       setLastUpdate(new Date());
+      search.current = {
+        parkIds: filteredCourts.map(court => court.park_id),
+        date: dateStr,
+        timePreference,
+        version,
+      };
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch data');
     } finally {
@@ -185,6 +234,60 @@ export default function Home() {
     }
   };
 
+  // Bring a search that is on screen up to date with just the slots that
+  // changed since its version. Syncs wait a random jitter after a publish,
+  // coalesce while one is pending, and hold off while the tab is hidden.
+  const syncSearch = async () => {
+    syncTimer.current = null;
+    const current = search.current;
+    if (!current) {
+      return;
+    }
+    if (document.hidden) {
+      syncOnVisible.current = true;
+      return;
+    }
+    try {
+      const sync = await fetchAvailabilitySync(current.version);
+      // A new search replaced this one while the sync was in flight
+      if (search.current !== current) {
+        return;
+      }
+      setCourtAvailability(availability => applyAvailabilitySync(
+        availability, sync, current.parkIds, current.date,
+        slot => isSlotInPreference(slot, current.timePreference)
+      ));
+      search.current = { ...current, version: sync.version };
+      setLastUpdate(new Date());
+    } catch (err) {
+      console.error('Failed to sync availability:', err);
+    }
+  };
+  const syncSearchRef = useRef(syncSearch);
+  syncSearchRef.current = syncSearch;
+
+  const dataVersion = useNewDataVersion(() => {
+    if (search.current && syncTimer.current === null) {
+      syncTimer.current = setTimeout(() => syncSearchRef.current(), Math.random() * SYNC_JITTER_MS);
+    }
+  });
+
+  useEffect(() => {
+    const onVisibilityChange = () => {
+      if (!document.hidden && syncOnVisible.current) {
+        syncOnVisible.current = false;
+        syncSearchRef.current();
+      }
+    };
+    document.addEventListener('visibilitychange', onVisibilityChange);
+    return () => {
+      document.removeEventListener('visibilitychange', onVisibilityChange);
+      if (syncTimer.current !== null) {
+        clearTimeout(syncTimer.current);
+      }
+    };
+  }, []);
+
   return (
     <div className="container mx-auto px-4 py-8">
       <div className="max-w-7xl mx-auto">
@@ -2,9 +2,20 @@ from bs4 import BeautifulSoup
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
+import argparse
+import copy
+import hashlib
 import os
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from requests import Response
+from src.page_capture import get_capture_store
+from src.parse_cache import ParseCache, get_parse_cache
+from src.request_throttle import AimdController, remaining_seconds, throttled_request
+from src.sources import DEFAULT_SOURCE, SLOT_COLUMNS, get_source
 
 # Constants
 BASE_URL = "https://www.nycgovparks.org/tennisreservation"
@@ -13,8 +24,33 @@ DEFAULT_COURTS_FILE = os.path.join(os.path.dirname(__file__), "..", "nyc_tennis_
 
 REQUEST_TIMEOUT_SECONDS = 30
 
-def request_with_network_fallback(url: str, headers: dict, referer: str | None = None) -> Response:
-    """Request URL with both direct and env-proxy network modes."""
+# Deadline mode: the smallest time budget a park gets
+MIN_PARK_BUDGET_SECONDS = 6
+
+# Fetched pages waiting to be parsed, per parser process
+PAGES_QUEUED_PER_PARSER = 2
+
+# Bump whenever parsing output changes so cached parse results are discarded
+PARSER_VERSION = 1
+
+AVAILABILITY_COLUMNS = SLOT_COLUMNS
+
+def request_with_network_fallback(url: str, headers: dict, referer: str | None = None,
+                                  timeout: float = REQUEST_TIMEOUT_SECONDS,
+                                  deadline: float | None = None) -> Response:
+    """Request URL with both direct and env-proxy network modes.
+
+    With a deadline (a time.monotonic() value), every request's timeout is
+    capped at the time left, and TimeoutError is raised once none is left.
+    """
+    def request_timeout() -> float:
+        remaining = remaining_seconds(deadline)
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise TimeoutError(f"Deadline passed before requesting {url}")
+        return min(timeout, remaining)
+
     modes = (
         (False, "direct"),
         (True, "env-proxy"),
@@ -29,8 +65,8 @@ def request_with_network_fallback(url: str, headers: dict, referer: str | None =
             request_headers['Referer'] = referer
         try:
             # Prime session cookie then request target URL.
-            session.get(BASE_URL, headers=request_headers, timeout=REQUEST_TIMEOUT_SECONDS)
-            response = session.get(url, headers=request_headers, timeout=REQUEST_TIMEOUT_SECONDS)
+            session.get(BASE_URL, headers=request_headers, timeout=request_timeout())
+            response = session.get(url, headers=request_headers, timeout=request_timeout())
             return response
         except requests.RequestException as error:
             print(f"  - Network mode '{mode_name}' failed for {url}: {error}")
@@ -109,10 +145,17 @@ def parse_availability_table(html: str, park_id: str) -> list[dict]:
     
     return availability
 
-def get_available_dates(html: str) -> dict[str, str]:
-    """Extract all available dates from the page."""
+def get_available_dates(html: str, today: datetime | None = None) -> dict[str, str]:
+    """Extract all available dates from the page.
+
+    Args:
+        html: Availability page HTML
+        today: When the page was fetched, used to fill in missing years;
+            defaults to now
+    """
     soup = BeautifulSoup(html, 'html.parser')
     dates = {}
+    today = today or datetime.now()
     
     # Look for date tabs
     for tab in soup.find_all('a', attrs={'data-toggle': 'tab'}):
@@ -126,10 +169,11 @@ def get_available_dates(html: str) -> dict[str, str]:
                 date_obj = datetime.strptime(date_text, '%A, %B %d, %Y')
             elif len(date_text) == 8:  # Short format like 'Tue08/12'
                 month_day = date_text[-5:]  # Get '08/12' part
-                date_obj = datetime.strptime(month_day + '/2025', '%m/%d/%Y')
+                date_obj = datetime.strptime(f"{month_day}/{today.year}", '%m/%d/%Y')
+                # Tabs only run forward, so a date well behind today is next year's
+                if date_obj < today - timedelta(days=180):
+                    date_obj = date_obj.replace(year=today.year + 1)
             elif len(date_text) <= 2:  # Just day number
-                # Get current month and year
-                today = datetime.now()
                 try:
                     # Try to create a date with the current month
                     date_obj = datetime(today.year, today.month, int(date_text))
@@ -157,8 +201,15 @@ def get_available_dates(html: str) -> dict[str, str]:
     
     return dates
 
-def get_availability_data(court_id: str) -> list[dict]:
-    """Get availability data for a specific court."""
+def fetch_availability_page(court_id: str, timeout: float = REQUEST_TIMEOUT_SECONDS,
+                            controller: AimdController | None = None,
+                            deadline: float | None = None) -> str | None:
+    """Fetch a park's availability page, or None if the response is unusable.
+
+    With a controller, the request waits for a concurrency slot and
+    throttled responses are retried with backoff. Requests and retries stay
+    within the deadline (a time.monotonic() value) when one is given.
+    """
     # Common headers
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -170,48 +221,130 @@ def get_availability_data(court_id: str) -> list[dict]:
     
     # Then visit the availability page
     url = f"{BASE_URL}/availability/{court_id}"
-    response = request_with_network_fallback(url, headers, referer=BASE_URL)
+    send = lambda: request_with_network_fallback(
+        url, headers, referer=BASE_URL, timeout=timeout, deadline=deadline
+    )
+    response = throttled_request(controller, send, deadline=deadline) if controller else send()
     
     # Check if we got a valid response
     if response.status_code != 200:
         print(f"  - HTTP Error: Got status code {response.status_code} for court {court_id}")
-        return []
+        return None
     
     html = response.text
     
     # Check if the page has content
     if len(html.strip()) < 1000:
         print(f"  - Warning: Very short HTML response for court {court_id} (length: {len(html)})")
-        return []
-    
+        return None
+    return html
+
+def content_hash(text: str) -> str:
+    """Hash page or pane HTML for the parse cache."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def parse_availability_page(html: str, court_id: str, today: datetime | None = None,
+                            cache: ParseCache | None = None) -> list[dict]:
+    """Parse every date tab of a park's availability page into records.
+
+    With a cache, a page unchanged since an earlier fetch on the same day
+    reuses that fetch's records, and only date-tab panes whose HTML changed
+    are parsed again.
+    """
+    court_id = str(court_id)
+    today = today or datetime.now()
+    # Tab dates are resolved against the fetch day, so records are only reused on it
+    reference_date = today.strftime('%Y-%m-%d')
+    page_hash = content_hash(html)
+    cached = cache.get(court_id) if cache else None
+    if cached and cached['page_hash'] == page_hash and cached.get('reference_date') == reference_date:
+        print(f"  - Page unchanged, reusing {len(cached['records'])} parsed slots")
+        return cached['records']
+
     # Get all available dates
-    date_mapping = get_available_dates(html)
+    date_mapping = get_available_dates(html, today)
     print(f"  - Found {len(date_mapping)} date tabs")
     
     if not date_mapping:
         print(f"  - Warning: No date tabs found for court {court_id}")
         return []
     
+    cached_panes = cached['panes'] if cached else {}
+    panes = {}
     all_availability = []
+    soup = BeautifulSoup(html, 'html.parser')
     for tab_id, date_str in date_mapping.items():
         # Parse availability table for each date
-        soup = BeautifulSoup(html, 'html.parser')
         date_tab = soup.find('div', {'id': tab_id})
         if date_tab:
             table_html = str(date_tab)
-            availability = parse_availability_table(table_html, court_id)
+            pane_hash = content_hash(table_html)
+            if pane_hash not in panes:
+                panes[pane_hash] = cached_panes.get(pane_hash)
+                if panes[pane_hash] is None:
+                    panes[pane_hash] = parse_availability_table(table_html, court_id)
+            availability = copy.deepcopy(panes[pane_hash])
             
             # Add park_id and date to each record
             for record in availability:
-                record['park_id'] = str(court_id)  # This is actually the park_id
+                record['park_id'] = court_id  # This is actually the park_id
                 record['date'] = date_str
             
             all_availability.extend(availability)
         else:
             print(f"  - Warning: Could not find date tab {tab_id} for court {court_id}")
+
+    if cache:
+        try:
+            cache.put(court_id, page_hash, reference_date, all_availability, panes)
+        except OSError as e:
+            print(f"  - Warning: Could not update parse cache for court {court_id}: {e}")
     
     return all_availability
 
+def fetch_and_capture_page(court_id: str, timeout: float = REQUEST_TIMEOUT_SECONDS,
+                           controller: AimdController | None = None,
+                           source: str = DEFAULT_SOURCE,
+                           deadline: float | None = None) -> tuple[str | None, datetime]:
+    """Fetch a park's page from a source, keeping it in the capture store when CAPTURE_DIR is set.
+
+    Returns the page (None if unusable) and the fetch time.
+    """
+    fetched_at = datetime.now()
+    html = get_source(source).fetch(str(court_id), timeout, controller, deadline=deadline)
+    if html is None:
+        return None, fetched_at
+
+    capture_store = get_capture_store()
+    if capture_store:
+        try:
+            capture_store.save(str(court_id), html, fetched_at, source)
+        except OSError as e:
+            print(f"  - Warning: Could not capture page for court {court_id}: {e}")
+    return html, fetched_at
+
+def parse_fetched_page(court_id: str, html: str, fetched_at: datetime,
+                       source: str = DEFAULT_SOURCE) -> list[dict]:
+    """Parse and normalize a fetched page through the source's parse cache."""
+    adapter = get_source(source)
+    cache = get_parse_cache(adapter.parser_version, adapter.name)
+    return adapter.scrape_page(html, str(court_id), fetched_at, cache)
+
+def get_availability_data(court_id: str, timeout: float = REQUEST_TIMEOUT_SECONDS,
+                          controller: AimdController | None = None,
+                          source: str = DEFAULT_SOURCE,
+                          deadline: float | None = None) -> list[dict] | None:
+    """Get availability data for a specific court.
+
+    Requests and retries stay within the deadline (a time.monotonic() value)
+    when one is given. Returns None when no usable page was fetched, as
+    opposed to an empty list for a park with no available slots.
+    """
+    html, fetched_at = fetch_and_capture_page(court_id, timeout, controller, source, deadline=deadline)
+    if html is None:
+        return None
+    return parse_fetched_page(court_id, html, fetched_at, source)
+
 def save_availability_data(data: list[dict], output_dir: str) -> str:
     """Save availability data to CSV file."""
     # Create output directory if it doesn't exist
@@ -224,8 +357,7 @@ def save_availability_data(data: list[dict], output_dir: str) -> str:
     df['court_id'] = df['court_id'].astype(str)
     
     # Reorder columns
-    columns = ['park_id', 'date', 'time', 'court_id', 'status', 'reservation_link', 'is_available']
-    df = df[columns]
+    df = df[AVAILABILITY_COLUMNS]
     
     # Generate filename with timestamp
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -236,28 +368,168 @@ def save_availability_data(data: list[dict], output_dir: str) -> str:
     df.to_csv(file_path, index=False)
     return file_path
 
-def main() -> str:
+def load_parks(courts_file: str | None = None) -> pd.DataFrame:
+    """Load the list of parks to scrape."""
+    courts_file = courts_file or os.getenv('COURTS_FILE', DEFAULT_COURTS_FILE)
+    return pd.read_csv(courts_file)
+
+def get_park_budget(num_parks: int, deadline_seconds: float, workers: int) -> float:
+    """Split a run deadline into a per-park time budget."""
+    fair_share = deadline_seconds * workers / max(1, num_parks)
+    return min(2 * REQUEST_TIMEOUT_SECONDS, max(MIN_PARK_BUDGET_SECONDS, fair_share))
+
+def scrape_parks_pipelined(courts_df: pd.DataFrame, fetch_workers: int | None = None,
+                           parse_workers: int | None = None, controller: AimdController | None = None,
+                           source: str = DEFAULT_SOURCE, deadline_seconds: float | None = None):
+    """Fetch parks on threads and parse their pages on all cores.
+
+    Fetch threads push pages into a bounded queue that a process pool drains,
+    so fetching blocks once parsing falls behind and only a few pages are
+    held in memory at a time. The controller decides how many of the fetch
+    threads actually have a request in flight. Yields (park_id, records) as
+    parks finish; records is None when the park could not be fetched or
+    parsed, as opposed to an empty list for a park with no available slots.
+
+    With a deadline, parks are started in courts_df order, so put the highest
+    priority first, and all of a park's requests and retries must finish
+    within its share of the deadline, split across the fetch threads. Fetch
+    threads are sized to the controller's maximum, so the deadline run goes
+    as wide as the controller allows, and retries never outlast the
+    deadline. Parks unfinished when the deadline passes are yielded last
+    with None.
+    """
+    controller = controller or AimdController()
+    fetch_workers = fetch_workers or controller.max_limit
+    parse_workers = parse_workers or os.cpu_count() or 1
+    max_pending = parse_workers * PAGES_QUEUED_PER_PARSER
+    park_order = [str(court_id) for court_id in courts_df['court_id']]
+    park_ids = queue.Queue()
+    for park_id in park_order:
+        park_ids.put(park_id)
+    pages = queue.Queue(maxsize=max_pending)
+    fetch_done = object()
+    # Set once the consumer is done, so fetchers never block on a full queue nobody drains
+    stop = threading.Event()
+
+    deadline = None
+    if deadline_seconds:
+        park_budget = get_park_budget(len(park_order), deadline_seconds, fetch_workers)
+        deadline = time.monotonic() + deadline_seconds
+        print(f"Scraping {len(park_order)} parks within {deadline_seconds:.0f}s ({park_budget:.1f}s per park)")
+
+    def park_deadline() -> float | None:
+        # Every request and retry of a park, across both network modes, shares its budget
+        if deadline is None:
+            return None
+        return min(deadline, time.monotonic() + park_budget)
+
+    def put_page(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_pages():
+        while not stop.is_set():
+            try:
+                park_id = park_ids.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                html, fetched_at = fetch_and_capture_page(
+                    park_id, REQUEST_TIMEOUT_SECONDS, controller, source, deadline=park_deadline()
+                )
+                item = (park_id, html, fetched_at, None)
+            except Exception as e:
+                item = (park_id, None, None, e)
+            if not put_page(item):
+                return
+        put_page(fetch_done)
+
+    def time_left(timeout: float | None) -> float | None:
+        if deadline is None:
+            return timeout
+        remaining = max(0.0, deadline - time.monotonic())
+        return remaining if timeout is None else min(timeout, remaining)
+
+    fetchers = [
+        threading.Thread(target=fetch_pages, name=f"scrape-fetch-{n}", daemon=True)
+        for n in range(fetch_workers)
+    ]
+    for fetcher in fetchers:
+        fetcher.start()
+
+    running = len(fetchers)
+    parsing = {}
+    finished = set()
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+    try:
+        while running or parsing:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            can_submit = running and len(parsing) < max_pending
+            if can_submit:
+                try:
+                    # Don't sit on the queue while parsed results are waiting
+                    item = pages.get(timeout=time_left(0.1 if parsing else None))
+                except queue.Empty:
+                    item = None
+                if item is fetch_done:
+                    running -= 1
+                elif item is not None:
+                    park_id, html, fetched_at, error = item
+                    if error is not None:
+                        print(f"  - ERROR fetching data for court {park_id}: {str(error)}")
+                        finished.add(park_id)
+                        yield park_id, None
+                    elif html is None:
+                        # An unusable page says nothing about the park's slots
+                        finished.add(park_id)
+                        yield park_id, None
+                    else:
+                        parsing[executor.submit(parse_fetched_page, park_id, html, fetched_at, source)] = park_id
+
+            done, _ = wait(parsing, timeout=0 if can_submit else time_left(None), return_when=FIRST_COMPLETED)
+            for future in done:
+                park_id = parsing.pop(future)
+                try:
+                    availability = future.result()
+                    print(f"Scraped park {park_id}: found {len(availability)} available slots")
+                except Exception as e:
+                    print(f"  - ERROR parsing data for court {park_id}: {str(e)}")
+                    availability = None
+                finished.add(park_id)
+                yield park_id, availability
+    finally:
+        stop.set()
+        # Don't wait for stragglers; their requests time out on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for park_id in park_order:
+        if park_id not in finished:
+            print(f"  - Deadline reached before park {park_id} finished; marking it stale")
+            yield park_id, None
+
+def main(deadline_seconds: float | None = None) -> str:
     """Main function to fetch and save availability data."""
     # Get court IDs from CSV
-    courts_file = os.getenv('COURTS_FILE', DEFAULT_COURTS_FILE)
-    courts_df = pd.read_csv(courts_file)
+    courts_df = load_parks()
     
     print(f"Found {len(courts_df)} parks to scrape")
     
     # Fetch availability for each court
     all_availability = []
-    for court_id in courts_df['court_id']:
-        print(f"Scraping park {court_id} ({courts_df[courts_df['court_id'] == court_id]['park_name'].iloc[0]})...")
-        try:
-            availability = get_availability_data(str(court_id))
-            print(f"  - Found {len(availability)} available slots")
+    controller = AimdController()
+    scraped = scrape_parks_pipelined(courts_df, controller=controller, deadline_seconds=deadline_seconds)
+    for _, availability in scraped:
+        if availability:
             all_availability.extend(availability)
-        except Exception as e:
-            print(f"  - ERROR fetching data for court {court_id}: {str(e)}")
-            import traceback
-            traceback.print_exc()
     
     print(f"Total available slots collected: {len(all_availability)}")
+    print(f"Request concurrency: {controller.stats()}")
     
     # Save data
     if all_availability:
@@ -269,4 +541,21 @@ def main() -> str:
         return ""
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Scrape NYC Parks tennis court availability.')
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Finish within this many seconds, keeping whatever was collected'
+    )
+    parser.add_argument(
+        '--worker',
+        type=int,
+        metavar='RUN_ID',
+        help='Join a distributed run as a worker, staging results directly (see src.etl.distributed_scrape)'
+    )
+    args = parser.parse_args()
+    if args.worker:
+        from src.etl.distributed_scrape import run_worker
+        run_worker(args.worker)
+    else:
+        main(deadline_seconds=args.deadline)
@@ -0,0 +1,117 @@
+"""
+Asyncio data access for the user-facing read queries.
+
+Runs the queries in `src.database.read_queries` on the reader database
+through SQLAlchemy's asyncio extension and asyncpg. asyncpg prepares every
+statement server-side and keeps it in a per-connection cache, so the hot
+queries are parsed and planned once per pooled connection rather than per
+call. Many lookups can run concurrently on one pool from a single event
+loop, e.g. `await get_parks_slots(park_ids, day)`.
+
+Needs the asyncpg package.
+"""
+import asyncio
+from datetime import date, datetime
+from typing import Iterable, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from src.database.config import get_engine_settings
+from src.database.read_queries import (
+    ALL_COURTS_SQL, LATEST_UPDATE_SQL, PARK_DAY_SQL, PARK_SLOTS_SQL, PARK_SUMMARIES_SQL,
+    Court, CourtSlot, ParkDaySlot, ParkSummary
+)
+
+# Prepared statements kept per connection; comfortably more than the hot queries
+PREPARED_STATEMENT_CACHE_SIZE = 100
+
+# Concurrent lookups allowed per call, so one fan-out can't hold the whole pool
+DEFAULT_CONCURRENCY = 10
+
+_async_engines: dict[str, AsyncEngine] = {}
+
+def async_database_url(url: str) -> str:
+    """Point a database URL at the asyncpg driver and size its statement cache."""
+    parsed = make_url(url).set(drivername='postgresql+asyncpg')
+    parsed = parsed.update_query_dict({'prepared_statement_cache_size': str(PREPARED_STATEMENT_CACHE_SIZE)})
+    return parsed.render_as_string(hide_password=False)
+
+def create_async_role_engine(role: str = 'reader') -> AsyncEngine:
+    """Create an async engine with a role's URL, pool and timeout settings."""
+    settings = get_engine_settings(role)
+    server_settings = {}
+    if settings['statement_timeout_ms']:
+        server_settings['statement_timeout'] = str(settings['statement_timeout_ms'])
+    if role == 'reader':
+        server_settings['default_transaction_read_only'] = 'on'
+    return create_async_engine(
+        async_database_url(settings['url']),
+        pool_pre_ping=True,
+        pool_size=settings['pool_size'],
+        max_overflow=settings['max_overflow'],
+        pool_timeout=settings['pool_timeout'],
+        connect_args={'server_settings': server_settings},
+    )
+
+def get_async_engine(role: str = 'reader') -> AsyncEngine:
+    """Get the shared async engine for a role, creating it on first use.
+
+    An async engine's pool belongs to the event loop that first uses it.
+    """
+    if role not in _async_engines:
+        _async_engines[role] = create_async_role_engine(role)
+    return _async_engines[role]
+
+async def dispose_async_engines() -> None:
+    """Close every async pool, e.g. when the event loop shuts down."""
+    for created in _async_engines.values():
+        await created.dispose()
+    _async_engines.clear()
+
+async def _fetch_all(sql: str, params: Optional[dict] = None, engine: Optional[AsyncEngine] = None) -> list[dict]:
+    async with (engine or get_async_engine()).connect() as conn:
+        result = await conn.execute(text(sql), params or {})
+        return [dict(row) for row in result.mappings()]
+
+async def get_all_courts(engine: Optional[AsyncEngine] = None) -> list[Court]:
+    """Every park with its details, by name."""
+    courts = await _fetch_all(ALL_COURTS_SQL, engine=engine)
+    for court in courts:
+        court['lat'] = float(court['lat']) if court['lat'] is not None else None
+        court['lon'] = float(court['lon']) if court['lon'] is not None else None
+    return courts
+
+async def get_park_summaries(engine: Optional[AsyncEngine] = None) -> list[ParkSummary]:
+    """Slot counts and last update of every park with current availability."""
+    return await _fetch_all(PARK_SUMMARIES_SQL, engine=engine)
+
+async def get_park_slots(park_id: str, day: date, engine: Optional[AsyncEngine] = None) -> list[CourtSlot]:
+    """Bookable slots of one park on one day, in court and time order."""
+    return await _fetch_all(PARK_SLOTS_SQL, {'park_id': str(park_id), 'date': day}, engine=engine)
+
+async def get_park_day(park_id: str, day: date, engine: Optional[AsyncEngine] = None) -> list[ParkDaySlot]:
+    """A park-day's slots from the read model, ready to serve."""
+    async with (engine or get_async_engine()).connect() as conn:
+        slots = (await conn.execute(text(PARK_DAY_SQL), {'park_id': str(park_id), 'date': day})).scalar()
+        return slots if slots is not None else []
+
+async def get_latest_update(engine: Optional[AsyncEngine] = None) -> Optional[datetime]:
+    """When current availability was last written."""
+    async with (engine or get_async_engine()).connect() as conn:
+        return (await conn.execute(text(LATEST_UPDATE_SQL))).scalar()
+
+async def get_parks_slots(park_ids: Iterable[str], day: date, engine: Optional[AsyncEngine] = None,
+                          concurrency: int = DEFAULT_CONCURRENCY) -> dict[str, list[CourtSlot]]:
+    """Look up many parks' slots concurrently on the shared pool.
+
+    Returns each park's slots keyed by park ID, in the order given.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(park_id: str) -> list[CourtSlot]:
+        async with semaphore:
+            return await get_park_slots(park_id, day, engine=engine)
+
+    park_ids = list(dict.fromkeys(str(park_id) for park_id in park_ids))
+    results = await asyncio.gather(*(lookup(park_id) for park_id in park_ids))
+    return dict(zip(park_ids, results))
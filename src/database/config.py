@@ -1,8 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 import os
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -17,19 +19,107 @@ DB_NAME = os.getenv("DB_NAME", "nyc_tennis")
 # Create database URL
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# The ETL writes through the writer; user-facing queries go to the reader,
+# which can point at a replica and gets its own, separately sized pool so
+# ETL bursts can't take every connection. Settings are read from the
+# environment when an engine is first used:
+#   DB_WRITER_URL / DB_READER_URL        (default: DATABASE_URL)
+#   DB_<ROLE>_POOL_SIZE, DB_<ROLE>_MAX_OVERFLOW, DB_<ROLE>_POOL_TIMEOUT
+#   DB_<ROLE>_STATEMENT_TIMEOUT_MS       (0 disables)
+ENGINE_ROLES = ('writer', 'reader')
+ENGINE_DEFAULTS = {
+    'writer': {'pool_size': 5, 'max_overflow': 5, 'pool_timeout': 30, 'statement_timeout_ms': 0},
+    'reader': {'pool_size': 10, 'max_overflow': 10, 'pool_timeout': 10, 'statement_timeout_ms': 15_000},
+}
+POOL_RECYCLE_SECONDS = 1800
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engines: dict[str, Engine] = {}
+_sessionmakers: dict[str, sessionmaker] = {}
+_registry_lock = threading.RLock()
+
+def get_engine_settings(role: str) -> dict:
+    """Resolve an engine role's URL and pool settings from the environment."""
+    if role not in ENGINE_ROLES:
+        raise ValueError(f"Unknown engine role: {role}")
+    prefix = f"DB_{role.upper()}_"
+    settings = {
+        key: int(os.getenv(prefix + key.upper(), default))
+        for key, default in ENGINE_DEFAULTS[role].items()
+    }
+    # The reader falls back to the writer, so one database works unchanged
+    settings['url'] = os.getenv(prefix + 'URL') or (
+        os.getenv('DB_WRITER_URL') if role == 'reader' else None
+    ) or DATABASE_URL
+    return settings
+
+def create_role_engine(role: str) -> Engine:
+    """Create a new engine for a role; use get_engine to share one."""
+    settings = get_engine_settings(role)
+    url = make_url(settings['url'])
+    kwargs = {
+        'pool_pre_ping': True,
+        'pool_recycle': POOL_RECYCLE_SECONDS,
+        'pool_size': settings['pool_size'],
+        'max_overflow': settings['max_overflow'],
+        'pool_timeout': settings['pool_timeout'],
+    }
+    if url.get_backend_name() == 'postgresql':
+        options = []
+        if settings['statement_timeout_ms']:
+            options.append(f"-c statement_timeout={settings['statement_timeout_ms']}")
+        if role == 'reader':
+            # Catch writes sent to the reader even when it is the primary
+            options.append("-c default_transaction_read_only=on")
+        if options:
+            kwargs['connect_args'] = {'options': ' '.join(options)}
+    return create_engine(url, **kwargs)
+
+def get_engine(role: str = 'writer') -> Engine:
+    """Get the shared engine for a role, creating it on first use."""
+    if role not in _engines:
+        with _registry_lock:
+            if role not in _engines:
+                _engines[role] = create_role_engine(role)
+    return _engines[role]
+
+def get_sessionmaker(role: str = 'writer') -> sessionmaker:
+    """Get the session factory bound to a role's engine."""
+    if role not in _sessionmakers:
+        with _registry_lock:
+            if role not in _sessionmakers:
+                _sessionmakers[role] = sessionmaker(autocommit=False, autoflush=False, bind=get_engine(role))
+    return _sessionmakers[role]
+
+def dispose_engines() -> None:
+    """Close every pool and forget the engines, e.g. after forking or in tests."""
+    with _registry_lock:
+        for created in _engines.values():
+            created.dispose()
+        _engines.clear()
+        _sessionmakers.clear()
+
+# Module attributes created on first access, so importing this module never
+# builds an engine: `engine` and `SessionLocal` are the writer's (existing
+# callers are all ETL code), `ReaderSession` opens sessions on the reader
+_LAZY_ATTRIBUTES = {
+    'engine': lambda: get_engine('writer'),
+    'SessionLocal': lambda: get_sessionmaker('writer'),
+    'WriterSession': lambda: get_sessionmaker('writer'),
+    'ReaderSession': lambda: get_sessionmaker('reader'),
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create Base class
 Base = declarative_base()
 
 # Dependency to get DB session
 def get_db():
-    db = SessionLocal()
+    db = get_sessionmaker('writer')()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
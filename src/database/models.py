@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, DECIMAL, ForeignKey, UniqueConstraint, Date, Boolean
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, Float, String, DateTime, Text, DECIMAL, ForeignKey, UniqueConstraint, Index, Date, Boolean, MetaData, Table
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import pytz
+from src.database.views import register_views
 
 Base = declarative_base()
 
+# Views are created by DDL (see src/database/views.py), never by create_all
+views_metadata = MetaData()
+
 def get_et_time():
     """Get current time in Eastern Time"""
     et = pytz.timezone('America/New_York')
@@ -20,6 +25,40 @@ class FileRegistry(Base):
     load_timestamp = Column(DateTime(timezone=True), default=get_et_time)
     file_hash = Column(String(64), nullable=False)
     status = Column(String(50), nullable=False)
+    archive_path = Column(String(1000), nullable=True)  # Parquet file holding the rows once the CSV is compacted
+
+class EtlJob(Base):
+    __tablename__ = 'etl_jobs'
+    __table_args__ = {'schema': 'raw_files'}
+
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False)
+    attached_requests = Column(Integer, nullable=False, default=0)
+    details = Column(Text, nullable=True)  # JSON summary of the run
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=get_et_time)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+class ScrapeLease(Base):
+    __tablename__ = 'scrape_leases'
+    __table_args__ = (
+        UniqueConstraint('file_id', 'park_id', name='uq_scrape_leases_file_park'),
+        Index('ix_scrape_leases_file_status', 'file_id', 'status'),
+        {'schema': 'raw_files'}
+    )
+
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, ForeignKey('raw_files.file_registry.id'), nullable=False)  # The distributed run
+    park_id = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False, default='pending')  # pending, leased, done, failed
+    worker_id = Column(String(200), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    rows = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=get_et_time, onupdate=get_et_time)
 
 class DwhTennisCourt(Base):
     __tablename__ = 'tennis_courts'
@@ -42,7 +81,7 @@ class DwhTennisCourt(Base):
 
 class StagingTennisCourt(Base):
     __tablename__ = 'tennis_courts'
-    __table_args__ = {'schema': 'staging'}
+    __table_args__ = {'schema': 'staging', 'prefixes': ['UNLOGGED']}
 
     id = Column(Integer, primary_key=True)
     park_id = Column(String(50), nullable=False)
@@ -58,28 +97,174 @@ class StagingTennisCourt(Base):
     lon = Column(DECIMAL(11, 8), nullable=True)
     court_type = Column(String(50), nullable=True)
 
-class DwhCourtAvailability(Base):
-    __tablename__ = 'court_availability'
+class ParkScrapeState(Base):
+    """Per-park scrape history used by the adaptive scrape scheduler."""
+    __tablename__ = 'park_scrape_state'
+    __table_args__ = {'schema': 'dwh'}
+
+    park_id = Column(String(50), primary_key=True)
+    last_scraped_at = Column(DateTime(timezone=True), nullable=True)
+    last_changed_at = Column(DateTime(timezone=True), nullable=True)
+    change_rate = Column(Float, nullable=False, default=0.0)  # Weighted slot changes per hour
+    slot_keys = Column(Text, nullable=True)  # JSON list of the last snapshot's slot keys
+    stale_since = Column(DateTime(timezone=True), nullable=True)  # Set while scheduled scrapes keep missing
+
+class DwhCourt(Base):
+    """Integer surrogate key for each court within a park."""
+    __tablename__ = 'courts'
     __table_args__ = (
-        UniqueConstraint('park_id', 'court_id', 'date', 'time', name='uix_court_availability'),
+        UniqueConstraint('park_key', 'court_id', name='uq_courts_park_court'),
         {'schema': 'dwh'}
     )
 
     id = Column(Integer, primary_key=True)
-    park_id = Column(String(50), ForeignKey('dwh.tennis_courts.park_id'), nullable=False)
+    park_key = Column(Integer, ForeignKey('dwh.tennis_courts.id'), nullable=False)
     court_id = Column(String(50), nullable=False)
-    date = Column(Date, nullable=False)  # Changed to Date type
-    time = Column(String(50), nullable=False)
-    status = Column(String(50), nullable=False)
+
+class DwhSlotStatus(Base):
+    """Lookup table so each slot stores its status as a small integer."""
+    __tablename__ = 'slot_statuses'
+    __table_args__ = {'schema': 'dwh'}
+
+    id = Column(SmallInteger, primary_key=True)
+    status = Column(String(50), nullable=False, unique=True)
+
+class DwhCourtAvailabilitySlot(Base):
+    """Compact storage for current availability.
+
+    Time is minutes after midnight and the reservation link is stored as its
+    trailing reservation ID; reservation_link only holds links that don't
+    follow the standard URL.
+    """
+    __tablename__ = 'court_availability_slots'
+    __table_args__ = (
+        UniqueConstraint('court_key', 'date', 'slot_time', name='uq_court_availability_slots'),
+        Index('ix_court_availability_slots_date', 'date'),
+        {'schema': 'dwh'}
+    )
+
+    id = Column(Integer, primary_key=True)
+    court_key = Column(Integer, ForeignKey('dwh.courts.id'), nullable=False)
+    date = Column(Date, nullable=False)
+    slot_time = Column(SmallInteger, nullable=False)
+    status_id = Column(SmallInteger, ForeignKey('dwh.slot_statuses.id'), nullable=False)
+    reservation_id = Column(Integer, nullable=True)
     reservation_link = Column(String(500), nullable=True)
     is_available = Column(Boolean, nullable=False, default=False)
     last_updated = Column(DateTime(timezone=True), default=get_et_time)
 
+class DwhCourtAvailability(Base):
+    """The decoded dwh.court_availability view over DwhCourtAvailabilitySlot.
+
+    Writes through the view are redirected to the compact tables by its
+    INSTEAD OF trigger.
+    """
+    __table__ = Table(
+        'court_availability', views_metadata,
+        Column('id', Integer, primary_key=True),
+        Column('park_id', String(50), nullable=False),
+        Column('court_id', String(50), nullable=False),
+        Column('date', Date, nullable=False),
+        Column('time', String(50), nullable=False),
+        Column('status', String(50), nullable=False),
+        Column('reservation_link', String(500), nullable=True),
+        Column('is_available', Boolean, nullable=False, default=False),
+        Column('last_updated', DateTime(timezone=True), default=get_et_time),
+        schema='dwh'
+    )
+
+class DwhParkDayAvailability(Base):
+    """Read model: one park's bookable slots on one day, ready to serve.
+
+    `slots` is the ordered list the courts API returns, maintained by
+    `src.etl.read_model` whenever a merge touches the park-day.
+    """
+    __tablename__ = 'park_day_availability'
+    __table_args__ = {'schema': 'dwh'}
+
+    park_id = Column(String(50), primary_key=True)
+    date = Column(Date, primary_key=True)
+    slots = Column(JSONB, nullable=False)  # [{court_id, time, bucket, status, reservation_link}, ...]
+    slot_count = Column(Integer, nullable=False)
+    content_hash = Column(String(32), nullable=False)  # md5 of slots; unchanged park-days aren't rewritten
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=get_et_time)
+
+class DwhDataVersion(Base):
+    """One published change to current availability: a merge, publish or rebuild.
+
+    Versions are allocated under the availability write lock, so they
+    commit in order.
+    """
+    __tablename__ = 'data_versions'
+    __table_args__ = {'schema': 'dwh'}
+
+    version = Column(BigInteger, primary_key=True)
+    file_ids = Column(ARRAY(Integer), nullable=True)  # Files merged; NULL for a rebuild
+    published_at = Column(DateTime(timezone=True), nullable=False, default=get_et_time)
+    changes = Column(Integer, nullable=False, default=0, server_default='0')
+
+class DwhAvailabilityChange(Base):
+    """A slot added, removed or changed in the read model by one data version."""
+    __tablename__ = 'availability_changes'
+    __table_args__ = (
+        Index('ix_availability_changes_version', 'version'),
+        {'schema': 'dwh'}
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    version = Column(BigInteger, ForeignKey('dwh.data_versions.version', ondelete='CASCADE'), nullable=False)
+    park_id = Column(String(50), nullable=False)
+    date = Column(Date, nullable=False)
+    court_id = Column(String(50), nullable=False)
+    time = Column(String(50), nullable=False)
+    change = Column(String(10), nullable=False)  # added, removed or changed
+    slot = Column(JSONB, nullable=True)  # The slot as it is now; NULL once removed
+
+class DwhAvailabilitySnapshot(Base):
+    """Append-only history of every availability snapshot, for analysis."""
+    __tablename__ = 'availability_snapshots'
+    __table_args__ = (
+        Index('ix_availability_snapshots_snapshot_time', 'snapshot_time'),
+        Index('ix_availability_snapshots_file_hash', 'file_hash'),
+        {'schema': 'dwh'}
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    snapshot_time = Column(DateTime(timezone=True), nullable=False)
+    park_id = Column(String(50), nullable=False)
+    court_id = Column(String(50), nullable=False)
+    date = Column(Date, nullable=False)
+    time = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False)
+    reservation_link = Column(String(500), nullable=True)
+    file_hash = Column(String(64), nullable=False)
+
+class DwhSnapshotLoad(Base):
+    """One snapshot loaded into the history, including snapshots with no rows."""
+    __tablename__ = 'availability_snapshot_loads'
+    __table_args__ = (
+        UniqueConstraint('file_hash', 'snapshot_time', name='uq_availability_snapshot_loads'),
+        {'schema': 'dwh'}
+    )
+
+    id = Column(Integer, primary_key=True)
+    file_hash = Column(String(64), nullable=False)
+    snapshot_time = Column(DateTime(timezone=True), nullable=False)
+    rows = Column(Integer, nullable=False)
+    loaded_at = Column(DateTime(timezone=True), nullable=False, default=get_et_time)
+
 class StagingCourtAvailability(Base):
+    """Staged availability, list-partitioned by file.
+
+    Each load stages into its own UNLOGGED partition (see
+    `src.etl.csv_loader.create_availability_staging`), so concurrent loads
+    never touch each other's rows and a load is cleared by dropping its
+    partition.
+    """
     __tablename__ = 'court_availability'
-    __table_args__ = {'schema': 'staging'}
+    __table_args__ = {'schema': 'staging', 'postgresql_partition_by': 'LIST (file_id)'}
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     park_id = Column(String(50), ForeignKey('dwh.tennis_courts.park_id'), nullable=False)
     court_id = Column(String(50), nullable=False)
     date = Column(Date, nullable=False)  # Changed to Date type
@@ -87,4 +272,6 @@ class StagingCourtAvailability(Base):
     status = Column(String(50), nullable=False)
     reservation_link = Column(String(500), nullable=True)
     is_available = Column(Boolean, nullable=False, default=False)
-    file_id = Column(Integer, ForeignKey('raw_files.file_registry.id'), nullable=False) 
\ No newline at end of file
+    file_id = Column(Integer, ForeignKey('raw_files.file_registry.id'), primary_key=True)  # Partition key
+
+register_views(Base.metadata)
@@ -0,0 +1,178 @@
+"""
+Server-side prepared statements for the hot read queries.
+
+Each pooled reader connection PREPAREs the queries in
+`src.database.read_queries` the first time it runs one, and calls then run
+`EXECUTE`, so Postgres parses and analyzes each query once per connection.
+After five executions Postgres switches a statement to a cached generic
+plan when that plan is no worse than the custom ones; `get_plan_cache_stats`
+reports how often that happened per statement from `pg_prepared_statements`
+(PostgreSQL 14+).
+
+`python -m src.database.prepared_queries benchmark` compares per-call
+latency with and without preparation.
+"""
+import argparse
+import re
+import statistics
+import time
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from src.database.config import get_engine
+from src.database.read_queries import (
+    ALL_COURTS_SQL, LATEST_UPDATE_SQL, PARK_DAY_SQL, PARK_SLOTS_SQL, PARK_SUMMARIES_SQL,
+    Court, CourtSlot, ParkDaySlot, ParkSummary
+)
+
+# Statement name -> (SQL with named parameters, parameter names and types in order)
+PREPARED_STATEMENTS = {
+    'all_courts': (ALL_COURTS_SQL, []),
+    'park_summaries': (PARK_SUMMARIES_SQL, []),
+    'park_slots': (PARK_SLOTS_SQL, [('park_id', 'text'), ('date', 'date')]),
+    'park_day': (PARK_DAY_SQL, [('park_id', 'text'), ('date', 'date')]),
+    'latest_update': (LATEST_UPDATE_SQL, []),
+}
+
+def to_positional(sql: str, params: list[tuple[str, str]]) -> str:
+    """Replace :name parameters with the $n placeholders PREPARE takes."""
+    for position, (name, _) in enumerate(params, start=1):
+        sql = re.sub(rf"(?<![:\w]):{name}\b", f"${position}", sql)
+    return sql
+
+def prepare_statements(dbapi_connection) -> None:
+    """PREPARE every hot query on a DBAPI connection.
+
+    Prepared statements are not transactional, so they outlive whatever
+    transaction the connection is in.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, (sql, params) in PREPARED_STATEMENTS.items():
+            types = f" ({', '.join(param_type for _, param_type in params)})" if params else ''
+            cursor.execute(f"PREPARE {name}{types} AS {to_positional(sql, params)}")
+    finally:
+        cursor.close()
+
+def ensure_prepared(connection) -> None:
+    """Prepare the hot queries on a pooled connection the first time it is used.
+
+    The flag lives in the pool's per-connection info, which is discarded
+    along with the DBAPI connection, so a reconnect prepares again.
+    """
+    info = connection.connection.info
+    if not info.get('prepared_statements'):
+        prepare_statements(connection.connection.dbapi_connection)
+        info['prepared_statements'] = True
+
+def execute_prepared(connection, name: str, values: Optional[dict] = None) -> list[dict]:
+    """Run a prepared statement on a SQLAlchemy connection and return its rows."""
+    ensure_prepared(connection)
+    _, params = PREPARED_STATEMENTS[name]
+    arguments = ''
+    bind_values = {}
+    if params:
+        arguments = f"({', '.join(f':{param}' for param, _ in params)})"
+        bind_values = {param: values[param] for param, _ in params}
+    result = connection.execute(text(f"EXECUTE {name}{arguments}"), bind_values)
+    return [dict(row) for row in result.mappings()]
+
+def _run(name: str, values: Optional[dict] = None, engine: Optional[Engine] = None) -> list[dict]:
+    with (engine or get_engine('reader')).connect() as connection:
+        return execute_prepared(connection, name, values)
+
+def get_all_courts(engine: Optional[Engine] = None) -> list[Court]:
+    """Every park with its details, by name."""
+    return _run('all_courts', engine=engine)
+
+def get_park_summaries(engine: Optional[Engine] = None) -> list[ParkSummary]:
+    """Slot counts and last update of every park with current availability."""
+    return _run('park_summaries', engine=engine)
+
+def get_park_slots(park_id: str, day: date, engine: Optional[Engine] = None) -> list[CourtSlot]:
+    """Bookable slots of one park on one day, in court and time order."""
+    return _run('park_slots', {'park_id': str(park_id), 'date': day}, engine=engine)
+
+def get_park_day(park_id: str, day: date, engine: Optional[Engine] = None) -> list[ParkDaySlot]:
+    """A park-day's slots from the read model, ready to serve."""
+    rows = _run('park_day', {'park_id': str(park_id), 'date': day}, engine=engine)
+    return rows[0]['slots'] if rows else []
+
+def get_latest_update(engine: Optional[Engine] = None) -> Optional[datetime]:
+    """When current availability was last written."""
+    rows = _run('latest_update', engine=engine)
+    return next(iter(rows[0].values())) if rows else None
+
+def get_plan_cache_stats(connection) -> dict[str, dict]:
+    """Generic (cached) and custom plan counts of this connection's statements."""
+    rows = connection.execute(text(
+        "SELECT name, generic_plans, custom_plans FROM pg_prepared_statements WHERE from_sql"
+    )).mappings()
+    stats = {}
+    for row in rows:
+        if row['name'] not in PREPARED_STATEMENTS:
+            continue
+        executions = row['generic_plans'] + row['custom_plans']
+        stats[row['name']] = {
+            'executions': executions,
+            'generic_plans': row['generic_plans'],
+            'custom_plans': row['custom_plans'],
+            'plan_cache_hit_rate': round(row['generic_plans'] / executions, 3) if executions else 0.0,
+        }
+    return stats
+
+def _latency_report(timings: list[float]) -> dict:
+    timings = sorted(timings)
+    return {
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+    }
+
+def benchmark(iterations: int = 200, park_id: Optional[str] = None, day: Optional[date] = None,
+              engine: Optional[Engine] = None) -> dict:
+    """Time each hot query per call, as plain text and as a prepared statement.
+
+    Both run on one connection so pool checkout isn't measured.
+    """
+    with (engine or get_engine('reader')).connect() as connection:
+        if park_id is None:
+            park_id = connection.execute(text("SELECT park_id FROM dwh.tennis_courts LIMIT 1")).scalar()
+        values = {'park_id': str(park_id), 'date': day or date.today()}
+
+        report = {}
+        for name, (sql, params) in PREPARED_STATEMENTS.items():
+            bind_values = {param: values[param] for param, _ in params}
+            timings = {'unprepared': [], 'prepared': []}
+            for _ in range(iterations):
+                started = time.perf_counter()
+                connection.execute(text(sql), bind_values).all()
+                timings['unprepared'].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                execute_prepared(connection, name, values)
+                timings['prepared'].append(time.perf_counter() - started)
+            report[name] = {mode: _latency_report(mode_timings) for mode, mode_timings in timings.items()}
+        for name, stats in get_plan_cache_stats(connection).items():
+            report[name]['plan_cache'] = stats
+        connection.rollback()
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prepared statements for the hot read queries.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    benchmark_parser = subparsers.add_parser('benchmark', help='Compare latency with and without preparation')
+    benchmark_parser.add_argument('--iterations', type=int, default=200)
+    benchmark_parser.add_argument('--park-id', help='Park for the slot query (default: any park)')
+    benchmark_parser.add_argument('--date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+
+    args = parser.parse_args()
+    results = benchmark(args.iterations, args.park_id, args.date)
+    for name, result in results.items():
+        print(f"{name}:")
+        for mode in ('unprepared', 'prepared'):
+            latency = result[mode]
+            print(f"  {mode:>10}: mean {latency['mean_ms']}ms, p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms")
+        if 'plan_cache' in result:
+            print(f"  plan cache: {result['plan_cache']}")
@@ -0,0 +1,103 @@
+"""
+SQL and row types of the user-facing read queries.
+
+Shared by the async data access layer and the prepared statement registry
+so both run exactly the same statements. Slot queries read the compact
+tables directly rather than through the decoding view, so they can filter
+and sort on the integer keys and slot time.
+"""
+from datetime import date, datetime
+from typing import Optional, TypedDict
+from src.database.views import RESERVATION_URL_PREFIX
+
+class ParkSummary(TypedDict):
+    park_id: str
+    park_name: str
+    total_slots: int
+    available_slots: int
+    last_updated: Optional[datetime]
+
+class CourtSlot(TypedDict):
+    park_id: str
+    court_id: str
+    date: date
+    time: str
+    status: str
+    reservation_link: Optional[str]
+    is_available: bool
+
+class ParkDaySlot(TypedDict):
+    court_id: str
+    time: str
+    bucket: str  # morning, afternoon or evening
+    status: str
+    reservation_link: Optional[str]
+
+class Court(TypedDict):
+    park_id: str
+    park_name: str
+    park_details: Optional[str]
+    address: Optional[str]
+    lat: Optional[float]
+    lon: Optional[float]
+    num_courts: Optional[int]
+    phone: Optional[str]
+    email: Optional[str]
+    hours: Optional[str]
+    website: Optional[str]
+    court_type: Optional[str]
+
+ALL_COURTS_SQL = """
+    SELECT
+        park_id, park_name, park_details, address,
+        CAST(lat AS DECIMAL(10,6)) AS lat,
+        CAST(lon AS DECIMAL(10,6)) AS lon,
+        num_courts, phone, email, hours, website, court_type
+    FROM dwh.tennis_courts
+    ORDER BY park_name
+"""
+
+PARK_SUMMARIES_SQL = """
+    SELECT
+        tc.park_id,
+        tc.park_name,
+        COUNT(*) AS total_slots,
+        COUNT(*) FILTER (WHERE s.is_available) AS available_slots,
+        MAX(s.last_updated) AS last_updated
+    FROM dwh.tennis_courts tc
+    JOIN dwh.courts c ON c.park_key = tc.id
+    JOIN dwh.court_availability_slots s ON s.court_key = c.id
+    WHERE s.date >= CURRENT_DATE
+    GROUP BY tc.park_id, tc.park_name
+    ORDER BY tc.park_name
+"""
+
+# Bookable slots of one park on one day, in court and time order
+PARK_SLOTS_SQL = f"""
+    SELECT
+        tc.park_id,
+        c.court_id,
+        s.date,
+        dwh.format_slot_time(s.slot_time) AS time,
+        st.status,
+        COALESCE('{RESERVATION_URL_PREFIX}' || s.reservation_id, s.reservation_link) AS reservation_link,
+        s.is_available
+    FROM dwh.tennis_courts tc
+    JOIN dwh.courts c ON c.park_key = tc.id
+    JOIN dwh.court_availability_slots s ON s.court_key = c.id
+    JOIN dwh.slot_statuses st ON st.id = s.status_id
+    WHERE tc.park_id = :park_id
+      AND s.date = :date
+      AND s.is_available
+      AND (s.reservation_id IS NOT NULL OR s.reservation_link IS NOT NULL)
+    ORDER BY c.court_id, s.slot_time
+"""
+
+LATEST_UPDATE_SQL = """
+    SELECT MAX(last_updated) FROM dwh.court_availability_slots
+"""
+
+# A park-day's precomputed slots (see src.etl.read_model); no row means none
+PARK_DAY_SQL = """
+    SELECT slots, content_hash FROM dwh.park_day_availability WHERE park_id = :park_id AND date = :date
+"""
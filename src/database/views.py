@@ -0,0 +1,134 @@
+"""
+SQL objects behind the compact availability storage.
+
+`dwh.court_availability` is a view that decodes `dwh.court_availability_slots`
+back into the original column layout, so existing readers keep working.
+INSTEAD OF triggers route writes through the view into the compact tables.
+The add_compact_court_availability migration keeps a frozen copy of these
+statements; changes here need a new migration. These are attached to the
+metadata so `create_all` builds them too.
+"""
+from sqlalchemy import DDL, event
+
+RESERVATION_URL_PREFIX = 'https://www.nycgovparks.org/tennisreservation/reserve/'
+
+# Re-running this rebinds the view to whichever table is named
+# dwh.court_availability_slots, which is how a shadow table is published
+COURT_AVAILABILITY_VIEW = f"""
+    CREATE OR REPLACE VIEW dwh.court_availability AS
+    SELECT
+        s.id,
+        tc.park_id,
+        c.court_id,
+        s.date,
+        dwh.format_slot_time(s.slot_time) AS time,
+        st.status,
+        COALESCE('{RESERVATION_URL_PREFIX}' || s.reservation_id, s.reservation_link) AS reservation_link,
+        s.is_available,
+        s.last_updated
+    FROM dwh.court_availability_slots s
+    JOIN dwh.courts c ON c.id = s.court_key
+    JOIN dwh.tennis_courts tc ON tc.id = c.park_key
+    JOIN dwh.slot_statuses st ON st.id = s.status_id
+"""
+
+COURT_AVAILABILITY_DDL = [
+    # '9:00 a.m.' <-> minutes after midnight
+    """
+    CREATE OR REPLACE FUNCTION dwh.parse_slot_time(slot_time text) RETURNS smallint
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT (
+            (split_part(slot_time, ':', 1)::int % 12
+             + CASE WHEN lower(slot_time) LIKE '%p%' THEN 12 ELSE 0 END) * 60
+            + substring(slot_time FROM ':([0-9]{2})')::int
+        )::smallint
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION dwh.format_slot_time(minutes smallint) RETURNS text
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT (CASE WHEN minutes / 60 % 12 = 0 THEN 12 ELSE minutes / 60 % 12 END)::text
+            || ':' || lpad((minutes % 60)::text, 2, '0')
+            || CASE WHEN minutes < 720 THEN ' a.m.' ELSE ' p.m.' END
+    $$
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION dwh.reservation_id(link text) RETURNS integer
+    IMMUTABLE LANGUAGE sql AS $$
+        SELECT substring(link FROM '^{RESERVATION_URL_PREFIX.replace('.', '[.]')}([0-9]{{1,9}})$')::integer
+    $$
+    """,
+    COURT_AVAILABILITY_VIEW,
+    """
+    CREATE OR REPLACE FUNCTION dwh.court_availability_write() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        v_park_key integer;
+        v_court_key integer;
+        v_status_id smallint;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM dwh.court_availability_slots WHERE id = OLD.id;
+            RETURN OLD;
+        END IF;
+
+        SELECT id INTO v_park_key FROM dwh.tennis_courts WHERE park_id = NEW.park_id;
+        IF v_park_key IS NULL THEN
+            RAISE foreign_key_violation USING MESSAGE = format('Unknown park_id %s', NEW.park_id);
+        END IF;
+        INSERT INTO dwh.courts (park_key, court_id) VALUES (v_park_key, NEW.court_id)
+            ON CONFLICT (park_key, court_id) DO NOTHING;
+        SELECT id INTO v_court_key FROM dwh.courts WHERE park_key = v_park_key AND court_id = NEW.court_id;
+        INSERT INTO dwh.slot_statuses (status) VALUES (NEW.status) ON CONFLICT (status) DO NOTHING;
+        SELECT id INTO v_status_id FROM dwh.slot_statuses WHERE status = NEW.status;
+
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO dwh.court_availability_slots (
+                court_key, date, slot_time, status_id, reservation_id, reservation_link,
+                is_available, last_updated
+            ) VALUES (
+                v_court_key, NEW.date, dwh.parse_slot_time(NEW.time), v_status_id,
+                dwh.reservation_id(NEW.reservation_link),
+                CASE WHEN dwh.reservation_id(NEW.reservation_link) IS NULL THEN NEW.reservation_link END,
+                COALESCE(NEW.is_available, false), COALESCE(NEW.last_updated, now())
+            ) RETURNING id INTO NEW.id;
+        ELSE
+            UPDATE dwh.court_availability_slots SET
+                court_key = v_court_key,
+                date = NEW.date,
+                slot_time = dwh.parse_slot_time(NEW.time),
+                status_id = v_status_id,
+                reservation_id = dwh.reservation_id(NEW.reservation_link),
+                reservation_link = CASE WHEN dwh.reservation_id(NEW.reservation_link) IS NULL
+                    THEN NEW.reservation_link END,
+                is_available = NEW.is_available,
+                last_updated = COALESCE(NEW.last_updated, now())
+            WHERE id = OLD.id;
+        END IF;
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER court_availability_write
+    INSTEAD OF INSERT OR UPDATE OR DELETE ON dwh.court_availability
+    FOR EACH ROW EXECUTE FUNCTION dwh.court_availability_write()
+    """,
+]
+
+DROP_COURT_AVAILABILITY_DDL = [
+    "DROP VIEW IF EXISTS dwh.court_availability",
+    "DROP FUNCTION IF EXISTS dwh.court_availability_write()",
+    "DROP FUNCTION IF EXISTS dwh.reservation_id(text)",
+    "DROP FUNCTION IF EXISTS dwh.format_slot_time(smallint)",
+    "DROP FUNCTION IF EXISTS dwh.parse_slot_time(text)",
+]
+
+def register_views(metadata) -> None:
+    """Create the view and its functions alongside the tables."""
+    # DDL statements treat % as a format character
+    for statement in COURT_AVAILABILITY_DDL:
+        ddl = DDL(statement.replace('%', '%%'))
+        event.listen(metadata, 'after_create', ddl.execute_if(dialect='postgresql'))
+    for statement in DROP_COURT_AVAILABILITY_DDL:
+        event.listen(metadata, 'before_drop', DDL(statement).execute_if(dialect='postgresql'))
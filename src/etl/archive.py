@@ -0,0 +1,192 @@
+"""
+Columnar archive for processed raw availability files.
+
+Processed CSVs are compacted into one Parquet file per snapshot day,
+zstd-compressed with dictionary-encoded columns, before they are deleted.
+The registry keeps a record of each archived file with the Parquet path, and
+the archives can be read straight back into pandas with `read_archive`.
+"""
+import argparse
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.database.config import SessionLocal
+from src.database.models import FileRegistry
+from src.etl.csv_loader import parse_snapshot_file, snapshot_time_from_filename
+
+ARCHIVE_DIR = Path(os.path.dirname(__file__)).parent.parent / 'data' / 'court_availability' / 'archive'
+
+ARCHIVE_SCHEMA = pa.schema([
+    ('snapshot_time', pa.timestamp('us', tz='America/New_York')),
+    ('park_id', pa.string()),
+    ('court_id', pa.string()),
+    ('date', pa.date32()),
+    ('time', pa.string()),
+    ('status', pa.string()),
+    ('reservation_link', pa.string()),
+    ('file_hash', pa.string()),
+    ('source_file', pa.string()),
+])
+
+# Every column repeats heavily except the reservation link, which is unique per slot
+DICTIONARY_COLUMNS = [
+    'park_id', 'court_id', 'date', 'time', 'status', 'file_hash', 'source_file'
+]
+
+def archive_path_for_day(day: date, archive_dir=None) -> str:
+    """Get the Parquet file holding one day of snapshots."""
+    return os.path.join(str(archive_dir or ARCHIVE_DIR), f"court_availability_{day.strftime('%Y%m%d')}.parquet")
+
+def build_archive_frame(file_path: str, file_hash: str) -> pd.DataFrame:
+    """Read a raw file into archive rows."""
+    df = parse_snapshot_file(file_path, file_hash)
+    df['snapshot_time'] = pd.to_datetime(df['snapshot_time'])
+    df['source_file'] = os.path.basename(file_path)
+    return df
+
+def write_daily_archive(frames: list[pd.DataFrame], path: str) -> int:
+    """Add snapshot frames to a daily archive, replacing re-archived files.
+
+    The file is rewritten through a temporary file so readers never see a
+    partial archive. Returns the number of rows in the archive.
+    """
+    new_rows = pd.concat(frames, ignore_index=True)
+    if os.path.exists(path):
+        existing = pq.read_table(path).to_pandas()
+        existing = existing[~existing['source_file'].isin(new_rows['source_file'].unique())]
+        new_rows = pd.concat([existing, new_rows], ignore_index=True)
+    new_rows = new_rows.sort_values(['snapshot_time', 'park_id', 'court_id'], kind='stable')
+
+    table = pa.Table.from_pandas(
+        new_rows[ARCHIVE_SCHEMA.names], schema=ARCHIVE_SCHEMA, preserve_index=False
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression='zstd', use_dictionary=DICTIONARY_COLUMNS)
+    os.replace(tmp_path, path)
+    return table.num_rows
+
+def archive_processed_files(session, days_threshold: int = 7, archive_dir=None) -> dict:
+    """Compact old processed CSVs into daily Parquet archives and delete them.
+
+    Archived registry records are kept with status 'archived' and their
+    archive_path, so the catch-up loader still treats them as loaded, until
+    `cleanup_processed_files` drops them after ARCHIVED_RETENTION_DAYS.
+
+    Args:
+        session: Database session
+        days_threshold: Number of days after which processed files are archived
+        archive_dir: Directory for the Parquet files
+
+    Returns:
+        Counts of archived files and rows
+    """
+    threshold_date = datetime.now() - timedelta(days=days_threshold)
+    records = session.query(FileRegistry).filter(
+        FileRegistry.load_timestamp < threshold_date,
+        FileRegistry.status == 'processed',
+        FileRegistry.archive_path.is_(None)
+    ).all()
+
+    by_day = defaultdict(list)
+    for record in records:
+        if not os.path.exists(record.filepath):
+            continue
+        by_day[snapshot_time_from_filename(record.filename).date()].append(record)
+
+    report = {'files': 0, 'rows': 0, 'days': 0}
+    for day, day_records in sorted(by_day.items()):
+        frames = []
+        archived = []
+        for record in day_records:
+            try:
+                frames.append(build_archive_frame(record.filepath, record.file_hash))
+                archived.append(record)
+            except Exception as e:
+                print(f"Error archiving file: {record.filepath}: {e}")
+        if not frames:
+            continue
+
+        path = archive_path_for_day(day, archive_dir)
+        write_daily_archive(frames, path)
+        for record, frame in zip(archived, frames):
+            record.archive_path = path
+            record.status = 'archived'
+            report['rows'] += len(frame)
+        session.commit()
+
+        # Only remove the CSVs once the archive and registry are both durable
+        for record in archived:
+            try:
+                os.remove(record.filepath)
+            except OSError:
+                print(f"Error deleting file: {record.filepath}")
+        report['files'] += len(archived)
+        report['days'] += 1
+
+    print(f"Archived {report['files']} files ({report['rows']} rows) into {report['days']} daily archives")
+    return report
+
+def list_archives(archive_dir=None, start_date: Optional[date] = None,
+                  end_date: Optional[date] = None) -> list[str]:
+    """List daily archive files in a date range, oldest first."""
+    archive_dir = str(archive_dir or ARCHIVE_DIR)
+    if not os.path.isdir(archive_dir):
+        return []
+
+    paths = []
+    for filename in sorted(os.listdir(archive_dir)):
+        if not (filename.startswith('court_availability_') and filename.endswith('.parquet')):
+            continue
+        day = datetime.strptime(filename[len('court_availability_'):-len('.parquet')], '%Y%m%d').date()
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+        paths.append(os.path.join(archive_dir, filename))
+    return paths
+
+def read_archive(archive_dir=None, start_date: Optional[date] = None,
+                 end_date: Optional[date] = None, columns: Optional[list[str]] = None,
+                 paths: Optional[list[str]] = None) -> pd.DataFrame:
+    """Read archived snapshots into a DataFrame.
+
+    Dictionary-encoded string columns come back as pandas categoricals, so
+    long histories stay compact in memory.
+
+    Args:
+        archive_dir: Directory for the Parquet archives
+        start_date: First snapshot day to read
+        end_date: Last snapshot day to read
+        columns: Columns to read, defaults to all
+        paths: Specific archive files to read instead of a date range
+    """
+    if paths is None:
+        paths = list_archives(archive_dir, start_date, end_date)
+    if not paths:
+        return pd.DataFrame(columns=columns or ARCHIVE_SCHEMA.names)
+
+    read_dictionary = [
+        name for name in DICTIONARY_COLUMNS
+        if name != 'date' and (columns is None or name in columns)
+    ]
+    tables = [
+        pq.read_table(path, columns=columns, read_dictionary=read_dictionary)
+        for path in paths
+    ]
+    return pa.concat_tables(tables).to_pandas()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compact processed raw files into daily Parquet archives.')
+    parser.add_argument('--days', type=int, default=7, help='Archive processed files older than this many days')
+    parser.add_argument('--archive-dir', help='Directory for the Parquet archives')
+
+    args = parser.parse_args()
+    session = SessionLocal()
+    try:
+        archive_processed_files(session, days_threshold=args.days, archive_dir=args.archive_dir)
+    finally:
+        session.close()
@@ -1,12 +1,25 @@
 import os
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
+import pandas as pd
 from src.etl.csv_loader import (
     register_file, load_availability_to_staging,
-    merge_availability_to_dwh, update_file_status
+    merge_availability_to_dwh, update_file_status,
+    validate_availability_data, bulk_load_availability,
+    create_availability_staging, drop_availability_staging
 )
 from src.database.config import SessionLocal
+from src.database.models import FileRegistry
+
+SLOT_KEY_COLUMNS = ['park_id', 'court_id', 'date', 'time']
+DEFAULT_CATCHUP_BATCH_SIZE = 24
+
+def get_data_dir() -> Path:
+    """Get the raw availability files directory."""
+    base_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    return base_dir / 'data' / 'court_availability' / 'raw_files'
 
 def get_latest_file(data_dir: str) -> str:
     """Get the latest availability file from the data directory."""
@@ -34,22 +47,163 @@ def process_file(file_path: str, session=None) -> None:
         load_availability_to_staging(file_path, file_id, session)
         
         # Merge to DWH
-        merge_availability_to_dwh(session)
+        merge_availability_to_dwh(session, file_id)
         
         # Update file status
         update_file_status(file_id, 'processed', session)
     finally:
+        if 'file_id' in locals():
+            drop_availability_staging(file_id, session)
         if should_close:
             session.close()
 
 def run_availability_etl() -> None:
     """Run the availability ETL process."""
     # Get the data directory
-    base_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    data_dir = base_dir / 'data' / 'court_availability' / 'raw_files'
+    data_dir = get_data_dir()
     
     # Get latest file
     latest_file = get_latest_file(str(data_dir))
     
     # Process file
-    process_file(latest_file) 
\ No newline at end of file
+    process_file(latest_file)
+
+def get_pending_files(data_dir: str, session) -> list[str]:
+    """Get raw files that are not in the file registry, oldest first.
+
+    Files are matched by name; anything already registered, whatever its
+    status, is skipped. Filenames embed a sortable timestamp, so sorting by
+    name gives timestamp order.
+    """
+    files = sorted(
+        f for f in os.listdir(data_dir)
+        if f.startswith('court_availability_') and f.endswith('.csv')
+    )
+    registered = {
+        filename for (filename,) in session.query(FileRegistry.filename).filter(
+            FileRegistry.filename.in_(files)
+        )
+    }
+    return [os.path.join(data_dir, f) for f in files if f not in registered]
+
+def coalesce_snapshots(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Keep only the newest snapshot of each park across consecutive snapshots.
+
+    A scrape lists every open slot of each park it covers, so a slot missing
+    from a park's newer snapshot was booked or removed. Each park's rows are
+    therefore taken from the newest frame that contains the park, never merged
+    with older frames, and the parks are then combined.
+
+    Frames must be passed oldest first and already validated, so that dates
+    are normalized.
+    """
+    newest = {}
+    for frame in frames:
+        frame = frame.assign(
+            park_id=frame['park_id'].astype(str), court_id=frame['court_id'].astype(str)
+        )
+        newest.update(dict(tuple(frame.groupby('park_id', sort=False))))
+    if not newest:
+        return pd.concat(frames, ignore_index=True)
+    combined = pd.concat(newest.values(), ignore_index=True)
+    return combined.drop_duplicates(SLOT_KEY_COLUMNS, keep='last')
+
+def process_batch(file_paths: list[str], session, export: bool = True) -> dict:
+    """Load a batch of raw files with a single coalesced merge, then export if asked."""
+    frames = []
+    file_ids = []
+    rows_read = 0
+    failed = 0
+
+    for file_path in file_paths:
+        file_id = register_file(file_path, session=session)
+        try:
+            df = pd.read_csv(file_path)
+            validate_availability_data(df)
+        except Exception as e:
+            print(f"Skipping {os.path.basename(file_path)}: {e}")
+            update_file_status(file_id, 'failed', session)
+            failed += 1
+            continue
+        df['file_id'] = file_id
+        frames.append(df)
+        file_ids.append(file_id)
+        rows_read += len(df)
+
+    rows_merged = 0
+    if frames:
+        coalesced = coalesce_snapshots(frames)
+        try:
+            create_availability_staging(file_ids, session)
+            rows_merged = bulk_load_availability(coalesced, None, session)
+            session.commit()
+            merge_availability_to_dwh(session, file_ids, export=export)
+        except Exception:
+            session.rollback()
+            for file_id in file_ids:
+                update_file_status(file_id, 'failed', session)
+            raise
+        finally:
+            drop_availability_staging(file_ids, session)
+
+        for file_id in file_ids:
+            update_file_status(file_id, 'processed', session)
+
+    return {
+        'files': len(file_ids),
+        'failed_files': failed,
+        'rows_read': rows_read,
+        'rows_merged': rows_merged,
+    }
+
+def run_catchup_etl(data_dir: Optional[str] = None, batch_size: int = DEFAULT_CATCHUP_BATCH_SIZE,
+                    session=None) -> dict:
+    """Load every unprocessed raw file in timestamp order.
+
+    Args:
+        data_dir: Raw files directory, defaults to data/court_availability/raw_files
+        batch_size: Number of files coalesced into each staging load and merge
+        session: Optional database session
+
+    Returns:
+        Throughput report for the whole catch-up run
+    """
+    if session is None:
+        session = SessionLocal()
+        should_close = True
+    else:
+        should_close = False
+
+    started = time.monotonic()
+    report = {'files': 0, 'failed_files': 0, 'rows_read': 0, 'rows_merged': 0, 'batches': 0}
+    try:
+        pending = get_pending_files(str(data_dir or get_data_dir()), session)
+        print(f"Found {len(pending)} unprocessed files")
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            batch_started = time.monotonic()
+            # Only the state after the last batch is worth exporting
+            batch_report = process_batch(batch, session, export=start + batch_size >= len(pending))
+            for key in ('files', 'failed_files', 'rows_read', 'rows_merged'):
+                report[key] += batch_report[key]
+            report['batches'] += 1
+            print(
+                f"Batch {report['batches']}: {batch_report['files']} files, "
+                f"{batch_report['rows_read']} rows read, {batch_report['rows_merged']} merged "
+                f"in {time.monotonic() - batch_started:.2f}s"
+            )
+    finally:
+        if should_close:
+            session.close()
+
+    elapsed = time.monotonic() - started
+    report['elapsed_seconds'] = round(elapsed, 2)
+    report['files_per_second'] = round(report['files'] / elapsed, 2) if elapsed else 0.0
+    report['rows_per_second'] = round(report['rows_read'] / elapsed, 2) if elapsed else 0.0
+    print(
+        f"Catch-up complete: {report['files']} files ({report['failed_files']} failed), "
+        f"{report['rows_read']} rows read, {report['rows_merged']} merged, "
+        f"{report['files_per_second']} files/s, {report['rows_per_second']} rows/s"
+    )
+    return report 
\ No newline at end of file
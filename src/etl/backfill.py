@@ -0,0 +1,179 @@
+"""
+Parallel backfill of historical raw files into dwh.availability_snapshots.
+
+Files are parsed and validated in a process pool and bulk loaded with COPY,
+one transaction per file. A snapshot is identified by its content hash
+together with its scrape time, so files that happen to repeat an earlier
+scrape's content are still loaded. Each loaded snapshot is recorded in
+`dwh.availability_snapshot_loads` in the same transaction, even when it
+had no rows, so re-running the backfill skips everything already loaded
+and picks up where an interrupted run stopped.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from src.database.config import SessionLocal
+from src.database.models import DwhSnapshotLoad
+from src.etl.archive import list_archives, read_archive
+from src.etl.availability_loader import get_data_dir
+from src.etl.csv_loader import (
+    SNAPSHOT_COLUMNS, calculate_file_hash, copy_dataframe, parse_snapshot_file,
+    snapshot_time_from_filename
+)
+
+SNAPSHOT_TABLE = 'dwh.availability_snapshots'
+
+def snapshot_key(file_hash: str, snapshot_time) -> tuple[str, pd.Timestamp]:
+    """Identify a snapshot by its content hash and scrape time."""
+    return file_hash, pd.Timestamp(snapshot_time)
+
+def get_loaded_snapshots(session) -> set[tuple[str, pd.Timestamp]]:
+    """Get the keys of snapshots already in the history."""
+    rows = session.execute(select(DwhSnapshotLoad.file_hash, DwhSnapshotLoad.snapshot_time))
+    return {snapshot_key(file_hash, snapshot_time) for file_hash, snapshot_time in rows}
+
+def record_snapshot_loads(session, loads: list[dict]) -> None:
+    """Record loaded snapshots in the caller's transaction.
+
+    Each load is a dict with file_hash, snapshot_time and rows.
+    """
+    session.execute(insert(DwhSnapshotLoad).values(loads).on_conflict_do_nothing(
+        constraint='uq_availability_snapshot_loads'
+    ))
+
+def list_raw_files(data_dir: str) -> list[str]:
+    """List raw availability files, oldest first."""
+    return [
+        os.path.join(data_dir, f)
+        for f in sorted(os.listdir(data_dir))
+        if f.startswith('court_availability_') and f.endswith('.csv')
+    ]
+
+def backfill_archives(loaded: set[tuple[str, pd.Timestamp]], session, archive_dir=None) -> tuple[int, int]:
+    """Load snapshot rows from Parquet archives whose source files are missing.
+
+    Archives are read directly, without re-parsing any CSV. Returns the
+    number of source files and rows loaded.
+    """
+    files = rows = 0
+    for path in list_archives(archive_dir):
+        df = read_archive(columns=SNAPSHOT_COLUMNS, paths=[path])
+        keys = [snapshot_key(*key) for key in zip(df['file_hash'], df['snapshot_time'])]
+        df = df[[key not in loaded for key in keys]]
+        if df.empty:
+            continue
+        counts = df.groupby(['file_hash', 'snapshot_time']).size()
+        try:
+            copy_dataframe(df, SNAPSHOT_TABLE, SNAPSHOT_COLUMNS, session)
+            record_snapshot_loads(session, [
+                {'file_hash': file_hash, 'snapshot_time': snapshot_time, 'rows': int(rows)}
+                for (file_hash, snapshot_time), rows in counts.items()
+            ])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        loaded.update(snapshot_key(*key) for key in counts.index)
+        files += len(counts)
+        rows += len(df)
+        print(f"  - Loaded {len(df)} rows from archive {os.path.basename(path)}")
+    return files, rows
+
+def run_backfill(data_dir: Optional[str] = None, workers: Optional[int] = None,
+                 session=None, archive_dir=None) -> dict:
+    """Backfill every raw file not yet in dwh.availability_snapshots.
+
+    Raw CSVs are loaded first, then any files that only survive in the
+    Parquet archives.
+
+    Args:
+        data_dir: Raw files directory, defaults to data/court_availability/raw_files
+        workers: Number of parser processes, defaults to the number of cores
+        session: Optional database session
+        archive_dir: Parquet archive directory, defaults to data/court_availability/archive
+
+    Returns:
+        Summary with loaded, skipped and failed file counts, the names of
+        the skipped files and throughput
+    """
+    if session is None:
+        session = SessionLocal()
+        should_close = True
+    else:
+        should_close = False
+
+    started = time.monotonic()
+    report = {'files_loaded': 0, 'files_skipped': 0, 'files_failed': 0, 'rows_loaded': 0, 'skipped_files': []}
+    try:
+        loaded = get_loaded_snapshots(session)
+        pending = {}
+        for file_path in list_raw_files(str(data_dir or get_data_dir())):
+            file_hash = calculate_file_hash(file_path)
+            key = snapshot_key(file_hash, snapshot_time_from_filename(file_path))
+            if key in loaded:
+                report['files_skipped'] += 1
+                report['skipped_files'].append(os.path.basename(file_path))
+            else:
+                pending[file_path] = file_hash
+        print(f"Backfilling {len(pending)} files ({report['files_skipped']} already loaded)")
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(parse_snapshot_file, file_path, file_hash): file_path
+                for file_path, file_hash in pending.items()
+            }
+            for future in as_completed(futures):
+                file_name = os.path.basename(futures[future])
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"  - Skipping {file_name}: {e}")
+                    report['files_failed'] += 1
+                    continue
+
+                # One transaction per file keeps the backfill resumable
+                file_hash = pending[futures[future]]
+                snapshot_time = snapshot_time_from_filename(futures[future])
+                try:
+                    copy_dataframe(df, SNAPSHOT_TABLE, SNAPSHOT_COLUMNS, session)
+                    record_snapshot_loads(session, [
+                        {'file_hash': file_hash, 'snapshot_time': snapshot_time, 'rows': len(df)}
+                    ])
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+                loaded.add(snapshot_key(file_hash, snapshot_time))
+                report['files_loaded'] += 1
+                report['rows_loaded'] += len(df)
+                print(f"  - Loaded {len(df)} rows from {file_name}")
+
+        archived_files, archived_rows = backfill_archives(loaded, session, archive_dir)
+        report['files_loaded'] += archived_files
+        report['rows_loaded'] += archived_rows
+    finally:
+        if should_close:
+            session.close()
+
+    elapsed = time.monotonic() - started
+    report['elapsed_seconds'] = round(elapsed, 2)
+    report['rows_per_second'] = round(report['rows_loaded'] / elapsed, 2) if elapsed else 0.0
+    print(
+        f"Backfill complete: {report['files_loaded']} files, {report['rows_loaded']} rows "
+        f"in {report['elapsed_seconds']}s ({report['rows_per_second']} rows/s)"
+    )
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill raw files into the snapshot history table.')
+    parser.add_argument('--data-dir', help='Raw files directory')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: all cores)')
+    parser.add_argument('--archive-dir', help='Parquet archive directory')
+
+    args = parser.parse_args()
+    run_backfill(data_dir=args.data_dir, workers=args.workers, archive_dir=args.archive_dir)
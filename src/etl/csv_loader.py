@@ -1,14 +1,16 @@
 import pandas as pd
 import numpy as np
 import hashlib
+import io
 from datetime import datetime, timedelta
 import os
+import time
 import pytz
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, insert
 from src.database.models import (
     FileRegistry, DwhTennisCourt, StagingTennisCourt,
-    DwhCourtAvailability, StagingCourtAvailability
+    DwhCourtAvailabilitySlot, DwhParkDayAvailability, StagingCourtAvailability
 )
 from src.database.config import SessionLocal, engine
 from pathlib import Path
@@ -37,22 +39,38 @@ def cleanup_old_availability(session):
         today = datetime.now().date()
         # Use a nested transaction to allow rollback without affecting parent transaction
         with session.begin_nested():
-            session.query(DwhCourtAvailability).filter(
-                DwhCourtAvailability.date < today
+            session.query(DwhCourtAvailabilitySlot).filter(
+                DwhCourtAvailabilitySlot.date < today
+            ).delete(synchronize_session=False)
+            session.query(DwhParkDayAvailability).filter(
+                DwhParkDayAvailability.date < today
             ).delete(synchronize_session=False)
     except Exception as e:
         session.rollback()
         raise e
 
-def cleanup_processed_files(session, days_threshold=7, include_failed=False):
+# Archived files' registry rows only keep the catch-up loader from reloading
+# their CSVs, which archiving deleted, so they can go after this long
+ARCHIVED_RETENTION_DAYS = 90
+
+def cleanup_processed_files(session, days_threshold=7, include_failed=False,
+                            archived_days_threshold=ARCHIVED_RETENTION_DAYS):
     """Clean up old processed files from the registry and filesystem.
     
     Args:
         session: Database session
         days_threshold: Number of days after which to clean up files
         include_failed: Whether to include failed files in cleanup
+        archived_days_threshold: Number of days after which to drop archived
+            files' registry rows; their Parquet archives are kept
     """
     threshold_date = datetime.now() - timedelta(days=days_threshold)
+
+    # Daily archives are shared by many files, so only the rows go
+    session.query(FileRegistry).filter(
+        FileRegistry.load_timestamp < datetime.now() - timedelta(days=archived_days_threshold),
+        FileRegistry.status == 'archived'
+    ).delete(synchronize_session=False)
     
     # Build query for old files
     query = session.query(FileRegistry).filter(
@@ -118,6 +136,49 @@ def validate_court_data(df):
     if not duplicates.empty:
         raise ValueError(f"Duplicate court IDs found: {duplicates['court_id'].unique().tolist()}")
 
+SNAPSHOT_COLUMNS = [
+    'snapshot_time', 'park_id', 'court_id', 'date', 'time',
+    'status', 'reservation_link', 'file_hash'
+]
+
+def snapshot_time_from_filename(filename: str) -> datetime:
+    """Get the scrape time encoded in a raw file name."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    naive = datetime.strptime(stem.replace('court_availability_', ''), '%Y%m%d_%H%M%S')
+    return pytz.timezone('America/New_York').localize(naive)
+
+def normalize_legacy_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert raw files written before the park/court split to the current layout.
+
+    Older files used court_id for the park and a 'Court N' label column, and
+    also listed unavailable slots with an unreliable or missing is_available
+    column, so availability is derived from the status as in the
+    add_is_available_column migration; their unavailable slots are dropped.
+    Current-layout files are returned unchanged and left to
+    validate_availability_data.
+    """
+    if 'court' not in df.columns or 'park_id' in df.columns:
+        return df
+    df = df.rename(columns={'court_id': 'park_id'})
+    df['court_id'] = df['court'].astype(str).str.replace('Court ', '', regex=False)
+    df = df.drop(columns=['court'])
+    df['is_available'] = df['status'] == 'Reserve this time'
+    return df[df['is_available']].copy()
+
+def parse_snapshot_file(file_path: str, file_hash: str) -> pd.DataFrame:
+    """Parse and validate one raw file into snapshot history rows.
+
+    Only touches the file, never the database, so it can run in a worker process.
+    """
+    df = normalize_legacy_columns(pd.read_csv(file_path))
+    validate_availability_data(df)
+
+    df['park_id'] = df['park_id'].astype(str)
+    df['court_id'] = df['court_id'].astype(str)
+    df['snapshot_time'] = snapshot_time_from_filename(file_path).isoformat()
+    df['file_hash'] = file_hash
+    return df[SNAPSHOT_COLUMNS]
+
 def validate_availability_data(df):
     """Validate availability data before loading."""
     # Check required columns
@@ -126,8 +187,10 @@ def validate_availability_data(df):
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
 
-    # Convert dates to datetime
-    df['date'] = pd.to_datetime(df['date']).dt.date
+    # Convert dates to datetime, parsing each distinct value once
+    unique_dates = pd.unique(df['date'])
+    parsed_dates = pd.to_datetime(pd.Series(unique_dates)).dt.date
+    df['date'] = df['date'].map(dict(zip(unique_dates, parsed_dates))).astype(object)
 
     # Validate time format (HH:MM a.m./p.m.)
     def is_valid_time(time_str):
@@ -145,9 +208,10 @@ def validate_availability_data(df):
                 except ValueError:
                     return False
 
-    invalid_times = df[~df['time'].apply(is_valid_time)]
-    if not invalid_times.empty:
-        raise ValueError(f"Invalid time format found: {invalid_times['time'].unique().tolist()}")
+    # A file only has a few dozen distinct slot times
+    invalid_times = [slot_time for slot_time in pd.unique(df['time']) if not is_valid_time(slot_time)]
+    if invalid_times:
+        raise ValueError(f"Invalid time format found: {invalid_times}")
 
     # Validate that all slots are available
     unavailable_slots = df[~df['is_available']]
@@ -160,8 +224,8 @@ def load_courts_to_staging(df, session):
         # Validate data
         validate_court_data(df)
 
-        # Clear staging table
-        session.query(StagingTennisCourt).delete()
+        # Clear staging table; it is UNLOGGED, so neither this nor the load writes WAL
+        session.execute(text(f"TRUNCATE {StagingTennisCourt.__table__.fullname}"))
 
         # Load data to staging
         for _, row in df.iterrows():
@@ -227,32 +291,168 @@ def merge_courts_to_dwh(session):
         session.rollback()
         raise e
 
-def load_availability_to_staging(file_path, file_id, session):
-    """Load availability data to staging table."""
+def build_staging_rows(df, file_id):
+    """Build staging insert parameters from validated availability data.
+
+    When file_id is None, each row's file_id is taken from the DataFrame.
+    """
+    file_ids = df['file_id'] if file_id is None else [file_id] * len(df)
+    return [
+        {
+            'park_id': str(park_id),
+            'court_id': str(court_id),
+            'date': date,
+            'time': time,
+            'status': status,
+            'reservation_link': reservation_link if reservation_link else None,
+            'is_available': bool(is_available),
+            'file_id': int(row_file_id)
+        }
+        for park_id, court_id, date, time, status, reservation_link, is_available, row_file_id in zip(
+            df['park_id'], df['court_id'], df['date'], df['time'],
+            df['status'], df['reservation_link'], df['is_available'], file_ids
+        )
+    ]
+
+def copy_dataframe(df, table_name, columns, session):
+    """Bulk load DataFrame columns into a table with COPY FROM STDIN.
+
+    Runs on the session's connection, inside its current transaction.
+    Missing values are written as NULL. Returns the number of rows copied.
+    """
+    buffer = io.StringIO()
+    df[columns].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
     try:
-        # Read and validate data
-        df = pd.read_csv(file_path)
-        validate_availability_data(df)
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+    return len(df)
 
-        # Clean NaN values
-        df['reservation_link'] = df['reservation_link'].fillna('')
+def availability_staging_table(file_id) -> str:
+    """Name of a file's staging partition."""
+    return f"{StagingCourtAvailability.__table__.fullname}_f{int(file_id)}"
 
-        # Clear staging table
-        session.query(StagingCourtAvailability).delete()
+def create_availability_staging(file_ids, session):
+    """Create, or empty, an UNLOGGED staging partition for each file.
 
-        # Load data to staging
-        for _, row in df.iterrows():
-            availability = StagingCourtAvailability(
-                park_id=str(row['park_id']),
-                court_id=str(row['court_id']),
-                date=row['date'],
-                time=row['time'],
-                status=row['status'],
-                reservation_link=row['reservation_link'] if row['reservation_link'] else None,
-                is_available=row['is_available'],
-                file_id=file_id
-            )
-            session.add(availability)
+    The partition is built on its own and then attached, which only takes a
+    SHARE UPDATE EXCLUSIVE lock on the parent, so loads already writing to
+    their own partitions are not blocked. Commits, so the lock is released
+    before the load starts.
+    """
+    parent = StagingCourtAvailability.__table__.fullname
+    for file_id in ([file_ids] if isinstance(file_ids, int) else file_ids):
+        table = availability_staging_table(file_id)
+        exists = session.execute(text("SELECT to_regclass(:table)"), {'table': table}).scalar()
+        if exists:
+            session.execute(text(f"TRUNCATE {table}"))
+            continue
+        session.execute(text(
+            f"CREATE UNLOGGED TABLE {table} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        session.execute(text(
+            f"ALTER TABLE {parent} ATTACH PARTITION {table} FOR VALUES IN ({int(file_id)})"
+        ))
+    session.commit()
+
+def drop_availability_staging(file_ids, session):
+    """Detach and drop the staging partitions of merged or failed files.
+
+    Ends the session's transaction first: a concurrent detach waits for every
+    transaction using the parent, including this session's own.
+    """
+    session.commit()
+    parent = StagingCourtAvailability.__table__.fullname
+    with session.get_bind().engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for file_id in ([file_ids] if isinstance(file_ids, int) else file_ids):
+            table = availability_staging_table(file_id)
+            attached = conn.execute(text(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:table)"
+            ), {'table': table}).scalar()
+            if attached:
+                conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {table} CONCURRENTLY"))
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+def bulk_load_availability(df, file_id, session):
+    """Validate availability data and bulk insert it into staging.
+
+    Does not clear staging or commit, so it can be called once per batch.
+    Returns the number of rows inserted.
+    """
+    validate_availability_data(df)
+
+    # Clean NaN values
+    df['reservation_link'] = df['reservation_link'].fillna('')
+
+    rows = build_staging_rows(df, file_id)
+    if rows:
+        session.execute(insert(StagingCourtAvailability), rows)
+    return len(rows)
+
+# Rows per chunk when streaming a raw file into staging
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Explicit dtypes keep chunks small: the repeated ID and status strings are
+# stored once per chunk as categories
+AVAILABILITY_DTYPES = {
+    'park_id': 'category',
+    'court_id': 'category',
+    'court': 'category',
+    'date': 'category',
+    'time': 'category',
+    'status': 'category',
+    'reservation_link': 'string',
+}
+
+STAGING_AVAILABILITY_COLUMNS = [
+    'park_id', 'court_id', 'date', 'time', 'status', 'reservation_link', 'is_available', 'file_id'
+]
+
+def stream_availability_to_staging(file_path, file_id, session, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate a raw file and COPY it into staging one chunk at a time.
+
+    Only one chunk is held in memory, so peak memory does not grow with the
+    file. Copies straight into the file's partition, which must already
+    exist (see `create_availability_staging`). Does not commit.
+
+    Returns:
+        Row and chunk counts with the load throughput
+    """
+    started = time.monotonic()
+    report = {'rows': 0, 'chunks': 0}
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size, dtype=AVAILABILITY_DTYPES):
+        chunk_started = time.monotonic()
+        chunk = normalize_legacy_columns(chunk)
+        validate_availability_data(chunk)
+        chunk['file_id'] = file_id
+        copy_dataframe(chunk, availability_staging_table(file_id), STAGING_AVAILABILITY_COLUMNS, session)
+
+        report['rows'] += len(chunk)
+        report['chunks'] += 1
+        chunk_elapsed = time.monotonic() - chunk_started
+        rate = len(chunk) / chunk_elapsed if chunk_elapsed else 0.0
+        print(f"  - Chunk {report['chunks']}: {len(chunk)} rows ({rate:.0f} rows/s)")
+
+    elapsed = time.monotonic() - started
+    report['elapsed_seconds'] = round(elapsed, 2)
+    report['rows_per_second'] = round(report['rows'] / elapsed, 2) if elapsed else 0.0
+    return report
+
+def load_availability_to_staging(file_path, file_id, session):
+    """Load availability data to staging table."""
+    try:
+        # Stage into the file's own partition, leaving other loads alone
+        create_availability_staging(file_id, session)
+
+        # Stream the file into staging in bounded chunks
+        report = stream_availability_to_staging(file_path, file_id, session)
+        print(f"Staged {report['rows']} rows in {report['chunks']} chunks ({report['rows_per_second']} rows/s)")
 
         session.commit()
         update_file_status(file_id, 'processed', session)
@@ -261,43 +461,94 @@ def load_availability_to_staging(file_path, file_id, session):
         update_file_status(file_id, 'failed', session)
         raise e
 
-def merge_availability_to_dwh(session):
-    """Merge availability data from staging to DWH."""
-    try:
-        # Get staging data
-        staging_data = session.query(StagingCourtAvailability).all()
+# Encode staged slots into the compact DWH tables; parks and courts get their
+# surrogate keys and new statuses their codes before the slots are upserted
+MERGE_KEYS_SQL = [
+    """
+    INSERT INTO dwh.courts (park_key, court_id)
+    SELECT DISTINCT tc.id, s.court_id
+    FROM staging.court_availability s
+    JOIN dwh.tennis_courts tc ON tc.park_id = s.park_id
+    {where}
+    ON CONFLICT (park_key, court_id) DO NOTHING
+    """,
+    """
+    INSERT INTO dwh.slot_statuses (status)
+    SELECT DISTINCT status FROM staging.court_availability s
+    {where}
+    ON CONFLICT (status) DO NOTHING
+    """,
+]
+
+UPSERT_SLOTS_SQL = """
+    INSERT INTO {target} (
+        court_key, date, slot_time, status_id, reservation_id, reservation_link,
+        is_available, last_updated
+    )
+    SELECT DISTINCT ON (c.id, s.date, dwh.parse_slot_time(s.time))
+        c.id, s.date, dwh.parse_slot_time(s.time), st.id,
+        dwh.reservation_id(s.reservation_link),
+        CASE WHEN dwh.reservation_id(s.reservation_link) IS NULL THEN s.reservation_link END,
+        s.is_available, now()
+    FROM staging.court_availability s
+    JOIN dwh.tennis_courts tc ON tc.park_id = s.park_id
+    JOIN dwh.courts c ON c.park_key = tc.id AND c.court_id = s.court_id
+    JOIN dwh.slot_statuses st ON st.status = s.status
+    {where}
+    ORDER BY c.id, s.date, dwh.parse_slot_time(s.time), s.id DESC
+    ON CONFLICT (court_key, date, slot_time) DO UPDATE SET
+        status_id = EXCLUDED.status_id,
+        reservation_id = EXCLUDED.reservation_id,
+        reservation_link = EXCLUDED.reservation_link,
+        last_updated = EXCLUDED.last_updated
+"""
+
+MERGE_AVAILABILITY_SQL = MERGE_KEYS_SQL + [UPSERT_SLOTS_SQL]
+
+# Serializes writers of the current availability state, so a shadow table
+# published by src.etl.publish can't drop an in-place merge made while it was built
+AVAILABILITY_WRITE_LOCK_KEY = 73461251
+
+def staged_rows_filter(file_ids):
+    """WHERE clause and parameters restricting staged rows to some files."""
+    if file_ids is None:
+        return '', {}
+    file_ids = [file_ids] if isinstance(file_ids, int) else list(file_ids)
+    return 'WHERE s.file_id = ANY(:file_ids)', {'file_ids': file_ids}
+
+def merge_availability_to_dwh(session, file_ids=None, export: bool = True) -> dict:
+    """Merge availability data from staging to DWH.
+
+    The park-days the files touched are refreshed in the read model in the
+    same transaction, and the new data version is then exported as the
+    static snapshot.
 
-        # Update or insert records
-        for staging_slot in staging_data:
-            dwh_slot = session.query(DwhCourtAvailability).filter_by(
-                park_id=staging_slot.park_id,
-                court_id=staging_slot.court_id,
-                date=staging_slot.date,
-                time=staging_slot.time
-            ).first()
+    Args:
+        session: Database session
+        file_ids: Only merge these files' staging partitions; all staged rows by default
+        export: Whether to export the static snapshot after the merge
 
-            if dwh_slot:
-                # Update existing record
-                dwh_slot.status = staging_slot.status
-                dwh_slot.reservation_link = staging_slot.reservation_link
-                dwh_slot.last_updated = datetime.now(pytz.UTC)
-            else:
-                # Insert new record
-                dwh_slot = DwhCourtAvailability(
-                    park_id=staging_slot.park_id,
-                    court_id=staging_slot.court_id,
-                    date=staging_slot.date,
-                    time=staging_slot.time,
-                    status=staging_slot.status,
-                    reservation_link=staging_slot.reservation_link,
-                    is_available=staging_slot.is_available
-                )
-                session.add(dwh_slot)
+    Returns:
+        The new data version, its change count and the exported snapshot version
+    """
+    # The read model builds on this module's staging helpers
+    from src.etl.read_model import export_published, refresh_park_days
 
+    where, params = staged_rows_filter(file_ids)
+    try:
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': AVAILABILITY_WRITE_LOCK_KEY})
+        for statement in MERGE_AVAILABILITY_SQL:
+            session.execute(
+                text(statement.format(where=where, target=DwhCourtAvailabilitySlot.__table__.fullname)),
+                params
+            )
+        result = refresh_park_days(session, file_ids)
         session.commit()
     except Exception as e:
         session.rollback()
         raise e
+    result['snapshot_version'] = export_published(session, export)
+    return result
 
 def register_file(file_path, session):
     """Register a file in the registry."""
@@ -347,7 +598,7 @@ def run_availability_etl(file_path: str):
         load_availability_to_staging(file_path, file_id, session)
         
         # Merge to DWH
-        merge_availability_to_dwh(session)
+        merge_availability_to_dwh(session, file_id)
         
         # Update file status to 'processed'
         update_file_status(file_id, 'processed', session)
@@ -357,4 +608,6 @@ def run_availability_etl(file_path: str):
             update_file_status(file_id, 'failed', session)
         raise e
     finally:
+        if 'file_id' in locals():
+            drop_availability_staging(file_id, session)
         session.close() 
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Distributed scraping across worker processes and hosts.
+
+A coordinator registers a run and enqueues one lease per park in
+`raw_files.scrape_leases`. Any number of workers, on any host that can reach
+the database, claim parks with `SELECT ... FOR UPDATE SKIP LOCKED`, scrape
+them and write the records straight into staging, marking the lease done in
+the same transaction. A lease that is not completed before it expires goes
+back to the queue. Lease expiry is set and checked against the database's
+clock, so clock skew between worker hosts doesn't matter. Once every lease is done or failed, the coordinator merges
+staging into the DWH.
+"""
+import argparse
+import hashlib
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+import pandas as pd
+from sqlalchemy import and_, func, insert, or_
+from src.court_availability_finder import AVAILABILITY_COLUMNS, get_availability_data, load_parks
+from src.database.config import SessionLocal
+from src.database.models import FileRegistry, ScrapeLease
+from src.etl.csv_loader import (
+    bulk_load_availability, create_availability_staging,
+    drop_availability_staging, merge_availability_to_dwh, update_file_status
+)
+from src.etl.scrape_scheduler import mark_stale, record_scrape
+from src.request_throttle import AimdController, deadline_passed, remaining_seconds
+
+# A worker must finish its claimed parks within this long
+DEFAULT_LEASE_SECONDS = 300
+CLAIM_BATCH_SIZE = 4
+
+# A park that keeps failing or expiring is given up on after this many leases
+MAX_LEASE_ATTEMPTS = 3
+
+FINALIZE_POLL_SECONDS = 5
+
+def make_worker_id() -> str:
+    """Identify a worker uniquely across hosts and restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def start_run(session, courts_df: Optional[pd.DataFrame] = None) -> int:
+    """Register a distributed run and enqueue a lease for every park.
+
+    Returns the run's file registry ID, which workers and the coordinator use
+    to find it.
+    """
+    if courts_df is None:
+        courts_df = load_parks()
+
+    filename = f"court_availability_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    file_record = FileRegistry(
+        filename=filename,
+        filepath=f"distributed:{filename}",
+        file_hash=hashlib.sha256(filename.encode()).hexdigest(),
+        status='pending'
+    )
+    session.add(file_record)
+    session.flush()
+
+    create_availability_staging(file_record.id, session)
+    park_ids = list(dict.fromkeys(str(court_id) for court_id in courts_df['court_id']))
+    session.execute(insert(ScrapeLease), [
+        {'file_id': file_record.id, 'park_id': park_id, 'status': 'pending', 'attempts': 0}
+        for park_id in park_ids
+    ])
+    session.commit()
+    print(f"Started distributed run {file_record.id} with {len(park_ids)} parks")
+    return file_record.id
+
+def claim_leases(session, file_id: int, worker_id: str, limit: int = CLAIM_BATCH_SIZE,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS, expired_only: bool = False) -> list[str]:
+    """Claim up to `limit` pending or expired parks for a worker.
+
+    Rows locked by another worker's claim are skipped rather than waited on,
+    so concurrent workers never block each other or claim the same park.
+    With expired_only, pending parks are left to the workers.
+    """
+    # The database's clock, shared by every worker host
+    now = func.now()
+    expired = and_(ScrapeLease.status == 'leased', ScrapeLease.lease_expires_at < now)
+    leases = session.query(ScrapeLease).filter(
+        ScrapeLease.file_id == file_id,
+        expired if expired_only else or_(ScrapeLease.status == 'pending', expired)
+    ).order_by(ScrapeLease.id).limit(limit).with_for_update(skip_locked=True).all()
+
+    claimed = []
+    for lease in leases:
+        if lease.attempts >= MAX_LEASE_ATTEMPTS:
+            lease.status = 'failed'
+            lease.error = lease.error or f"Lease expired {lease.attempts} times"
+            mark_stale(lease.park_id, session)
+            continue
+        lease.status = 'leased'
+        lease.worker_id = worker_id
+        lease.lease_expires_at = now + timedelta(seconds=lease_seconds)
+        lease.attempts += 1
+        claimed.append(lease.park_id)
+    session.commit()
+    return claimed
+
+def _held_lease(session, file_id: int, park_id: str, worker_id: str) -> Optional[ScrapeLease]:
+    """Lock a lease if the worker still holds it."""
+    return session.query(ScrapeLease).filter_by(
+        file_id=file_id, park_id=park_id, worker_id=worker_id, status='leased'
+    ).with_for_update().one_or_none()
+
+def complete_lease(session, file_id: int, park_id: str, worker_id: str, records: list[dict]) -> bool:
+    """Stage a park's records and mark its lease done in one transaction.
+
+    Returns False without staging anything if the lease expired and was
+    claimed by another worker in the meantime.
+    """
+    try:
+        lease = _held_lease(session, file_id, park_id, worker_id)
+        if lease is None:
+            session.rollback()
+            print(f"  - Lease on park {park_id} was lost, discarding its records")
+            return False
+
+        rows = 0
+        if records:
+            df = pd.DataFrame(records, columns=AVAILABILITY_COLUMNS)
+            df['court_id'] = df['court_id'].astype(str)
+            rows = bulk_load_availability(df, file_id, session)
+        record_scrape(park_id, records, session)
+
+        lease.status = 'done'
+        lease.rows = rows
+        lease.lease_expires_at = None
+        session.commit()
+        return True
+    except Exception:
+        session.rollback()
+        raise
+
+def release_lease(session, file_id: int, park_id: str, worker_id: str, error: str) -> None:
+    """Return a failed park to the queue, or give up on it after MAX_LEASE_ATTEMPTS."""
+    lease = _held_lease(session, file_id, park_id, worker_id)
+    if lease is None:
+        session.rollback()
+        return
+    lease.error = error
+    lease.lease_expires_at = None
+    if lease.attempts >= MAX_LEASE_ATTEMPTS:
+        lease.status = 'failed'
+        mark_stale(park_id, session)
+    else:
+        lease.status = 'pending'
+    session.commit()
+
+def run_worker(file_id: int, worker_id: Optional[str] = None, batch_size: int = CLAIM_BATCH_SIZE,
+               lease_seconds: int = DEFAULT_LEASE_SECONDS, session=None,
+               expired_only: bool = False, deadline: Optional[float] = None) -> dict:
+    """Claim and scrape parks for a run until none are left to claim.
+
+    Args:
+        file_id: The run's file registry ID
+        worker_id: Unique worker name, generated by default
+        batch_size: Parks claimed at a time
+        lease_seconds: How long a claim is held
+        session: Optional database session
+        expired_only: Only take over expired leases, leaving pending parks to the workers
+        deadline: Stop by this time.monotonic() value; requests stay within it
+            and parks claimed but not started are released
+
+    Returns:
+        Counts of parks scraped, failed and lost to expiry
+    """
+    worker_id = worker_id or make_worker_id()
+    if session is None:
+        session = SessionLocal()
+        should_close = True
+    else:
+        should_close = False
+
+    report = {'worker_id': worker_id, 'parks_done': 0, 'parks_failed': 0, 'parks_lost': 0, 'rows': 0}
+    # Each worker backs off on its own egress IP independently
+    controller = AimdController()
+    try:
+        while not deadline_passed(deadline):
+            park_ids = claim_leases(session, file_id, worker_id, batch_size, lease_seconds, expired_only)
+            if not park_ids:
+                break
+            for park_id in park_ids:
+                if deadline_passed(deadline):
+                    release_lease(session, file_id, park_id, worker_id, "Deadline reached before scraping")
+                    continue
+                print(f"[{worker_id}] Scraping park {park_id}...")
+                try:
+                    records = get_availability_data(park_id, controller=controller, deadline=deadline)
+                except Exception as e:
+                    print(f"  - ERROR fetching data for court {park_id}: {str(e)}")
+                    release_lease(session, file_id, park_id, worker_id, str(e))
+                    report['parks_failed'] += 1
+                    continue
+                if records is None:
+                    release_lease(session, file_id, park_id, worker_id, "No usable page was fetched")
+                    report['parks_failed'] += 1
+                    continue
+                if complete_lease(session, file_id, park_id, worker_id, records):
+                    report['parks_done'] += 1
+                    report['rows'] += len(records)
+                else:
+                    report['parks_lost'] += 1
+    finally:
+        if should_close:
+            session.close()
+
+    report['requests'] = controller.stats()
+    print(f"Worker {worker_id} finished: {report}")
+    return report
+
+def get_lease_counts(session, file_id: int) -> dict[str, int]:
+    """Count a run's leases by status."""
+    rows = session.query(ScrapeLease.status, func.count(ScrapeLease.id)).filter(
+        ScrapeLease.file_id == file_id
+    ).group_by(ScrapeLease.status).all()
+    return {status: count for status, count in rows}
+
+def finalize_run(file_id: int, session, timeout_seconds: Optional[float] = None) -> dict:
+    """Wait for every lease to finish, then merge staging into the DWH.
+
+    While waiting, the coordinator takes over expired leases itself so parks
+    held by a crashed worker still get scraped; pending parks are left to the
+    workers. The timeout also bounds the coordinator's own scraping.
+    """
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds is not None else None
+    while True:
+        counts = get_lease_counts(session, file_id)
+        session.commit()
+        if not counts.get('pending') and not counts.get('leased'):
+            break
+        if deadline_passed(deadline):
+            update_file_status(file_id, 'failed', session)
+            raise TimeoutError(f"Distributed run {file_id} still has unfinished leases: {counts}")
+        if not run_worker(file_id, session=session, expired_only=True, deadline=deadline)['parks_done']:
+            wait = remaining_seconds(deadline)
+            time.sleep(FINALIZE_POLL_SECONDS if wait is None else max(0, min(FINALIZE_POLL_SECONDS, wait)))
+
+    if not counts.get('done'):
+        update_file_status(file_id, 'failed', session)
+        raise RuntimeError(f"No park was scraped in distributed run {file_id}")
+
+    try:
+        merge_availability_to_dwh(session, file_id)
+    except Exception:
+        update_file_status(file_id, 'failed', session)
+        raise
+    finally:
+        drop_availability_staging(file_id, session)
+    update_file_status(file_id, 'processed', session)
+
+    rows = session.query(func.coalesce(func.sum(ScrapeLease.rows), 0)).filter(
+        ScrapeLease.file_id == file_id
+    ).scalar()
+    summary = {
+        'file_id': file_id,
+        'parks_done': counts.get('done', 0),
+        'parks_failed': counts.get('failed', 0),
+        'rows': int(rows),
+    }
+    print(f"Distributed run finalized: {summary}")
+    return summary
+
+def run_local(workers: int, courts_df: Optional[pd.DataFrame] = None) -> dict:
+    """Run a distributed scrape with worker processes on this machine."""
+    session = SessionLocal()
+    try:
+        file_id = start_run(session, courts_df)
+        # Spawned workers build their own engine instead of sharing the parent's pool
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=run_worker, args=(file_id,)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return finalize_run(file_id, session)
+    finally:
+        session.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrape availability with distributed workers.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('start', help='Register a run and enqueue every park')
+
+    worker_parser = subparsers.add_parser('worker', help='Claim and scrape parks for a run')
+    worker_parser.add_argument('--run-id', type=int, required=True)
+    worker_parser.add_argument('--batch-size', type=int, default=CLAIM_BATCH_SIZE)
+    worker_parser.add_argument('--lease-seconds', type=int, default=DEFAULT_LEASE_SECONDS)
+
+    finalize_parser = subparsers.add_parser('finalize', help='Wait for a run to finish and merge it')
+    finalize_parser.add_argument('--run-id', type=int, required=True)
+    finalize_parser.add_argument('--timeout', type=float)
+
+    local_parser = subparsers.add_parser('run', help='Start, scrape with local worker processes and finalize')
+    local_parser.add_argument('--workers', type=int, default=4)
+
+    args = parser.parse_args()
+    if args.command == 'start':
+        session = SessionLocal()
+        try:
+            start_run(session)
+        finally:
+            session.close()
+    elif args.command == 'worker':
+        run_worker(args.run_id, batch_size=args.batch_size, lease_seconds=args.lease_seconds)
+    elif args.command == 'finalize':
+        session = SessionLocal()
+        try:
+            finalize_run(args.run_id, session, timeout_seconds=args.timeout)
+        finally:
+            session.close()
+    else:
+        run_local(args.workers)
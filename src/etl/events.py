@@ -0,0 +1,51 @@
+"""
+ETL events pushed to the web app through Postgres LISTEN/NOTIFY.
+
+Events are JSON notifications on the ETL_EVENTS_CHANNEL channel, which
+`/api/etl-events` relays to browsers as server-sent events:
+
+    {"type": "published", "version": 42, "changes": 17}
+    {"type": "progress", "run": 7, "stage": "staging", "rows": 1500}
+
+A `published` event is sent in the transaction that publishes the data
+version, so Postgres delivers it exactly when that transaction commits and
+never for one that rolls back. Progress events are sent immediately on their
+own connection and are best effort: a failure to send one never fails the run.
+"""
+import json
+from sqlalchemy import text
+from src.database.config import get_engine
+
+ETL_EVENTS_CHANNEL = 'etl_events'
+
+# Postgres rejects notification payloads from 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+NOTIFY_SQL = "SELECT pg_notify(:channel, :payload)"
+
+def _payload(event_type: str, details: dict) -> str:
+    payload = json.dumps({'type': event_type, **details}, default=str, separators=(',', ':'))
+    if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"{event_type} event payload is too large to notify")
+    return payload
+
+def notify_event(connection, event_type: str, **details) -> None:
+    """Queue an event in the connection's transaction; it is sent on commit."""
+    connection.execute(
+        text(NOTIFY_SQL), {'channel': ETL_EVENTS_CHANNEL, 'payload': _payload(event_type, details)}
+    )
+
+def publish_progress(run, stage: str, **details) -> None:
+    """Send a progress event for an ETL run right away.
+
+    Args:
+        run: Identifies the run, e.g. its registry file_id
+        stage: What the run is doing, e.g. scraping, staging, merging
+        details: Anything else to pass on, e.g. row counts
+    """
+    try:
+        with get_engine('writer').connect() as connection:
+            notify_event(connection, 'progress', run=run, stage=stage, **details)
+            connection.commit()
+    except Exception as e:
+        print(f"  - Could not send {stage} progress event: {e}")
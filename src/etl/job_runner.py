@@ -0,0 +1,292 @@
+"""
+Single-flight runner for ETL jobs.
+
+Only one ETL job runs at a time across every process sharing the database.
+The runner holds a session-level Postgres advisory lock for the whole run,
+so the lock is released automatically if the process dies. Requests that
+arrive while a job of the same type is in flight attach to it instead of
+starting another scrape; requests for another type wait for the lock, up
+to LOCK_WAIT_TIMEOUT_SECONDS, and then run. Every job can be polled by ID
+from `raw_files.etl_jobs`.
+"""
+import argparse
+import json
+import sys
+import time
+import traceback
+from typing import Optional
+from sqlalchemy import text
+from src.database.config import SessionLocal, engine
+from src.database.models import EtlJob, get_et_time
+from src.request_throttle import remaining_seconds
+
+# Application-wide advisory lock key shared by all ETL entry points
+ETL_LOCK_KEY = 73461250
+
+# How long an attaching request waits for the lock holder to record its job
+ATTACH_RETRIES = 10
+ATTACH_RETRY_SECONDS = 0.5
+
+POLL_INTERVAL_SECONDS = 2
+
+# How often a request waiting behind a job of another type retries the lock
+LOCK_RETRY_SECONDS = 2
+
+# Refreshes stop scraping in time to load before /api/etl-refresh gives up at
+# 10 minutes. The deadline starts when the request is submitted, so time spent
+# waiting for the lock comes out of it.
+REFRESH_DEADLINE_SECONDS = 8 * 60
+
+# Give up waiting for another job after this long, leaving a refresh at least
+# 3 minutes of its deadline
+LOCK_WAIT_TIMEOUT_SECONDS = 5 * 60
+
+def _run_scrape() -> dict:
+    """Scrape availability and write the raw CSV."""
+    from src.court_availability_finder import main as scrape
+    return {'file_path': scrape()}
+
+def _run_availability() -> dict:
+    """Load the latest raw file into the DWH."""
+    from src.etl.availability_loader import run_availability_etl
+    run_availability_etl()
+    return {}
+
+def _run_catchup() -> dict:
+    """Load every raw file the loader has not processed yet."""
+    from src.etl.availability_loader import run_catchup_etl
+    return run_catchup_etl()
+
+def _refresh_deadline_seconds(deadline: Optional[float]) -> float:
+    """Scraping time left before a time.monotonic() deadline, the full deadline without one."""
+    remaining = remaining_seconds(deadline)
+    return REFRESH_DEADLINE_SECONDS if remaining is None else max(remaining, 0)
+
+def _run_refresh(deadline: Optional[float] = None) -> dict:
+    """Scrape availability and publish it into the DWH through a table swap."""
+    from src.etl.pipeline import run_pipeline
+    return run_pipeline(deadline_seconds=_refresh_deadline_seconds(deadline), swap=True)
+
+def _run_adaptive_refresh(deadline: Optional[float] = None) -> dict:
+    """Scrape only the parks the scheduler picks and publish them into the DWH."""
+    from src.etl.pipeline import run_pipeline
+    return run_pipeline(adaptive=True, deadline_seconds=_refresh_deadline_seconds(deadline), swap=True)
+
+def _run_courts() -> dict:
+    """Reload the tennis courts reference data."""
+    from src.etl.csv_loader import run_courts_etl
+    run_courts_etl()
+    return {}
+
+JOB_TYPES = {
+    'scrape': _run_scrape,
+    'availability': _run_availability,
+    'catchup': _run_catchup,
+    'refresh': _run_refresh,
+    'adaptive_refresh': _run_adaptive_refresh,
+    'courts': _run_courts,
+}
+
+# Job types that take the request's deadline
+DEADLINE_JOB_TYPES = ('refresh', 'adaptive_refresh')
+
+def try_acquire_etl_lock(connection) -> bool:
+    """Try to take the ETL advisory lock on a dedicated connection."""
+    acquired = connection.execute(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": ETL_LOCK_KEY}
+    ).scalar()
+    # The lock is session-level; don't sit idle in a transaction while holding it
+    connection.commit()
+    return bool(acquired)
+
+def release_etl_lock(connection) -> None:
+    """Release the ETL advisory lock held by this connection."""
+    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ETL_LOCK_KEY})
+    connection.commit()
+
+def get_active_job(session, job_type: Optional[str] = None) -> Optional[EtlJob]:
+    """Get the job that is currently running, if any, optionally of one type."""
+    query = session.query(EtlJob).filter(EtlJob.status == 'running')
+    if job_type is not None:
+        query = query.filter(EtlJob.job_type == job_type)
+    return query.order_by(EtlJob.id.desc()).first()
+
+def reap_orphaned_jobs(session) -> int:
+    """Mark jobs left 'running' by a dead runner as failed.
+
+    Only call this while holding the ETL lock: a running job without a lock
+    holder means its runner exited before recording the outcome.
+    """
+    orphaned = session.query(EtlJob).filter(EtlJob.status == 'running').all()
+    for job in orphaned:
+        job.status = 'failed'
+        job.error = 'Runner exited before the job finished'
+        job.finished_at = get_et_time()
+    session.commit()
+    return len(orphaned)
+
+def attach_to_active_job(session, job_type: str) -> Optional[int]:
+    """Attach to the in-flight job of the same type and return its ID.
+
+    Returns None when no job of that type shows up, e.g. because the lock
+    holder runs another type or has just finished.
+    """
+    for _ in range(ATTACH_RETRIES):
+        job = get_active_job(session, job_type)
+        if job:
+            job.attached_requests += 1
+            session.commit()
+            return job.id
+        # The lock holder may not have recorded its job yet
+        time.sleep(ATTACH_RETRY_SECONDS)
+    return None
+
+def execute_job(job_type: str, session, deadline: Optional[float] = None) -> EtlJob:
+    """Record and run a job. The caller must hold the ETL lock.
+
+    Refreshes stop scraping at `deadline`, a time.monotonic() value, and
+    otherwise get REFRESH_DEADLINE_SECONDS from now.
+    """
+    reap_orphaned_jobs(session)
+
+    job = EtlJob(job_type=job_type, status='running', started_at=get_et_time())
+    session.add(job)
+    session.commit()
+
+    try:
+        run = JOB_TYPES[job_type]
+        details = run(deadline) if job_type in DEADLINE_JOB_TYPES else run()
+        job.status = 'succeeded'
+        job.details = json.dumps(details, default=str)
+    except Exception as e:
+        traceback.print_exc()
+        session.rollback()
+        job.status = 'failed'
+        job.error = str(e)
+    finally:
+        job.finished_at = get_et_time()
+        session.commit()
+
+    return job
+
+def submit_job(job_type: str) -> tuple[int, bool]:
+    """Run a job, or attach to the one of the same type already in flight.
+
+    While a job of another type holds the lock, waits for it to finish and
+    then runs, with whatever is left of the refresh deadline.
+
+    Args:
+        job_type: One of the keys of JOB_TYPES
+
+    Returns:
+        Tuple of (job_id, started). started is False when the request was
+        attached to a job another process is already running.
+
+    Raises:
+        TimeoutError: If the lock is still held by another job type after
+            LOCK_WAIT_TIMEOUT_SECONDS
+    """
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Invalid job type. Must be one of: {', '.join(JOB_TYPES)}")
+
+    submitted = time.monotonic()
+    session = SessionLocal()
+    connection = engine.connect()
+    try:
+        while not try_acquire_etl_lock(connection):
+            job_id = attach_to_active_job(session, job_type)
+            if job_id is not None:
+                return job_id, False
+            # Another type of job holds the lock, or the holder finished
+            # since we tried it: try again rather than attaching
+            session.rollback()
+            if time.monotonic() - submitted >= LOCK_WAIT_TIMEOUT_SECONDS:
+                raise TimeoutError(
+                    f"Another ETL job still held the lock after {LOCK_WAIT_TIMEOUT_SECONDS} seconds"
+                )
+            time.sleep(LOCK_RETRY_SECONDS)
+
+        try:
+            job = execute_job(job_type, session, submitted + REFRESH_DEADLINE_SECONDS)
+            return job.id, True
+        finally:
+            release_etl_lock(connection)
+    finally:
+        connection.close()
+        session.close()
+
+def get_job_status(job_id: int, session=None) -> Optional[dict]:
+    """Get the status of a job as a JSON-serializable dict."""
+    if session is None:
+        session = SessionLocal()
+        should_close = True
+    else:
+        should_close = False
+
+    try:
+        job = session.get(EtlJob, job_id)
+        if job is None:
+            return None
+        return {
+            'job_id': job.id,
+            'job_type': job.job_type,
+            'status': job.status,
+            'attached_requests': job.attached_requests,
+            'details': json.loads(job.details) if job.details else None,
+            'error': job.error,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        }
+    finally:
+        if should_close:
+            session.close()
+
+def wait_for_job(job_id: int, timeout_seconds: Optional[float] = None) -> Optional[dict]:
+    """Poll a job until it is no longer running or the timeout expires."""
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+    while True:
+        status = get_job_status(job_id)
+        if status is None or status['status'] != 'running':
+            return status
+        if deadline and time.monotonic() >= deadline:
+            return status
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run ETL jobs one at a time.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit_parser = subparsers.add_parser('submit', help='Run a job or attach to the running one')
+    submit_parser.add_argument('job_type', choices=list(JOB_TYPES))
+    submit_parser.add_argument(
+        '--no-wait',
+        action='store_true',
+        help='Return immediately when attaching to a running job'
+    )
+
+    status_parser = subparsers.add_parser('status', help='Show the status of a job')
+    status_parser.add_argument('job_id', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'submit':
+        try:
+            job_id, started = submit_job(args.job_type)
+        except TimeoutError as e:
+            print(f"ETL job not started: {e}")
+            sys.exit(1)
+        if not started:
+            print(f"Attached to running ETL job {job_id}")
+            status = get_job_status(job_id) if args.no_wait else wait_for_job(job_id)
+        else:
+            status = get_job_status(job_id)
+    else:
+        status = get_job_status(args.job_id)
+
+    if status is None:
+        print("ETL job not found")
+        sys.exit(1)
+
+    print(f"ETL job status: {json.dumps(status)}")
+    sys.exit(1 if status['status'] == 'failed' else 0)
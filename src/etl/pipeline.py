@@ -0,0 +1,244 @@
+"""
+Single-process scrape-to-database pipeline.
+
+Scraped records are validated and bulk loaded into staging batch by batch as
+parks are scraped, then merged into the DWH, all over one connection. The
+raw CSV is still written as an archive side-output unless disabled, but it
+is never read back.
+"""
+import argparse
+import hashlib
+import os
+import time
+from datetime import datetime
+import pandas as pd
+from sqlalchemy.orm import Session
+from src.court_availability_finder import AVAILABILITY_COLUMNS, OUTPUT_DIR, scrape_parks_pipelined
+from src.database.config import engine
+from src.database.models import FileRegistry
+from src.etl.csv_loader import (
+    bulk_load_availability, create_availability_staging,
+    drop_availability_staging, merge_availability_to_dwh, update_file_status
+)
+from src.etl.events import publish_progress
+from src.etl.publish import publish_availability
+from src.etl.scrape_scheduler import (
+    DEFAULT_REQUEST_BUDGET, mark_stale, rank_parks, record_scrape, select_parks
+)
+from src.request_throttle import AimdController
+from src.sources import DEFAULT_SOURCE, SOURCES, get_source
+
+DEFAULT_BATCH_SIZE = 500
+
+class ArchiveWriter:
+    """Write batches to the raw CSV archive while hashing the exact bytes."""
+
+    def __init__(self, file_path: str | None):
+        self.file_path = file_path
+        self.sha256 = hashlib.sha256()
+        self.rows = 0
+        self._file = None
+        if file_path:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self._file = open(file_path, 'w', newline='')
+
+    def write(self, df: pd.DataFrame) -> None:
+        chunk = df[AVAILABILITY_COLUMNS].to_csv(index=False, header=self.rows == 0)
+        self.sha256.update(chunk.encode())
+        if self._file:
+            self._file.write(chunk)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Remove a partially written archive."""
+        self.close()
+        if self.file_path and os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+def run_pipeline(archive_csv: bool = True, batch_size: int = DEFAULT_BATCH_SIZE,
+                 courts_df: pd.DataFrame | None = None, output_dir: str = OUTPUT_DIR,
+                 adaptive: bool = False, request_budget: int = DEFAULT_REQUEST_BUDGET,
+                 deadline_seconds: float | None = None, source: str = DEFAULT_SOURCE,
+                 swap: bool = False, export: bool = True) -> dict:
+    """Scrape availability and load it straight into the DWH.
+
+    Args:
+        archive_csv: Whether to also write the raw CSV archive file
+        batch_size: Number of records to validate and stage per batch
+        courts_df: Parks to scrape, defaults to the source's park list
+        output_dir: Directory for the CSV archive
+        adaptive: Only scrape the parks the scrape scheduler picks for this run
+        request_budget: Outbound request budget for an adaptive run
+        deadline_seconds: Scrape parks in priority order, stop after this long
+            and load whatever was collected; parks that did not finish are
+            marked stale
+        source: Reservation system adapter to scrape
+        swap: Publish through a shadow table swapped in atomically instead
+            of merging into the live table in place
+        export: Export the static snapshot once the run is published
+
+    Returns:
+        Summary of the run with the registry file_id, row counts, the
+        request concurrency the scrape settled on and the exported snapshot
+        version
+    """
+    if courts_df is None:
+        courts_df = get_source(source).load_parks()
+
+    started = time.monotonic()
+    filename = f"court_availability_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    file_path = os.path.join(output_dir, filename) if archive_csv else None
+    archive = ArchiveWriter(file_path)
+    controller = AimdController()
+
+    connection = engine.connect()
+    session = Session(bind=connection)
+    file_id = None
+    try:
+        # Register the run up front so staged rows can reference it; the hash
+        # is filled in once every batch has been written.
+        file_record = FileRegistry(
+            filename=filename,
+            filepath=file_path or f"pipeline:{filename}",
+            file_hash=archive.sha256.hexdigest(),
+            status='pending'
+        )
+        session.add(file_record)
+        session.commit()
+        file_id = file_record.id
+
+        create_availability_staging(file_id, session)
+
+        if adaptive or deadline_seconds:
+            park_ids = courts_df['court_id'].astype(str).tolist()
+            if adaptive:
+                park_ids = select_parks(park_ids, session, request_budget)
+            else:
+                # Parks start in this order, so the ones that matter most finish before the deadline
+                park_ids = rank_parks(park_ids, session)
+            courts_df = courts_df.set_index(courts_df['court_id'].astype(str)).loc[park_ids].reset_index(drop=True)
+
+        print(f"Found {len(courts_df)} parks to scrape")
+        publish_progress(file_id, 'scraping', parks=len(courts_df))
+        scraped = scrape_parks_pipelined(
+            courts_df, controller=controller, source=source, deadline_seconds=deadline_seconds
+        )
+
+        batch = []
+        staged = 0
+        stale_parks = []
+        for park_id, records in scraped:
+            if records is None:
+                # Keep the park's previous data rather than failing the run
+                mark_stale(park_id, session)
+                stale_parks.append(park_id)
+                continue
+            # Every successfully scraped park feeds the scheduler's change rates
+            record_scrape(park_id, records, session)
+            batch.extend(records)
+            if len(batch) >= batch_size:
+                staged += _flush_batch(batch, file_id, session, archive)
+                publish_progress(file_id, 'staging', rows=staged)
+                batch = []
+        if batch:
+            staged += _flush_batch(batch, file_id, session, archive)
+            publish_progress(file_id, 'staging', rows=staged)
+
+        print(f"Total available slots collected: {staged}")
+        if not staged:
+            print("No availability data collected!")
+            raise RuntimeError("No availability data collected")
+
+        session.commit()
+        publish_progress(file_id, 'publishing' if swap else 'merging', rows=staged)
+        if swap:
+            published = publish_availability(session, file_id, export=export)
+        else:
+            published = merge_availability_to_dwh(session, file_id, export=export)
+
+        archive.close()
+        file_record.file_hash = archive.sha256.hexdigest()
+        session.commit()
+        update_file_status(file_id, 'processed', session)
+        if file_path:
+            print(f"Data saved to: {file_path}")
+    except Exception as e:
+        session.rollback()
+        archive.discard()
+        if file_id is not None:
+            update_file_status(file_id, 'failed', session)
+            publish_progress(file_id, 'failed', error=str(e)[:500])
+        raise
+    finally:
+        if file_id is not None:
+            drop_availability_staging(file_id, session)
+        session.close()
+        connection.close()
+
+    publish_progress(file_id, 'completed', rows=staged, stale_parks=len(stale_parks))
+    return {
+        'file_id': file_id,
+        'file_path': file_path,
+        'parks': len(courts_df),
+        'stale_parks': stale_parks,
+        'rows': staged,
+        'requests': controller.stats(),
+        'snapshot_version': published['snapshot_version'],
+        'elapsed_seconds': round(time.monotonic() - started, 2),
+    }
+
+def _flush_batch(batch: list[dict], file_id: int, session, archive: ArchiveWriter) -> int:
+    """Validate and stage one batch of scraped records."""
+    df = pd.DataFrame(batch, columns=AVAILABILITY_COLUMNS)
+    df['court_id'] = df['court_id'].astype(str)
+    archive.write(df)
+    return bulk_load_availability(df, file_id, session)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrape availability and load it into the DWH.')
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help='Skip writing the raw CSV archive file'
+    )
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Only scrape the parks most likely to have changed, within the request budget'
+    )
+    parser.add_argument('--request-budget', type=int, default=DEFAULT_REQUEST_BUDGET)
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Stop scraping after this many seconds and load what was collected'
+    )
+    parser.add_argument('--source', choices=sorted(SOURCES), default=DEFAULT_SOURCE)
+    parser.add_argument(
+        '--swap',
+        action='store_true',
+        help='Build the new availability in a shadow table and swap it in atomically'
+    )
+    parser.add_argument(
+        '--no-export',
+        action='store_true',
+        help='Skip writing the static availability snapshot'
+    )
+
+    args = parser.parse_args()
+    summary = run_pipeline(
+        archive_csv=not args.no_archive,
+        batch_size=args.batch_size,
+        adaptive=args.adaptive,
+        request_budget=args.request_budget,
+        deadline_seconds=args.deadline,
+        source=args.source,
+        swap=args.swap,
+        export=not args.no_export
+    )
+    print(f"Pipeline completed: {summary}")
@@ -0,0 +1,194 @@
+"""
+Shadow-table publication of current availability.
+
+Instead of merging staged rows into `dwh.court_availability_slots` in place,
+the next state is built in `dwh.court_availability_slots_next`: the current
+unexpired slots with the staged files upserted on top, fully indexed. One
+short transaction then renames it into place and keeps the replaced table as
+`dwh.court_availability_slots_prev`, and refreshes the read model and data
+version in the same transaction, so readers never see a half-merged state
+or slots that disagree with the read model. `rollback_availability` swaps
+the previous table back just as quickly.
+"""
+import argparse
+import time
+from typing import Callable, Optional
+from sqlalchemy import text
+from src.database.config import engine
+from src.database.views import COURT_AVAILABILITY_VIEW
+from src.etl.csv_loader import (
+    AVAILABILITY_WRITE_LOCK_KEY, MERGE_KEYS_SQL, UPSERT_SLOTS_SQL, staged_rows_filter
+)
+from src.etl.read_model import export_published, refresh_all_park_days, refresh_park_days
+
+SLOTS_TABLE = 'dwh.court_availability_slots'
+NEXT_SUFFIX = '_next'
+PREV_SUFFIX = '_prev'
+SWAP_SUFFIX = '_swap'
+
+# Indexes are named per schema, so each copy of the table carries its
+# suffix on them too. Templates take the table name and the suffix.
+SLOTS_INDEXES = {
+    'court_availability_slots_pkey': "ALTER TABLE {table} ADD CONSTRAINT court_availability_slots_pkey{suffix} PRIMARY KEY (id)",
+    'uq_court_availability_slots': "ALTER TABLE {table} ADD CONSTRAINT uq_court_availability_slots{suffix} UNIQUE (court_key, date, slot_time)",
+    'ix_court_availability_slots_date': "CREATE INDEX ix_court_availability_slots_date{suffix} ON {table} (date)",
+}
+
+# Foreign keys are named per table, so every copy uses the live names
+SLOTS_FOREIGN_KEYS = [
+    "ALTER TABLE {table} ADD CONSTRAINT court_availability_slots_court_key_fkey FOREIGN KEY (court_key) REFERENCES dwh.courts (id)",
+    "ALTER TABLE {table} ADD CONSTRAINT court_availability_slots_status_id_fkey FOREIGN KEY (status_id) REFERENCES dwh.slot_statuses (id)",
+]
+
+# Don't queue readers behind the swap while it waits for a long-running query
+SWAP_LOCK_TIMEOUT = '2s'
+SWAP_ATTEMPTS = 5
+
+def _table_exists(connection, table: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:table)"), {'table': table}).scalar() is not None
+
+def build_next_availability(connection, file_ids=None) -> int:
+    """Build the next availability state in the shadow table.
+
+    Commits the shadow table without touching the live one. Returns the
+    number of slots in it.
+    """
+    table = SLOTS_TABLE + NEXT_SUFFIX
+    where, params = staged_rows_filter(file_ids)
+    with connection.begin():
+        connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        connection.execute(text(
+            f"CREATE TABLE {table} (LIKE {SLOTS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        # Expired slots are left behind instead of being deleted later
+        connection.execute(text(
+            f"INSERT INTO {table} SELECT * FROM {SLOTS_TABLE} WHERE date >= current_date"
+        ))
+        for ddl in SLOTS_INDEXES.values():
+            connection.execute(text(ddl.format(table=table, suffix=NEXT_SUFFIX)))
+        for statement in MERGE_KEYS_SQL:
+            connection.execute(text(statement.format(where=where)), params)
+        connection.execute(text(UPSERT_SLOTS_SQL.format(where=where, target=table)), params)
+        for ddl in SLOTS_FOREIGN_KEYS:
+            connection.execute(text(ddl.format(table=table)))
+        connection.execute(text(f"ANALYZE {table}"))
+        return connection.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+def _rename_slots_table(connection, from_suffix: str, to_suffix: str) -> None:
+    """Rename a copy of the slots table together with its indexes."""
+    connection.execute(text(
+        f"ALTER TABLE {SLOTS_TABLE}{from_suffix} RENAME TO court_availability_slots{to_suffix}"
+    ))
+    for index in SLOTS_INDEXES:
+        connection.execute(text(f"ALTER INDEX dwh.{index}{from_suffix} RENAME TO {index}{to_suffix}"))
+
+def _swap(connection, renames: list[tuple[str, str]], drop_prev: bool,
+          then: Optional[Callable] = None) -> Optional[dict]:
+    """Apply renames in one short transaction and rebind the view.
+
+    Retries when the renames can't get their lock in SWAP_LOCK_TIMEOUT.
+    `then` runs on the connection in the same transaction after the renames,
+    and its result is returned.
+    """
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            with connection.begin():
+                connection.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+                # Already held by a publish on this connection; keeps rollbacks out of a running publish
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': AVAILABILITY_WRITE_LOCK_KEY})
+                sequence = connection.execute(
+                    text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': SLOTS_TABLE}
+                ).scalar()
+                if drop_prev:
+                    connection.execute(text(f"DROP TABLE IF EXISTS {SLOTS_TABLE}{PREV_SUFFIX}"))
+                for from_suffix, to_suffix in renames:
+                    _rename_slots_table(connection, from_suffix, to_suffix)
+                # Copies share the sequence; it must belong to the live table,
+                # or dropping the previous one would drop it too
+                connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {SLOTS_TABLE}.id"))
+                connection.execute(text(COURT_AVAILABILITY_VIEW))
+                return then(connection) if then else None
+        except Exception as e:
+            if 'lock timeout' not in str(e) or attempt == SWAP_ATTEMPTS:
+                raise
+            print(f"  - Swap could not get its lock (attempt {attempt}), retrying...")
+            time.sleep(attempt)
+
+def publish_availability(session, file_ids=None, export: bool = True) -> dict:
+    """Publish staged files by building a shadow table and swapping it in.
+
+    Holds the availability write lock from the build through the swap, so
+    in-place merges wait rather than being lost.
+
+    Args:
+        session: Session the files were staged on
+        file_ids: Only publish these files' staging partitions; all staged rows by default
+        export: Whether to export the static snapshot after the swap
+
+    Returns:
+        Slot count of the published table, build and swap timings, and the
+        new data version and exported snapshot version
+    """
+    # The build reads staging from its own connection
+    session.commit()
+    with session.get_bind().engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': AVAILABILITY_WRITE_LOCK_KEY})
+        connection.commit()
+        try:
+            started = time.monotonic()
+            slots = build_next_availability(connection, file_ids)
+            built = time.monotonic()
+            # The read model and data version commit with the renames
+            published = _swap(
+                connection, [('', PREV_SUFFIX), (NEXT_SUFFIX, '')], drop_prev=True,
+                then=lambda swapping: refresh_park_days(swapping, file_ids)
+            )
+            swapped = time.monotonic()
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': AVAILABILITY_WRITE_LOCK_KEY})
+            connection.commit()
+        snapshot_version = export_published(connection, export)
+
+    report = {
+        'slots': slots,
+        'build_seconds': round(built - started, 2),
+        'swap_seconds': round(swapped - built, 3),
+        'version': published['version'],
+        'snapshot_version': snapshot_version,
+    }
+    print(f"Published {slots} slots (built in {report['build_seconds']}s, swapped in {report['swap_seconds']}s)")
+    return report
+
+def rollback_availability(connection=None) -> None:
+    """Swap the previously published availability back in.
+
+    The rolled-back table becomes the previous one, so a second rollback
+    undoes the first.
+    """
+    should_close = connection is None
+    connection = connection or engine.connect()
+    try:
+        has_prev = _table_exists(connection, SLOTS_TABLE + PREV_SUFFIX)
+        connection.rollback()
+        if not has_prev:
+            raise RuntimeError("No previously published availability to roll back to")
+        # Any park-day may differ between the two tables, so the whole read
+        # model and a new data version commit with the renames
+        _swap(
+            connection, [('', SWAP_SUFFIX), (PREV_SUFFIX, ''), (SWAP_SUFFIX, PREV_SUFFIX)], drop_prev=False,
+            then=refresh_all_park_days
+        )
+        export_published(connection)
+        print("Rolled back to the previously published availability")
+    finally:
+        if should_close:
+            connection.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage published availability tables.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rollback', help='Swap the previously published availability back in')
+
+    args = parser.parse_args()
+    if args.command == 'rollback':
+        rollback_availability()
@@ -0,0 +1,230 @@
+"""
+Per-park, per-day read model of current availability.
+
+`dwh.park_day_availability` holds each park-day's bookable slots as one
+JSONB list, already in court and time order and tagged with the time-of-day
+bucket the frontend filters on, so serving a park-day is a primary key
+fetch. Merges refresh only the park-days their staged files touched, and a
+row is only rewritten when its slots actually changed.
+
+Every refresh is a new data version (`dwh.data_versions`), and the slots it
+added, removed or changed are recorded per version in
+`dwh.availability_changes`, so clients can sync just the changes since the
+version they have. Changes are kept for CHANGE_RETENTION_VERSIONS versions;
+clients further behind get a full snapshot instead. Each committed version
+is announced as a `published` event (see src.etl.events), and writers then
+export it as the static snapshot with `export_published`.
+
+`python -m src.etl.read_model rebuild` recomputes every park-day, e.g. after
+writing slots through the `dwh.court_availability` view.
+"""
+import argparse
+from typing import Optional
+from sqlalchemy import text
+from src.database.config import engine
+from src.database.views import RESERVATION_URL_PREFIX
+from src.etl.csv_loader import AVAILABILITY_WRITE_LOCK_KEY, staged_rows_filter
+from src.etl.events import notify_event
+from src.etl.snapshot_export import export_snapshot, get_export_dir
+
+READ_MODEL_TABLE = 'dwh.park_day_availability'
+
+# Slot time (minutes after midnight) bounds of the afternoon; earlier is
+# morning, later is evening, matching the frontend's time preferences
+AFTERNOON_STARTS = 12 * 60
+EVENING_STARTS = 17 * 60
+
+# A week of hourly runs
+CHANGE_RETENTION_VERSIONS = 168
+
+# Park-days whose staged rows a merge just wrote
+STAGED_PARK_DAYS_SQL = """
+    SELECT DISTINCT s.park_id, s.date FROM staging.court_availability s {where}
+"""
+
+# Every park-day with current slots or a row in the read model
+ALL_PARK_DAYS_SQL = f"""
+    SELECT tc.park_id, s.date
+    FROM dwh.court_availability_slots s
+    JOIN dwh.courts c ON c.id = s.court_key
+    JOIN dwh.tennis_courts tc ON tc.id = c.park_key
+    WHERE s.date >= current_date
+    UNION
+    SELECT park_id, date FROM {READ_MODEL_TABLE}
+"""
+
+# Park-days left with no bookable slots keep an empty list, so the row
+# still replaces what was there. Every part of the statement sees the table
+# as it was before the upsert, so rewritten park-days are diffed slot by
+# slot against their old lists and the differences recorded under :version.
+REFRESH_PARK_DAYS_SQL = f"""
+    WITH park_days AS ({{park_days}}),
+    fresh AS (
+        SELECT pd.park_id, pd.date, day.slots, day.slot_count
+        FROM park_days pd
+        CROSS JOIN LATERAL (
+            SELECT
+                COALESCE(jsonb_agg(jsonb_build_object(
+                    'court_id', c.court_id,
+                    'time', dwh.format_slot_time(s.slot_time),
+                    'bucket', CASE
+                        WHEN s.slot_time < {AFTERNOON_STARTS} THEN 'morning'
+                        WHEN s.slot_time < {EVENING_STARTS} THEN 'afternoon'
+                        ELSE 'evening'
+                    END,
+                    'status', st.status,
+                    'reservation_link', COALESCE('{RESERVATION_URL_PREFIX}' || s.reservation_id, s.reservation_link)
+                ) ORDER BY c.court_id, s.slot_time), '[]'::jsonb) AS slots,
+                count(s.id) AS slot_count
+            FROM dwh.tennis_courts tc
+            JOIN dwh.courts c ON c.park_key = tc.id
+            JOIN dwh.court_availability_slots s ON s.court_key = c.id
+            JOIN dwh.slot_statuses st ON st.id = s.status_id
+            WHERE tc.park_id = pd.park_id
+              AND s.date = pd.date
+              AND s.is_available
+              AND (s.reservation_id IS NOT NULL OR s.reservation_link IS NOT NULL)
+        ) day
+        WHERE pd.date >= current_date
+    ),
+    previous AS (
+        SELECT p.park_id, p.date, p.slots
+        FROM {READ_MODEL_TABLE} p
+        JOIN fresh f ON f.park_id = p.park_id AND f.date = p.date
+    ),
+    rewritten AS (
+        INSERT INTO {READ_MODEL_TABLE} (park_id, date, slots, slot_count, content_hash, updated_at)
+        SELECT park_id, date, slots, slot_count, md5(slots::text), now() FROM fresh
+        ON CONFLICT (park_id, date) DO UPDATE SET
+            slots = EXCLUDED.slots,
+            slot_count = EXCLUDED.slot_count,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = EXCLUDED.updated_at
+        WHERE {READ_MODEL_TABLE}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING park_id, date, slots
+    ),
+    old_slots AS (
+        SELECT p.park_id, p.date, slot
+        FROM previous p
+        JOIN rewritten r ON r.park_id = p.park_id AND r.date = p.date
+        CROSS JOIN jsonb_array_elements(p.slots) slot
+    ),
+    new_slots AS (
+        SELECT r.park_id, r.date, slot FROM rewritten r CROSS JOIN jsonb_array_elements(r.slots) slot
+    )
+    INSERT INTO dwh.availability_changes (version, park_id, date, court_id, time, change, slot)
+    SELECT
+        :version,
+        COALESCE(n.park_id, o.park_id),
+        COALESCE(n.date, o.date),
+        COALESCE(n.slot, o.slot) ->> 'court_id',
+        COALESCE(n.slot, o.slot) ->> 'time',
+        CASE WHEN o.slot IS NULL THEN 'added' WHEN n.slot IS NULL THEN 'removed' ELSE 'changed' END,
+        n.slot
+    FROM new_slots n
+    FULL JOIN old_slots o
+        ON o.park_id = n.park_id AND o.date = n.date
+        AND o.slot ->> 'court_id' = n.slot ->> 'court_id' AND o.slot ->> 'time' = n.slot ->> 'time'
+    WHERE o.slot IS DISTINCT FROM n.slot
+"""
+
+EXPIRE_PARK_DAYS_SQL = f"DELETE FROM {READ_MODEL_TABLE} WHERE date < current_date"
+
+NEW_DATA_VERSION_SQL = """
+    INSERT INTO dwh.data_versions (file_ids, published_at) VALUES (:file_ids, now()) RETURNING version
+"""
+
+COUNT_CHANGES_SQL = "UPDATE dwh.data_versions SET changes = :changes WHERE version = :version"
+
+# Their changes go with them (ON DELETE CASCADE)
+PRUNE_DATA_VERSIONS_SQL = "DELETE FROM dwh.data_versions WHERE version <= :version - :retention"
+
+def _refresh(connection, park_days_sql: str, params: dict, file_ids) -> dict:
+    """Refresh park-days as a new data version; returns the version and its change count."""
+    version = connection.execute(text(NEW_DATA_VERSION_SQL), {'file_ids': file_ids}).scalar()
+    connection.execute(text(EXPIRE_PARK_DAYS_SQL))
+    changes = connection.execute(
+        text(REFRESH_PARK_DAYS_SQL.format(park_days=park_days_sql)), {**params, 'version': version}
+    ).rowcount
+    connection.execute(text(COUNT_CHANGES_SQL), {'version': version, 'changes': changes})
+    # Delivered to listeners when the version commits
+    notify_event(connection, 'published', version=version, changes=changes)
+    connection.execute(
+        text(PRUNE_DATA_VERSIONS_SQL), {'version': version, 'retention': CHANGE_RETENTION_VERSIONS}
+    )
+    return {'version': version, 'changes': changes}
+
+def refresh_park_days(connection, file_ids=None) -> dict:
+    """Refresh the park-days touched by staged files from the current slots.
+
+    Runs in the caller's transaction, which must hold the availability write
+    lock, so a merge, its read model and its data version commit together
+    and in version order.
+
+    Args:
+        connection: Session or connection the slots were merged on
+        file_ids: Files whose staged rows were merged; all staged rows by default
+
+    Returns:
+        The new data version and the number of slots it changed
+    """
+    where, params = staged_rows_filter(file_ids)
+    return _refresh(connection, STAGED_PARK_DAYS_SQL.format(where=where), params, params.get('file_ids'))
+
+def export_published(connection, export: bool = True) -> Optional[str]:
+    """Export the static snapshot of the data version the caller just committed.
+
+    Every writer that publishes a version calls this after its commit. Best
+    effort: the version is already published, so a failed export only leaves
+    the previous snapshot up.
+
+    Args:
+        connection: Session or connection the version was committed on, so
+            the export can't read a replica that is behind
+        export: False to skip the export, e.g. for all but the last batch of a bulk load
+
+    Returns:
+        The exported snapshot version, or None when skipped or failed
+    """
+    if not export or get_export_dir() is None:
+        return None
+    try:
+        return export_snapshot(connection)['version']
+    except Exception as e:
+        print(f"Snapshot export failed: {e}")
+        return None
+    finally:
+        # Don't leave the read-only transaction open on the caller's connection
+        connection.rollback()
+
+def refresh_all_park_days(connection) -> dict:
+    """Recompute every current park-day from the current slots.
+
+    Runs in the caller's transaction, which must hold the availability write
+    lock, like `refresh_park_days`.
+    """
+    return _refresh(connection, ALL_PARK_DAYS_SQL, {}, None)
+
+def rebuild_park_days(connection=None, export: bool = True) -> dict:
+    """Recompute every current park-day as a new data version and export it."""
+    should_close = connection is None
+    connection = connection or engine.connect()
+    try:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': AVAILABILITY_WRITE_LOCK_KEY})
+        result = refresh_all_park_days(connection)
+        connection.commit()
+        result['snapshot_version'] = export_published(connection, export)
+        return result
+    finally:
+        if should_close:
+            connection.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Maintain the per-park, per-day availability read model.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help='Recompute every current park-day')
+
+    args = parser.parse_args()
+    if args.command == 'rebuild':
+        result = rebuild_park_days()
+        print(f"Data version {result['version']}: {result['changes']} slots changed")
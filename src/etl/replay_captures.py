@@ -0,0 +1,94 @@
+"""
+Offline re-parse of captured availability pages.
+
+Runs the current parser over a capture set on all cores without touching the
+network, so parser fixes can be checked and backfilled from pages that were
+already fetched. Each page is parsed relative to the time it was fetched.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from src.court_availability_finder import AVAILABILITY_COLUMNS, save_availability_data
+from src.page_capture import CaptureStore
+from src.sources import DEFAULT_SOURCE, get_source
+
+def replay_capture(capture_dir: str, entry: dict) -> list[dict]:
+    """Parse one captured page with its source's current parser."""
+    html = CaptureStore(capture_dir).load(entry['sha256'])
+    fetched_at = datetime.fromisoformat(entry['fetched_at'])
+    # Captures from before sources were recorded are all NYC Parks pages
+    source = get_source(entry.get('source', DEFAULT_SOURCE))
+    return source.scrape_page(html, entry['park_id'], fetched_at)
+
+def replay_captures(capture_dir: str, start_date=None, end_date=None,
+                    park_ids: Optional[set[str]] = None, workers: Optional[int] = None) -> tuple[list[dict], dict]:
+    """Re-parse every capture in a range.
+
+    Args:
+        capture_dir: Capture store directory
+        start_date: First fetch day to replay
+        end_date: Last fetch day to replay
+        park_ids: Only replay these parks
+        workers: Number of parser processes, defaults to the number of cores
+
+    Returns:
+        The parsed records and a summary with page counts and throughput
+    """
+    started = time.monotonic()
+    entries = list(CaptureStore(capture_dir).iter_captures(start_date, end_date, park_ids))
+
+    records = []
+    failed = 0
+    if entries:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            futures = [executor.submit(replay_capture, capture_dir, entry) for entry in entries]
+            for entry, future in zip(entries, futures):
+                try:
+                    records.extend(future.result())
+                except Exception as e:
+                    print(f"  - Skipping capture {entry['sha256'][:12]} of park {entry['park_id']}: {e}")
+                    failed += 1
+
+    elapsed = time.monotonic() - started
+    summary = {
+        'pages': len(entries),
+        'pages_failed': failed,
+        'records': len(records),
+        'elapsed_seconds': round(elapsed, 2),
+        'pages_per_second': round(len(entries) / elapsed, 2) if elapsed else 0.0,
+    }
+    print(
+        f"Replayed {summary['pages']} pages into {summary['records']} records "
+        f"in {summary['elapsed_seconds']}s ({summary['pages_per_second']} pages/s)"
+    )
+    return records, summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-parse captured availability pages offline.')
+    parser.add_argument('--capture-dir', default=os.getenv('CAPTURE_DIR'), help='Capture store directory (default: $CAPTURE_DIR)')
+    parser.add_argument('--start-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+    parser.add_argument('--end-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+    parser.add_argument('--park', action='append', dest='parks', help='Only replay this park (repeatable)')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: all cores)')
+    parser.add_argument('--output-dir', help='Write the replayed records as a raw availability file here')
+
+    args = parser.parse_args()
+    if not args.capture_dir:
+        parser.error('--capture-dir or CAPTURE_DIR is required')
+
+    records, _ = replay_captures(
+        args.capture_dir,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        park_ids=set(args.parks) if args.parks else None,
+        workers=args.workers
+    )
+    if args.output_dir and records:
+        file_path = save_availability_data(records, args.output_dir)
+        print(f"Data saved to: {file_path}")
+    elif records:
+        print(pd.DataFrame(records, columns=AVAILABILITY_COLUMNS).head(20).to_string(index=False))
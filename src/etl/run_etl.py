@@ -3,13 +3,14 @@ import sys
 import argparse
 from pathlib import Path
 from src.etl.csv_loader import run_courts_etl
-from src.etl.availability_loader import run_availability_etl
+from src.etl.availability_loader import run_availability_etl, run_catchup_etl
 
-def run_etl(etl_type: str):
+def run_etl(etl_type: str, catch_up: bool = False):
     """Run the ETL process.
     
     Args:
         etl_type: Type of ETL to run. Must be one of: courts, availability, both
+        catch_up: Load every unprocessed availability file instead of only the latest
     """
     if etl_type not in ['courts', 'availability', 'both']:
         raise ValueError("Invalid ETL type. Must be one of: courts, availability, both")
@@ -18,7 +19,10 @@ def run_etl(etl_type: str):
         run_courts_etl()
     
     if etl_type in ['availability', 'both']:
-        run_availability_etl()
+        if catch_up:
+            run_catchup_etl()
+        else:
+            run_availability_etl()
 
 if __name__ == '__main__':
     import argparse
@@ -30,6 +34,11 @@ if __name__ == '__main__':
         default='both',
         help='Type of ETL to run'
     )
+    parser.add_argument(
+        '--catch-up',
+        action='store_true',
+        help='Load every unprocessed availability file in timestamp order'
+    )
     
     args = parser.parse_args()
-    run_etl(args.type) 
\ No newline at end of file
+    run_etl(args.type, catch_up=args.catch_up) 
\ No newline at end of file
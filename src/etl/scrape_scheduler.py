@@ -0,0 +1,129 @@
+"""
+Adaptive per-park scrape scheduling.
+
+Each scrape is diffed against the park's previous snapshot to keep a running
+estimate of how fast its availability changes, weighting changes on
+near-term dates more heavily. A run then scrapes the parks expected to have
+missed the most changes since their last scrape, within a global request
+budget, while making sure no park goes unscraped for too long.
+"""
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Optional
+import pytz
+from src.database.models import ParkScrapeState, get_et_time
+
+# Each park page costs a cookie-priming request plus the page itself
+REQUESTS_PER_PARK = 2
+DEFAULT_REQUEST_BUDGET = 60
+
+# Changes within this many days count NEAR_TERM_WEIGHT times as much
+NEAR_TERM_DAYS = 2
+NEAR_TERM_WEIGHT = 3.0
+
+# Smoothing factor for the change rate moving average
+CHANGE_RATE_ALPHA = 0.3
+
+# Floor on the change rate so quiet parks still age into the schedule
+BASE_CHANGE_RATE = 0.05
+
+# Every park is scraped at least this often regardless of its change rate
+MAX_STALENESS = timedelta(hours=24)
+
+# Don't derive a rate from scrapes closer together than this
+MIN_RATE_INTERVAL_HOURS = 0.1
+
+def slot_key(record: dict) -> str:
+    """Identify a slot within a park."""
+    return f"{record['court_id']}|{record['date']}|{record['time']}"
+
+def slot_change_score(previous_keys: set[str], current_keys: set[str], today) -> float:
+    """Weighted count of slots that appeared or disappeared between snapshots."""
+    near_term_end = today + timedelta(days=NEAR_TERM_DAYS)
+    score = 0.0
+    for key in previous_keys ^ current_keys:
+        slot_date = datetime.strptime(key.split('|')[1], '%Y-%m-%d').date()
+        score += NEAR_TERM_WEIGHT if slot_date <= near_term_end else 1.0
+    return score
+
+def scrape_priority(state: Optional[ParkScrapeState], now: datetime) -> float:
+    """Expected number of weighted changes missed since the park's last scrape."""
+    if state is None or state.last_scraped_at is None:
+        return math.inf
+
+    age = now - state.last_scraped_at
+    if age >= MAX_STALENESS:
+        return math.inf
+    return (state.change_rate + BASE_CHANGE_RATE) * age.total_seconds() / 3600
+
+def rank_parks(park_ids: list[str], session, now: Optional[datetime] = None) -> list[str]:
+    """Order parks by scrape priority, highest first.
+
+    Parks that were never scraped or are past MAX_STALENESS always sort
+    first; the rest are ranked by change rate times time since last scrape.
+    """
+    now = now or get_et_time()
+    states = {
+        state.park_id: state
+        for state in session.query(ParkScrapeState).filter(
+            ParkScrapeState.park_id.in_(park_ids)
+        )
+    }
+    return sorted(
+        park_ids,
+        key=lambda park_id: scrape_priority(states.get(park_id), now),
+        reverse=True
+    )
+
+def select_parks(park_ids: list[str], session, request_budget: int = DEFAULT_REQUEST_BUDGET,
+                 now: Optional[datetime] = None) -> list[str]:
+    """Pick the parks to scrape this run within the request budget, highest priority first."""
+    ranked = rank_parks(park_ids, session, now)
+    return ranked[:max(1, request_budget // REQUESTS_PER_PARK)]
+
+def record_scrape(park_id: str, records: list[dict], session,
+                  scraped_at: Optional[datetime] = None) -> ParkScrapeState:
+    """Update a park's change rate and last_scraped_at from a new snapshot.
+
+    Does not commit.
+    """
+    scraped_at = scraped_at or get_et_time()
+    current_keys = {slot_key(record) for record in records}
+
+    state = session.get(ParkScrapeState, park_id)
+    if state is None:
+        state = ParkScrapeState(park_id=park_id, change_rate=0.0)
+        session.add(state)
+    elif state.last_scraped_at is not None:
+        previous_keys = set(json.loads(state.slot_keys or '[]'))
+        today = scraped_at.astimezone(pytz.timezone('America/New_York')).date()
+        score = slot_change_score(previous_keys, current_keys, today)
+        hours = max(
+            (scraped_at - state.last_scraped_at).total_seconds() / 3600,
+            MIN_RATE_INTERVAL_HOURS
+        )
+        state.change_rate = (
+            CHANGE_RATE_ALPHA * (score / hours)
+            + (1 - CHANGE_RATE_ALPHA) * (state.change_rate or 0.0)
+        )
+        if score:
+            state.last_changed_at = scraped_at
+
+    state.last_scraped_at = scraped_at
+    state.slot_keys = json.dumps(sorted(current_keys))
+    state.stale_since = None
+    return state
+
+def mark_stale(park_id: str, session, at: Optional[datetime] = None) -> ParkScrapeState:
+    """Record that a park was due but not scraped, keeping its previous data.
+
+    Does not commit.
+    """
+    state = session.get(ParkScrapeState, park_id)
+    if state is None:
+        state = ParkScrapeState(park_id=park_id, change_rate=0.0)
+        session.add(state)
+    if state.stale_since is None:
+        state.stale_since = at or get_et_time()
+    return state
@@ -0,0 +1,194 @@
+"""
+Static, precompressed snapshot of current availability.
+
+Between ETL runs availability doesn't change, so every published data
+version is written out as static JSON that can be served from disk or a CDN
+instead of querying the database per visitor (src/utils/snapshot.ts reads it):
+
+    data/snapshots/manifest.json            current version; revalidate
+    data/snapshots/files/overview-<hash>.json   every park and its slot counts
+    data/snapshots/files/park-<id>-<hash>.json  a park's slots by date
+
+The directory is outside public/ because Next only serves the public files
+that existed when it started. The app serves it from /api/snapshots, or the
+directory can be synced to a static host set as NEXT_PUBLIC_SNAPSHOT_BASE_URL.
+
+Data files are named by their content hash, so they can be cached forever
+and parks that didn't change keep their URL across versions. Each is also
+written as .gz and, when the brotli package is installed, .br for servers
+that serve precompressed files. The manifest is replaced last, so it never
+points at files that aren't there yet.
+
+SNAPSHOT_EXPORT_DIR overrides the directory; set to '' it disables exports
+after publishing.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from sqlalchemy import text
+from src.database.config import get_engine
+from src.database.read_queries import ALL_COURTS_SQL, PARK_SUMMARIES_SQL
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXPORT_DIR = Path(os.path.dirname(__file__)).parent.parent / 'data' / 'snapshots'
+MANIFEST_NAME = 'manifest.json'
+FILES_DIR = 'files'
+
+# Characters of the content hash kept in file names
+HASH_LENGTH = 16
+
+DATA_VERSION_SQL = "SELECT max(version) FROM dwh.data_versions"
+
+PARK_DAYS_SQL = """
+    SELECT park_id, date, slots FROM dwh.park_day_availability
+    WHERE date >= current_date
+    ORDER BY park_id, date
+"""
+
+def get_export_dir() -> Optional[Path]:
+    """Get the snapshot directory, or None when exports are disabled."""
+    export_dir = os.getenv('SNAPSHOT_EXPORT_DIR', str(EXPORT_DIR))
+    return Path(export_dir) if export_dir else None
+
+def _json_default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return float(value)
+
+def encode_json(data) -> bytes:
+    """Serialize compactly and deterministically, so unchanged data hashes the same."""
+    return json.dumps(data, default=_json_default, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+def write_precompressed(files_dir: Path, stem: str, content: bytes) -> dict:
+    """Write a content-addressed data file with its compressed variants.
+
+    Returns its manifest entry.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    name = f"{stem}-{digest[:HASH_LENGTH]}.json"
+    path = files_dir / name
+    variants = {'': content, '.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    for suffix, data in variants.items():
+        variant_path = path.with_name(name + suffix)
+        # Same name means same content, so an existing file is already right
+        if not variant_path.exists():
+            _write_atomic(variant_path, data)
+    return {
+        'path': f"{FILES_DIR}/{name}",
+        'sha256': digest,
+        'bytes': len(content),
+        'encodings': sorted(suffix.lstrip('.') for suffix in variants if suffix),
+    }
+
+def load_snapshot_data(connection) -> tuple[dict, dict[str, dict]]:
+    """Read the overview and every park's future slots.
+
+    The overview carries the data version, which clients can pass to
+    /api/availability-sync to fetch later changes.
+    """
+    version = connection.execute(text(DATA_VERSION_SQL)).scalar()
+    summaries = {
+        row['park_id']: row for row in connection.execute(text(PARK_SUMMARIES_SQL)).mappings()
+    }
+    parks = []
+    for court in connection.execute(text(ALL_COURTS_SQL)).mappings():
+        summary = summaries.get(court['park_id'], {})
+        parks.append({
+            **court,
+            'total_slots': summary.get('total_slots', 0),
+            'available_slots': summary.get('available_slots', 0),
+            'last_updated': summary.get('last_updated'),
+        })
+
+    park_days = {}
+    for row in connection.execute(text(PARK_DAYS_SQL)).mappings():
+        park_days.setdefault(row['park_id'], {})[row['date'].isoformat()] = row['slots']
+    park_files = {
+        park_id: {'park_id': park_id, 'days': days} for park_id, days in park_days.items()
+    }
+    return {'version': version, 'parks': parks}, park_files
+
+def _prune(files_dir: Path, keep: set[str]) -> int:
+    """Delete data files no longer referenced by a kept manifest."""
+    removed = 0
+    for path in files_dir.iterdir():
+        name = path.name
+        for suffix in ('.gz', '.br', '.tmp'):
+            name = name.removesuffix(suffix)
+        if f"{FILES_DIR}/{name}" not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+def _manifest_paths(manifest: Optional[dict]) -> set[str]:
+    if not manifest:
+        return set()
+    return {manifest['overview']['path']} | {entry['path'] for entry in manifest['parks'].values()}
+
+def export_snapshot(connection=None, export_dir=None, version: Optional[str] = None) -> dict:
+    """Write the current availability snapshot and switch the manifest to it.
+
+    Files of the previous manifest are kept, so clients that just fetched it
+    can still load its data; anything older is deleted.
+
+    Args:
+        connection: Connection to read from; the reader engine by default
+        export_dir: Snapshot directory, $SNAPSHOT_EXPORT_DIR or EXPORT_DIR by default
+        version: Version recorded in the manifest; the data version, or the
+            export time when there is none, by default
+
+    Returns:
+        The new manifest
+    """
+    export_dir = Path(export_dir or get_export_dir() or EXPORT_DIR)
+    files_dir = export_dir / FILES_DIR
+    files_dir.mkdir(parents=True, exist_ok=True)
+
+    if connection is None:
+        with get_engine('reader').connect() as reader:
+            overview, park_files = load_snapshot_data(reader)
+    else:
+        overview, park_files = load_snapshot_data(connection)
+
+    generated_at = datetime.now().astimezone()
+    manifest = {
+        'version': str(version or overview['version'] or generated_at.strftime('%Y%m%dT%H%M%S')),
+        'generated_at': generated_at.isoformat(),
+        'overview': write_precompressed(files_dir, 'overview', encode_json(overview)),
+        'parks': {
+            park_id: write_precompressed(files_dir, f"park-{park_id}", encode_json(data))
+            for park_id, data in park_files.items()
+        },
+    }
+
+    manifest_path = export_dir / MANIFEST_NAME
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+    _write_atomic(manifest_path, encode_json(manifest))
+    removed = _prune(files_dir, _manifest_paths(manifest) | _manifest_paths(previous))
+
+    print(f"Exported snapshot {manifest['version']}: {len(manifest['parks'])} parks, "
+          f"{removed} stale files removed")
+    return manifest
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export current availability as static, precompressed JSON.')
+    parser.add_argument('--export-dir', help=f'Snapshot directory (default: $SNAPSHOT_EXPORT_DIR or {EXPORT_DIR})')
+
+    args = parser.parse_args()
+    export_snapshot(export_dir=args.export_dir)
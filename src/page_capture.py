@@ -0,0 +1,84 @@
+"""
+Content-addressed store for fetched availability pages.
+
+When enabled (CAPTURE_DIR), each fetched page is gzipped and stored under its
+SHA-256, so identical pages across runs are kept once. A daily JSONL manifest
+records which source and park each page was fetched for and when, which is
+enough to re-parse a capture set offline with `python -m src.etl.replay_captures`.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+# Parallel fetch threads share one store
+_manifest_lock = threading.Lock()
+
+class CaptureStore:
+    """Store and look up captured pages in a directory."""
+
+    def __init__(self, capture_dir: str):
+        self.capture_dir = str(capture_dir)
+
+    def page_path(self, sha256: str) -> str:
+        return os.path.join(self.capture_dir, 'pages', sha256[:2], f"{sha256}.html.gz")
+
+    def manifest_path(self, day: date) -> str:
+        return os.path.join(self.capture_dir, f"captures_{day.strftime('%Y%m%d')}.jsonl")
+
+    def save(self, park_id: str, html: str, fetched_at: datetime, source: str = 'nyc_parks') -> str:
+        """Store a fetched page and record the fetch. Returns the page hash."""
+        content = html.encode('utf-8')
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        path = self.page_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'source': source,
+            'park_id': str(park_id),
+            'fetched_at': fetched_at.isoformat(),
+            'sha256': sha256,
+        }
+        with _manifest_lock:
+            with open(self.manifest_path(fetched_at.date()), 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        return sha256
+
+    def load(self, sha256: str) -> str:
+        """Read a captured page back."""
+        with gzip.open(self.page_path(sha256), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def iter_captures(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      park_ids: Optional[set[str]] = None) -> Iterator[dict]:
+        """Yield manifest entries in fetch order, optionally filtered."""
+        if not os.path.isdir(self.capture_dir):
+            return
+        for filename in sorted(os.listdir(self.capture_dir)):
+            if not (filename.startswith('captures_') and filename.endswith('.jsonl')):
+                continue
+            day = datetime.strptime(filename[len('captures_'):-len('.jsonl')], '%Y%m%d').date()
+            if (start_date and day < start_date) or (end_date and day > end_date):
+                continue
+            with open(os.path.join(self.capture_dir, filename)) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if park_ids and entry['park_id'] not in park_ids:
+                        continue
+                    yield entry
+
+def get_capture_store() -> Optional[CaptureStore]:
+    """Get the configured capture store, or None when capture is disabled."""
+    capture_dir = os.getenv('CAPTURE_DIR')
+    return CaptureStore(capture_dir) if capture_dir else None
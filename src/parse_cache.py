@@ -0,0 +1,61 @@
+"""
+Persistent cache of parsed availability pages.
+
+Keeps, per source and park, the content hash of the last page seen and of
+each of its date-tab panes, together with the records they parsed to. Tab
+labels are resolved to dates against the day the page was fetched, so the
+page's records are only reused on the same reference date; panes are
+cached without dates and can be reused on any day. Each
+park is a small JSON file so parallel scrape threads never write the same
+file.
+"""
+import json
+import os
+from typing import Optional
+
+DEFAULT_PARSE_CACHE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "data", "court_availability", "parse_cache"
+)
+
+class ParseCache:
+    """Read and write cached parse results for parks."""
+
+    def __init__(self, cache_dir: str, parser_version: int):
+        self.cache_dir = str(cache_dir)
+        self.parser_version = parser_version
+
+    def _path(self, park_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{park_id}.json")
+
+    def get(self, park_id: str) -> Optional[dict]:
+        """Get a park's cached entry, ignoring entries from another parser version."""
+        try:
+            with open(self._path(park_id)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('parser_version') != self.parser_version:
+            return None
+        return entry
+
+    def put(self, park_id: str, page_hash: str, reference_date: str, records: list[dict],
+            panes: dict[str, list[dict]]) -> None:
+        """Replace a park's entry with the latest page and its panes."""
+        entry = {
+            'parser_version': self.parser_version,
+            'page_hash': page_hash,
+            'reference_date': reference_date,
+            'records': records,
+            'panes': panes,
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(park_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+def get_parse_cache(parser_version: int, source: str) -> Optional[ParseCache]:
+    """Get a source's parse cache; PARSE_CACHE_DIR set to '' disables it."""
+    cache_dir = os.getenv('PARSE_CACHE_DIR', DEFAULT_PARSE_CACHE_DIR)
+    return ParseCache(os.path.join(cache_dir, source), parser_version) if cache_dir else None
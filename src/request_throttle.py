@@ -0,0 +1,171 @@
+"""
+Adaptive concurrency for outbound scrape requests.
+
+An AIMD controller caps how many requests are in flight. The cap grows by
+about one per round of healthy responses and halves on a 429, a 5xx, a
+network error or a latency spike, so a run settles near the highest rate
+the site tolerates. Throttled requests are retried with jittered
+exponential backoff, within the caller's deadline when it has one.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+import requests
+from requests import Response
+
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+DECREASE_FACTOR = 0.5
+
+# A response this many times slower than the healthy average counts as congestion
+LATENCY_SPIKE_FACTOR = 3.0
+LATENCY_ALPHA = 0.2
+MIN_LATENCY_SAMPLES = 5
+
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class AimdController:
+    """Thread-safe additive-increase/multiplicative-decrease concurrency limit."""
+
+    def __init__(self, initial: float = INITIAL_CONCURRENCY, min_limit: int = MIN_CONCURRENCY,
+                 max_limit: int = MAX_CONCURRENCY):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial)
+        self.peak = int(initial)
+        self.in_flight = 0
+        self.latency = None
+        self.latency_samples = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failed = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the in-flight request slots."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Grow the limit by one per limit's worth of healthy responses."""
+        with self._condition:
+            self.requests += 1
+            spike = (
+                self.latency_samples >= MIN_LATENCY_SAMPLES
+                and latency > LATENCY_SPIKE_FACTOR * self.latency
+            )
+            if spike:
+                self._decrease()
+                return
+            self.latency = latency if self.latency is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+            )
+            self.latency_samples += 1
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.peak = max(self.peak, int(self.limit))
+            self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        """Halve the limit after a throttling response or error."""
+        with self._condition:
+            self.requests += 1
+            self.throttled += 1
+            self._decrease()
+
+    def record_retry(self) -> None:
+        with self._condition:
+            self.retries += 1
+
+    def record_failure(self) -> None:
+        with self._condition:
+            self.failed += 1
+
+    def _decrease(self) -> None:
+        # Requests already in flight when the limit dropped report the same
+        # congestion, so only back off once per round trip
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+
+    def stats(self) -> dict:
+        """Summary for the run record."""
+        with self._condition:
+            return {
+                'concurrency': int(self.limit),
+                'peak_concurrency': self.peak,
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'failed': self.failed,
+                'avg_latency_seconds': round(self.latency, 3) if self.latency is not None else None,
+            }
+
+def backoff_seconds(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Jittered exponential backoff, honouring a numeric Retry-After header."""
+    if retry_after and retry_after.isdigit():
+        return min(MAX_BACKOFF_SECONDS, float(retry_after))
+    delay = min(MAX_BACKOFF_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.5)
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """Time left before a time.monotonic() deadline, or None without one."""
+    return None if deadline is None else deadline - time.monotonic()
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+def throttled_request(controller: AimdController, send, max_retries: int = MAX_RETRIES,
+                      deadline: Optional[float] = None) -> Response:
+    """Send a request through the controller, retrying throttled attempts.
+
+    `send` performs one request and returns the response. The last response
+    is returned, or the last error raised, once retries run out. With a
+    deadline (a time.monotonic() value), no retry starts after it and a
+    backoff never sleeps more than half the time left, leaving the rest to
+    the retry itself; `send` is expected to cap its own timeout at it.
+    """
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        with controller.slot():
+            started = time.monotonic()
+            try:
+                response = send()
+            except requests.RequestException:
+                controller.on_throttle()
+                if attempt == max_retries or deadline_passed(deadline):
+                    controller.record_failure()
+                    raise
+            else:
+                if response.status_code not in THROTTLE_STATUS_CODES:
+                    controller.on_success(time.monotonic() - started)
+                    return response
+                controller.on_throttle()
+                if attempt == max_retries or deadline_passed(deadline):
+                    controller.record_failure()
+                    return response
+                retry_after = response.headers.get('Retry-After')
+
+        controller.record_retry()
+        delay = backoff_seconds(attempt, retry_after)
+        remaining = remaining_seconds(deadline)
+        time.sleep(delay if remaining is None else max(0.0, min(delay, remaining / 2)))
@@ -0,0 +1,31 @@
+"""
+Reservation system adapters.
+
+Each source knows how to fetch a park's page from one reservation system,
+parse it and normalize it into slot records. Everything else (concurrency,
+retries, capture, parse caching and loading into staging) is shared by the
+scrape runtime in `src.court_availability_finder`.
+
+Adapters are registered by import path and loaded on first use, so a source
+module can import the shared runtime without a circular import.
+"""
+import importlib
+from src.sources.base import SLOT_COLUMNS, SourceAdapter, normalize_slot
+
+DEFAULT_SOURCE = 'nyc_parks'
+
+SOURCES = {
+    'nyc_parks': 'src.sources.nyc_parks:NycParksSource',
+}
+
+_instances: dict[str, SourceAdapter] = {}
+
+def get_source(name: str | None = None) -> SourceAdapter:
+    """Get the adapter registered under a name, defaulting to NYC Parks."""
+    name = name or DEFAULT_SOURCE
+    if name not in _instances:
+        if name not in SOURCES:
+            raise ValueError(f"Unknown source '{name}'. Must be one of: {', '.join(SOURCES)}")
+        module_name, class_name = SOURCES[name].split(':')
+        _instances[name] = getattr(importlib.import_module(module_name), class_name)()
+    return _instances[name]
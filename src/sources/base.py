@@ -0,0 +1,59 @@
+"""
+Interface every reservation system adapter implements.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+import pandas as pd
+
+# Columns of a normalized slot record, as staged into staging.court_availability
+SLOT_COLUMNS = ['park_id', 'date', 'time', 'court_id', 'status', 'reservation_link', 'is_available']
+
+def normalize_slot(record: dict) -> dict:
+    """Coerce an adapter's record to exactly the slot columns."""
+    slot = {column: record.get(column) for column in SLOT_COLUMNS}
+    slot['park_id'] = str(slot['park_id'])
+    slot['court_id'] = str(slot['court_id'])
+    slot['is_available'] = bool(slot['is_available'])
+    return slot
+
+class SourceAdapter(ABC):
+    """Fetch, parse and normalize steps for one reservation system.
+
+    Adapters must be importable by path and cheap to construct, since parse
+    worker processes look them up by name.
+    """
+
+    # Registry name, also used to namespace captures and the parse cache
+    name: str = ''
+
+    # Bump whenever parse output changes so cached parse results are discarded
+    parser_version: int = 1
+
+    @abstractmethod
+    def load_parks(self) -> pd.DataFrame:
+        """Parks to scrape, with a court_id column holding each park's ID."""
+
+    @abstractmethod
+    def fetch(self, park_id: str, timeout: float, controller=None, deadline: float | None = None) -> str | None:
+        """Fetch a park's page, or None if the response is unusable.
+
+        Requests should go through `throttled_request` when a controller is
+        given, so they share the run's adaptive concurrency limit. With a
+        deadline (a time.monotonic() value), request timeouts and retries
+        must not run past it.
+        """
+
+    @abstractmethod
+    def parse(self, page: str, park_id: str, fetched_at: datetime, cache=None) -> list[dict]:
+        """Parse a fetched page into the source's own records."""
+
+    def normalize(self, record: dict, park_id: str) -> dict:
+        """Map one parsed record onto the slot columns."""
+        return record
+
+    def scrape_page(self, page: str, park_id: str, fetched_at: datetime, cache=None) -> list[dict]:
+        """Parse and normalize a fetched page into slot records."""
+        return [
+            normalize_slot(self.normalize(record, park_id))
+            for record in self.parse(page, park_id, fetched_at, cache)
+        ]
@@ -0,0 +1,25 @@
+"""
+NYC Parks tennis reservation system.
+"""
+from datetime import datetime
+import pandas as pd
+from src.court_availability_finder import (
+    PARSER_VERSION, fetch_availability_page, load_parks, parse_availability_page
+)
+from src.sources.base import SourceAdapter
+
+class NycParksSource(SourceAdapter):
+    """Availability pages from nycgovparks.org/tennisreservation."""
+
+    name = 'nyc_parks'
+    parser_version = PARSER_VERSION
+
+    def load_parks(self) -> pd.DataFrame:
+        return load_parks()
+
+    def fetch(self, park_id: str, timeout: float, controller=None, deadline: float | None = None) -> str | None:
+        return fetch_availability_page(park_id, timeout, controller, deadline)
+
+    def parse(self, page: str, park_id: str, fetched_at: datetime, cache=None) -> list[dict]:
+        # Records already carry every slot column
+        return parse_availability_page(page, park_id, fetched_at, cache)
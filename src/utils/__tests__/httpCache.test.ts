@@ -0,0 +1,22 @@
+import { contentETag, etagMatches } from '../httpCache';
+
+describe('Conditional GET validators', () => {
+  it('derives the same weak ETag from the same content', () => {
+    const etag = contentETag('[{"park_id":"M1"}]');
+    expect(etag).toMatch(/^W\/".+"$/);
+    expect(contentETag('[{"park_id":"M1"}]')).toBe(etag);
+    expect(contentETag('[{"park_id":"M2"}]')).not.toBe(etag);
+  });
+
+  it('matches If-None-Match lists with weak comparison', () => {
+    expect(etagMatches('W/"abc"', 'W/"abc"')).toBe(true);
+    expect(etagMatches('"abc"', 'W/"abc"')).toBe(true);
+    expect(etagMatches('W/"old", W/"abc"', 'W/"abc"')).toBe(true);
+    expect(etagMatches('*', 'W/"abc"')).toBe(true);
+  });
+
+  it('does not match a missing or different ETag', () => {
+    expect(etagMatches(null, 'W/"abc"')).toBe(false);
+    expect(etagMatches('W/"abd"', 'W/"abc"')).toBe(false);
+  });
+});
@@ -0,0 +1,76 @@
+import type { AvailabilitySync, CourtAvailability, ParkDaySlot } from './database';
+
+// Spread clients' syncs over this long after a version is published, so
+// they don't all hit the database at the same moment
+export const SYNC_JITTER_MS = 5000;
+
+export async function fetchAvailabilitySync(since: number | null): Promise<AvailabilitySync> {
+  const query = since === null ? '' : `?since=${since}`;
+  const response = await fetch(`/api/availability-sync${query}`);
+  if (!response.ok) {
+    throw new Error('Failed to sync availability');
+  }
+  return response.json();
+}
+
+// Minutes since midnight of a "7:30 a.m." style slot time
+function slotMinutes(time: string): number {
+  const [clock, period] = time.toLowerCase().split(' ');
+  const [hours, minutes] = clock.split(':').map(Number);
+  return (hours % 12 + (period === 'p.m.' ? 12 : 0)) * 60 + minutes;
+}
+
+function toAvailability(parkId: string, date: string, slot: ParkDaySlot): CourtAvailability {
+  return { ...slot, park_id: parkId, date, is_available: true };
+}
+
+// Apply a sync to one day's availability for the given parks, keeping only
+// slots that pass `keep`; parks left without slots are dropped like a fresh search
+export function applyAvailabilitySync(
+  availability: Record<string, CourtAvailability[]>,
+  sync: AvailabilitySync,
+  parkIds: string[],
+  date: string,
+  keep: (slot: CourtAvailability) => boolean
+): Record<string, CourtAvailability[]> {
+  const next: Record<string, CourtAvailability[]> = {};
+  if (sync.full) {
+    for (const parkId of parkIds) {
+      const slots = (sync.parks[parkId]?.[date] ?? []).map(slot => toAvailability(parkId, date, slot)).filter(keep);
+      if (slots.length > 0) {
+        next[parkId] = slots;
+      }
+    }
+    return next;
+  }
+
+  const parks = new Set(parkIds);
+  const changed: Record<string, CourtAvailability[]> = {};
+  for (const change of sync.changes) {
+    if (change.date !== date || !parks.has(change.park_id)) {
+      continue;
+    }
+    const slots = changed[change.park_id] ?? [...(availability[change.park_id] ?? [])];
+    const kept = slots.filter(slot => slot.court_id !== change.court_id || slot.time !== change.time);
+    if (change.slot) {
+      const slot = toAvailability(change.park_id, date, change.slot);
+      if (keep(slot)) {
+        kept.push(slot);
+      }
+    }
+    changed[change.park_id] = kept;
+  }
+
+  Object.assign(next, availability);
+  for (const [parkId, slots] of Object.entries(changed)) {
+    if (slots.length > 0) {
+      // Same court and time order as the read model
+      next[parkId] = slots.sort((a, b) =>
+        a.court_id.localeCompare(b.court_id) || slotMinutes(a.time) - slotMinutes(b.time)
+      );
+    } else {
+      delete next[parkId];
+    }
+  }
+  return next;
+}
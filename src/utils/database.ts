@@ -1,19 +1,30 @@
 import { Pool } from 'pg';
 
-// Create a connection pool
+// Create a connection pool on the reader database (see src/database/config.py),
+// falling back to the primary when no reader URL is configured
+const readerUrl = process.env.DB_READER_URL || process.env.DB_WRITER_URL;
+
 const pool = new Pool({
-  user: process.env.DB_USER || 'postgres',
-  password: process.env.DB_PASSWORD,
-  host: process.env.DB_HOST || 'localhost',
-  port: parseInt(process.env.DB_PORT || '5432'),
-  database: process.env.DB_NAME || 'nyc_tennis',
+  ...(readerUrl
+    ? { connectionString: readerUrl }
+    : {
+        user: process.env.DB_USER || 'postgres',
+        password: process.env.DB_PASSWORD,
+        host: process.env.DB_HOST || 'localhost',
+        port: parseInt(process.env.DB_PORT || '5432'),
+        database: process.env.DB_NAME || 'nyc_tennis',
+      }),
+  max: parseInt(process.env.DB_READER_POOL_SIZE || '10'),
+  statement_timeout: parseInt(process.env.DB_READER_STATEMENT_TIMEOUT_MS || '15000'),
 });
 
-// Helper function to run queries
-export async function query(text: string, params?: any[]) {
+// Helper function to run queries. A named query is prepared server-side the
+// first time each pooled connection runs it and reused after that; the hot
+// queries below are named to match src/database/prepared_queries.py
+export async function query(text: string, params?: any[], name?: string) {
   const client = await pool.connect();
   try {
-    const result = await client.query(text, params);
+    const result = await client.query(name ? { name, text, values: params } : { text, values: params });
     return result.rows;
   } finally {
     client.release();
@@ -36,35 +47,58 @@ export interface TennisCourt {
   court_type?: string;
 }
 
+export type TimeBucket = 'morning' | 'afternoon' | 'evening';
+
+// A slot as stored in the per-park, per-day read model
+export interface ParkDaySlot {
+  court_id: string;
+  time: string;
+  bucket: TimeBucket;
+  status: string;
+  reservation_link?: string;
+}
+
 export interface CourtAvailability {
   park_id: string;  // Changed from court_id to park_id
   court_id: string; // Added court_id for individual courts within a park
   date: string;
   time: string;
+  bucket?: TimeBucket; // Time of day, precomputed by the ETL
   status: string;
   reservation_link?: string;
   is_available: boolean; // Added is_available field
 }
 
+// 'slim' leaves out the long free-text fields the map doesn't show
+export type CourtProjection = 'full' | 'slim';
+
+const SLIM_OMITTED_COLUMNS = ['park_details', 'hours', 'email'];
+
+const COURT_COLUMNS = [
+  'park_id',
+  'park_name',
+  'park_details',
+  'address',
+  'CAST(lat AS DECIMAL(10,6)) as lat',
+  'CAST(lon AS DECIMAL(10,6)) as lon',
+  'num_courts',
+  'phone',
+  'email',
+  'hours',
+  'website',
+  'court_type',
+];
+
 // Helper functions for common queries
-export async function getAllCourts(): Promise<TennisCourt[]> {
+export async function getAllCourts(projection: CourtProjection = 'full'): Promise<TennisCourt[]> {
+  const columns = projection === 'slim'
+    ? COURT_COLUMNS.filter(column => !SLIM_OMITTED_COLUMNS.includes(column))
+    : COURT_COLUMNS;
   const result = await query(`
-    SELECT 
-      park_id,
-      park_name,
-      park_details,
-      address,
-      CAST(lat AS DECIMAL(10,6)) as lat,
-      CAST(lon AS DECIMAL(10,6)) as lon,
-      num_courts,
-      phone,
-      email,
-      hours,
-      website,
-      court_type
+    SELECT ${columns.join(', ')}
     FROM dwh.tennis_courts
     ORDER BY park_name
-  `);
+  `, [], projection === 'slim' ? 'all_courts_slim' : 'all_courts');
 
   // Ensure lat/lon are valid numbers
   return result.map(court => ({
@@ -74,44 +108,141 @@ export async function getAllCourts(): Promise<TennisCourt[]> {
   }));
 }
 
+// A park-day's slots and the read model's hash of them, which changes
+// exactly when the slots do; null when the park-day has no row
+export async function getParkDayAvailability(
+  parkId: string,
+  date: string
+): Promise<{ slots: CourtAvailability[]; contentHash: string | null }> {
+  // One primary key fetch from the read model the ETL maintains
+  // (src/etl/read_model.py); slots are already filtered and in court and time order
+  const result = await query(`
+    SELECT slots, content_hash FROM dwh.park_day_availability WHERE park_id = $1 AND date = $2
+  `, [parkId, date], 'park_day');
+  if (result.length === 0) {
+    return { slots: [], contentHash: null };
+  }
+  const slots: ParkDaySlot[] = result[0].slots;
+  return {
+    slots: slots.map(slot => ({ ...slot, park_id: parkId, date, is_available: true })),
+    contentHash: result[0].content_hash,
+  };
+}
+
 export async function getCourtAvailability(
   parkId: string,
   date: string
 ): Promise<CourtAvailability[]> {
-  return query(`
-    SELECT 
-      park_id, 
-      court_id,
-      date, 
-      time,
-      status,
-      reservation_link,
-      is_available
-    FROM dwh.court_availability
-    WHERE 
-      park_id = $1 
-      AND date = $2
-      AND is_available = true
-      AND reservation_link IS NOT NULL
-    ORDER BY 
-      court_id,
-      CASE 
-        WHEN time LIKE '%a.m.' THEN 0
-        WHEN time LIKE '%p.m.' THEN 1
-      END,
-      CASE
-        WHEN time LIKE '12:%' THEN 0
-        ELSE CAST(SUBSTRING(time FROM '^[0-9]+') AS INTEGER)
-      END
-  `, [parkId, date]);
+  return (await getParkDayAvailability(parkId, date)).slots;
+}
+
+// The current data version (src/etl/read_model.py); 0 before the first
+export async function getDataVersion(): Promise<number> {
+  const result = await query(`
+    SELECT COALESCE(MAX(version), 0)::int AS version FROM dwh.data_versions
+  `, [], 'data_version');
+  return result[0].version;
 }
 
 export async function getLatestAvailabilityUpdate(): Promise<Date | null> {
   const result = await query(`
-    SELECT last_updated AT TIME ZONE 'America/New_York' as et_time
-    FROM dwh.court_availability
-    ORDER BY last_updated DESC
+    SELECT MAX(last_updated) AT TIME ZONE 'America/New_York' as et_time
+    FROM dwh.court_availability_slots
+  `, [], 'latest_update');
+  return result.length > 0 && result[0].et_time ? new Date(result[0].et_time) : null;
+}
+
+// A slot's state after the changes since a client's version; null once removed
+export interface AvailabilityChange {
+  park_id: string;
+  date: string;
+  court_id: string;
+  time: string;
+  slot: ParkDaySlot | null;
+}
+
+export type AvailabilitySync =
+  | { version: number; full: false; changes: AvailabilityChange[] }
+  | { version: number; full: true; parks: Record<string, Record<string, ParkDaySlot[]>> };
+
+// Changes since a data version (src/etl/read_model.py), or every current
+// park-day when the version is unknown or older than the retained changes.
+// Both are read from one snapshot so the reported version matches the data.
+// Clients drop past dates themselves; their expiry isn't recorded as a change.
+export async function getAvailabilitySync(since: number | null): Promise<AvailabilitySync> {
+  const client = await pool.connect();
+  try {
+    await client.query('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY');
+    const range = await client.query(`
+      SELECT COALESCE(MAX(version), 0)::int AS current, COALESCE(MIN(version), 0)::int AS oldest
+      FROM dwh.data_versions
+    `);
+    const { current, oldest } = range.rows[0];
+
+    let sync: AvailabilitySync;
+    if (since !== null && since >= oldest - 1 && since <= current) {
+      // Only each slot's latest change matters
+      const changes = await client.query({
+        name: 'availability_changes',
+        text: `
+          SELECT DISTINCT ON (park_id, date, court_id, time)
+            park_id, to_char(date, 'YYYY-MM-DD') AS date, court_id, time, slot
+          FROM dwh.availability_changes
+          WHERE version > $1 AND version <= $2 AND date >= CURRENT_DATE
+          ORDER BY park_id, date, court_id, time, version DESC, id DESC
+        `,
+        values: [since, current],
+      });
+      sync = { version: current, full: false, changes: changes.rows };
+    } else {
+      const parkDays = await client.query({
+        name: 'availability_snapshot',
+        text: `
+          SELECT park_id, to_char(date, 'YYYY-MM-DD') AS date, slots
+          FROM dwh.park_day_availability
+          WHERE date >= CURRENT_DATE
+          ORDER BY park_id, date
+        `,
+      });
+      const parks: Record<string, Record<string, ParkDaySlot[]>> = {};
+      for (const row of parkDays.rows) {
+        if (!parks[row.park_id]) {
+          parks[row.park_id] = {};
+        }
+        parks[row.park_id][row.date] = row.slots;
+      }
+      sync = { version: current, full: true, parks };
+    }
+    await client.query('COMMIT');
+    return sync;
+  } catch (error) {
+    await client.query('ROLLBACK');
+    throw error;
+  } finally {
+    client.release();
+  }
+}
+
+export interface LatestLoad {
+  filename: string;
+  loaded_at: string;
+  total_files: number;
+  version: number;
+}
+
+// The most recently loaded raw file, from the registry rather than the
+// raw_files directory, with the data version it led to
+export async function getLatestLoad(): Promise<LatestLoad | null> {
+  const result = await query(`
+    SELECT
+      f.filename,
+      f.load_timestamp AS loaded_at,
+      COUNT(*) OVER ()::int AS total_files,
+      (SELECT COALESCE(MAX(version), 0)::int FROM dwh.data_versions) AS version
+    FROM raw_files.file_registry f
+    WHERE f.status IN ('processed', 'archived')
+    ORDER BY f.load_timestamp DESC
     LIMIT 1
-  `);
-  return result.length > 0 ? new Date(result[0].et_time) : null;
-} 
\ No newline at end of file
+  `, [], 'latest_load');
+  return result.length > 0 ? result[0] : null;
+}
@@ -0,0 +1,99 @@
+import { Client } from 'pg';
+
+// Events the ETL sends with NOTIFY (see src/etl/events.py)
+export const ETL_EVENTS_CHANNEL = 'etl_events';
+
+export type EtlEvent =
+  | { type: 'version'; version: number }
+  | { type: 'published'; version: number; changes: number }
+  | { type: 'progress'; run: number; stage: string; [detail: string]: unknown };
+
+type Listener = (event: EtlEvent) => void;
+
+const RECONNECT_DELAY_MS = 5000;
+
+const listeners = new Set<Listener>();
+let client: Client | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+
+// Notifications are only delivered on the primary, so listen there rather
+// than on the reader the queries use
+function listenerConfig() {
+  return process.env.DB_WRITER_URL
+    ? { connectionString: process.env.DB_WRITER_URL }
+    : {
+        user: process.env.DB_USER || 'postgres',
+        password: process.env.DB_PASSWORD,
+        host: process.env.DB_HOST || 'localhost',
+        port: parseInt(process.env.DB_PORT || '5432'),
+        database: process.env.DB_NAME || 'nyc_tennis',
+      };
+}
+
+function scheduleReconnect() {
+  client = null;
+  if (listeners.size > 0 && !reconnectTimer) {
+    reconnectTimer = setTimeout(() => {
+      reconnectTimer = null;
+      startListening();
+    }, RECONNECT_DELAY_MS);
+  }
+}
+
+async function startListening() {
+  if (client) {
+    return;
+  }
+  const listening = new Client(listenerConfig());
+  client = listening;
+  listening.on('notification', message => {
+    if (message.channel !== ETL_EVENTS_CHANNEL || !message.payload) {
+      return;
+    }
+    let event: EtlEvent;
+    try {
+      event = JSON.parse(message.payload);
+    } catch {
+      return;
+    }
+    listeners.forEach(listener => listener(event));
+  });
+  listening.on('error', error => {
+    console.error('ETL event listener failed:', error);
+    listening.end().catch(() => undefined);
+    if (client === listening) {
+      scheduleReconnect();
+    }
+  });
+
+  try {
+    await listening.connect();
+    await listening.query(`LISTEN ${ETL_EVENTS_CHANNEL}`);
+  } catch (error) {
+    console.error('Could not listen for ETL events:', error);
+    listening.end().catch(() => undefined);
+    if (client === listening) {
+      scheduleReconnect();
+    }
+  }
+}
+
+// One connection per server process listens for every subscriber; it is
+// opened with the first subscription and closed after the last one ends
+export function subscribeToEtlEvents(listener: Listener): () => void {
+  listeners.add(listener);
+  startListening();
+
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0) {
+      if (reconnectTimer) {
+        clearTimeout(reconnectTimer);
+        reconnectTimer = null;
+      }
+      const listening = client;
+      client = null;
+      listening?.end().catch(() => undefined);
+    }
+  };
+}
@@ -0,0 +1,41 @@
+import { createHash } from 'crypto';
+
+// Let clients and CDNs keep responses but check back every time; an
+// unchanged response then costs a 304 with no body
+export const REVALIDATE = 'public, no-cache';
+
+// Weak validator from a response body; weak because compression changes
+// the bytes on the wire but not the content
+export function contentETag(body: string): string {
+  return `W/"${createHash('sha1').update(body).digest('base64url')}"`;
+}
+
+// Whether an If-None-Match header matches an ETag, using the weak
+// comparison that conditional GETs call for
+export function etagMatches(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) {
+    return false;
+  }
+  const opaque = (tag: string) => tag.trim().replace(/^W\//, '');
+  return ifNoneMatch.split(',').some(tag => tag.trim() === '*' || opaque(tag) === opaque(etag));
+}
+
+// A 304 when the client already has this version, the JSON body otherwise;
+// the body is only built when it is sent
+export async function conditionalJson(
+  request: Request,
+  etag: string,
+  body: () => string | Promise<string>
+): Promise<Response> {
+  const headers = { ETag: etag, 'Cache-Control': REVALIDATE };
+  if (etagMatches(request.headers.get('if-none-match'), etag)) {
+    return new Response(null, { status: 304, headers });
+  }
+  return new Response(await body(), { headers: { ...headers, 'Content-Type': 'application/json' } });
+}
+
+// Today in New York, where the data's dates are; past dates drop out of
+// responses at midnight, so validators that depend on the day include it
+export function dataDay(): string {
+  return new Date().toLocaleDateString('en-CA', { timeZone: 'America/New_York' });
+}
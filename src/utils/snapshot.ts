@@ -0,0 +1,70 @@
+import { CourtAvailability, TennisCourt } from './database';
+
+// Static availability snapshot the ETL exports after every published version
+// (src/etl/snapshot_export.py). Data files are named by content hash and
+// cached forever, so once a browser or CDN has them, reads never reach the
+// database; only the small manifest is revalidated. Served by
+// /api/snapshots, or by a static host the export directory is synced to.
+const SNAPSHOT_BASE = (process.env.NEXT_PUBLIC_SNAPSHOT_BASE_URL || '/api/snapshots').replace(/\/$/, '');
+
+interface SnapshotEntry {
+  path: string;
+  sha256: string;
+  bytes: number;
+  encodings: string[];
+}
+
+export interface SnapshotManifest {
+  version: string;
+  generated_at: string;
+  overview: SnapshotEntry;
+  parks: Record<string, SnapshotEntry>;
+}
+
+interface SnapshotOverview {
+  version: number | null;
+  parks: TennisCourt[];
+}
+
+interface ParkSnapshot {
+  park_id: string;
+  days: Record<string, CourtAvailability[]>;
+}
+
+async function fetchSnapshotFile<T>(entry: SnapshotEntry): Promise<T> {
+  const response = await fetch(`${SNAPSHOT_BASE}/${entry.path}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch snapshot file ${entry.path}`);
+  }
+  return response.json();
+}
+
+// The current manifest, or null when no snapshot has been exported
+export async function fetchSnapshotManifest(): Promise<SnapshotManifest | null> {
+  try {
+    // Always revalidate; a new version replaces the manifest in place
+    const response = await fetch(`${SNAPSHOT_BASE}/manifest.json`, { cache: 'no-cache' });
+    return response.ok ? await response.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+export async function fetchSnapshotCourts(manifest: SnapshotManifest): Promise<TennisCourt[]> {
+  const overview = await fetchSnapshotFile<SnapshotOverview>(manifest.overview);
+  return overview.parks;
+}
+
+// A park-day's bookable slots; parks without upcoming slots have no file
+export async function fetchSnapshotParkDay(
+  manifest: SnapshotManifest,
+  parkId: string,
+  date: string
+): Promise<CourtAvailability[]> {
+  const entry = manifest.parks[parkId];
+  if (!entry) {
+    return [];
+  }
+  const park = await fetchSnapshotFile<ParkSnapshot>(entry);
+  return park.days[date] ?? [];
+}
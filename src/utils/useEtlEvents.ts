@@ -0,0 +1,47 @@
+'use client';
+
+import { useEffect, useRef } from 'react';
+import type { EtlEvent } from './etlEvents';
+
+const EVENT_TYPES: EtlEvent['type'][] = ['version', 'published', 'progress'];
+
+// Subscribe to /api/etl-events for the component's lifetime; EventSource
+// reconnects by itself when the connection drops
+export function useEtlEvents(onEvent: (event: EtlEvent) => void) {
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    const source = new EventSource('/api/etl-events');
+    const relay = (message: MessageEvent) => {
+      try {
+        handler.current(JSON.parse(message.data));
+      } catch (error) {
+        console.error('Malformed ETL event:', error);
+      }
+    };
+    EVENT_TYPES.forEach(type => source.addEventListener(type, relay as EventListener));
+    return () => source.close();
+  }, []);
+}
+
+// Call back whenever a newer data version is published. The version sent on
+// every (re)connect also catches versions published while disconnected.
+// Returns the latest version seen, null until the first event.
+export function useNewDataVersion(onNewVersion: (version: number) => void) {
+  const lastVersion = useRef<number | null>(null);
+
+  useEtlEvents(event => {
+    if (event.type !== 'version' && event.type !== 'published') {
+      return;
+    }
+    const previous = lastVersion.current;
+    if (previous === null || event.version > previous) {
+      lastVersion.current = event.version;
+      if (previous !== null) {
+        onNewVersion(event.version);
+      }
+    }
+  });
+  return lastVersion;
+}
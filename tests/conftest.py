@@ -161,4 +161,40 @@ def sample_csv_files(sample_courts_data, sample_availability_data):
 
     # Clean up temporary files
     os.unlink(courts_path)
-    os.unlink(avail_path) 
\ No newline at end of file
+    os.unlink(avail_path) 
+
+@pytest.fixture
+def availability_page_html():
+    """A park availability page with two date tabs."""
+    return """
+    <ul>
+        <li><a data-toggle="tab" href="#day1">Tue08/12</a></li>
+        <li><a data-toggle="tab" href="#day2">Wed08/13</a></li>
+    </ul>
+    <div id="day1">
+        <table class="table">
+            <tr><th>Time</th><th>Court 1</th><th>Court 2</th></tr>
+            <tr>
+                <td>9:00 a.m.</td>
+                <td><a href="/tennisreservation/reserve/1">Reserve this time</a></td>
+                <td>Not available</td>
+            </tr>
+        </table>
+    </div>
+    <div id="day2">
+        <table class="table">
+            <tr><th>Time</th><th>Court 1</th></tr>
+            <tr><td>10:00 a.m.</td><td><a href="/tennisreservation/reserve/2">Reserve this time</a></td></tr>
+        </table>
+    </div>
+    """ + "<!-- padding -->" * 80
+
+@pytest.fixture(autouse=True)
+def disable_parse_cache(monkeypatch):
+    """Keep scraper tests from reading or writing the real parse cache."""
+    monkeypatch.setenv('PARSE_CACHE_DIR', '')
+
+@pytest.fixture(autouse=True)
+def disable_snapshot_export(monkeypatch):
+    """Keep merges in tests from exporting into the real snapshot directory."""
+    monkeypatch.setenv('SNAPSHOT_EXPORT_DIR', '')
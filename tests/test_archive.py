@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import MagicMock
+from datetime import date
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from src.etl.archive import (
+    archive_processed_files, read_archive, list_archives, archive_path_for_day
+)
+from src.etl.csv_loader import calculate_file_hash
+from src.database.models import FileRegistry
+
+def write_raw_file(data_dir, timestamp, court_ids):
+    """Write a raw availability file and return its registry record."""
+    file_path = data_dir / f"court_availability_{timestamp}.csv"
+    pd.DataFrame([
+        {
+            'park_id': '12', 'date': '2025-08-18', 'time': '2:00 p.m.', 'court_id': court_id,
+            'status': 'Reserve this time',
+            'reservation_link': f'https://www.nycgovparks.org/tennisreservation/reservecp/{court_id}',
+            'is_available': True
+        }
+        for court_id in court_ids
+    ]).to_csv(file_path, index=False)
+    return FileRegistry(
+        filename=file_path.name,
+        filepath=str(file_path),
+        file_hash=calculate_file_hash(str(file_path)),
+        status='processed'
+    )
+
+def make_session(records):
+    session = MagicMock()
+    session.query.return_value.filter.return_value.all.return_value = records
+    return session
+
+def test_archive_processed_files(tmp_path):
+    """Test compacting processed files into daily Parquet archives."""
+    archive_dir = tmp_path / 'archive'
+    records = [
+        write_raw_file(tmp_path, '20250811_140000', ['19', '20']),
+        write_raw_file(tmp_path, '20250811_150000', ['19']),
+        write_raw_file(tmp_path, '20250812_090000', ['21']),
+    ]
+    session = make_session(records)
+
+    report = archive_processed_files(session, archive_dir=str(archive_dir))
+
+    assert report == {'files': 3, 'rows': 4, 'days': 2}
+    day_path = archive_path_for_day(date(2025, 8, 11), str(archive_dir))
+    assert records[0].archive_path == day_path
+    assert all(record.status == 'archived' for record in records)
+    assert not any(os.path.exists(record.filepath) for record in records)
+
+    metadata = pq.ParquetFile(day_path).metadata
+    assert metadata.row_group(0).column(0).compression == 'ZSTD'
+
+def test_archive_replaces_rearchived_file(tmp_path):
+    """Test that archiving the same source file twice does not duplicate rows."""
+    archive_dir = tmp_path / 'archive'
+    record = write_raw_file(tmp_path, '20250811_140000', ['19', '20'])
+    archive_processed_files(make_session([record]), archive_dir=str(archive_dir))
+
+    record = write_raw_file(tmp_path, '20250811_140000', ['19', '20'])
+    archive_processed_files(make_session([record]), archive_dir=str(archive_dir))
+
+    assert len(read_archive(str(archive_dir))) == 2
+
+def test_read_archive(tmp_path):
+    """Test reading archives back by date range with categorical columns."""
+    archive_dir = tmp_path / 'archive'
+    records = [
+        write_raw_file(tmp_path, '20250811_140000', ['19', '20']),
+        write_raw_file(tmp_path, '20250812_090000', ['21']),
+    ]
+    archive_processed_files(make_session(records), archive_dir=str(archive_dir))
+
+    assert len(list_archives(str(archive_dir))) == 2
+
+    df = read_archive(str(archive_dir), start_date=date(2025, 8, 12))
+    assert len(df) == 1
+    assert df.iloc[0]['court_id'] == '21'
+    assert isinstance(df['park_id'].dtype, pd.CategoricalDtype)
+    assert df.iloc[0]['date'] == date(2025, 8, 18)
+
+    df = read_archive(str(archive_dir), columns=['court_id', 'file_hash'])
+    assert list(df.columns) == ['court_id', 'file_hash']
+    assert len(df) == 3
+
+def test_read_archive_empty(tmp_path):
+    """Test reading from a missing archive directory."""
+    assert read_archive(str(tmp_path / 'missing')).empty
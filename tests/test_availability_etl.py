@@ -4,7 +4,7 @@ from src.etl.csv_loader import (
     register_file, update_file_status
 )
 from src.database.models import (
-    StagingCourtAvailability, DwhCourtAvailability,
+    StagingCourtAvailability, DwhCourtAvailability, DwhCourtAvailabilitySlot,
     FileRegistry, DwhTennisCourt
 )
 from datetime import datetime
@@ -174,4 +174,26 @@ def test_availability_unique_constraint(db_session, sample_courts_data, sample_c
         db_session.commit()
     
     # Verify that the error is related to unique constraint
-    assert "unique constraint" in str(exc_info.value).lower() 
\ No newline at end of file
+    assert "unique constraint" in str(exc_info.value).lower()
+
+
+def test_court_availability_view_round_trip(db_session):
+    """Test that slots written through the view are encoded and decoded back."""
+    db_session.add(DwhTennisCourt(park_id='M1', park_name='Park 1'))
+    db_session.commit()
+
+    link = 'https://www.nycgovparks.org/tennisreservation/reserve/12345'
+    db_session.add(DwhCourtAvailability(
+        park_id='M1', court_id='1', date=datetime(2025, 8, 1).date(), time='12:30 p.m.',
+        status='Available', reservation_link=link, is_available=True
+    ))
+    db_session.commit()
+
+    slot = db_session.query(DwhCourtAvailabilitySlot).one()
+    assert slot.slot_time == 12 * 60 + 30
+    assert slot.reservation_id == 12345
+    assert slot.reservation_link is None
+
+    decoded = db_session.query(DwhCourtAvailability).one()
+    assert decoded.time == '12:30 p.m.'
+    assert decoded.reservation_link == link
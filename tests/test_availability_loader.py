@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from src.etl.availability_loader import (
-    get_latest_file, process_file, run_availability_etl
+    get_latest_file, process_file, run_availability_etl,
+    get_pending_files, coalesce_snapshots, run_catchup_etl
 )
 import os
 import pandas as pd
@@ -51,8 +52,9 @@ def test_get_latest_file(tmp_path):
 @patch('src.etl.availability_loader.load_availability_to_staging')
 @patch('src.etl.availability_loader.merge_availability_to_dwh')
 @patch('src.etl.availability_loader.update_file_status')
+@patch('src.etl.availability_loader.drop_availability_staging')
 def test_process_file(
-    mock_update_status, mock_merge, mock_load, mock_register,
+    mock_drop_staging, mock_update_status, mock_merge, mock_load, mock_register,
     sample_file, db_session
 ):
     """Test processing an availability file."""
@@ -65,8 +67,9 @@ def test_process_file(
     # Verify function calls
     mock_register.assert_called_once_with(sample_file, session=db_session)
     mock_load.assert_called_once_with(sample_file, 1, db_session)
-    mock_merge.assert_called_once_with(db_session)
+    mock_merge.assert_called_once_with(db_session, 1)
     mock_update_status.assert_called_once_with(1, 'processed', db_session)
+    mock_drop_staging.assert_called_once_with(1, db_session)
 
 @patch('src.etl.availability_loader.get_latest_file')
 @patch('src.etl.availability_loader.process_file')
@@ -80,4 +83,129 @@ def test_run_availability_etl(mock_process, mock_get_latest, sample_file):
     
     # Verify function calls
     mock_get_latest.assert_called_once()
-    mock_process.assert_called_once_with(sample_file) 
\ No newline at end of file
+    mock_process.assert_called_once_with(sample_file) 
+
+def write_snapshot(data_dir, timestamp, rows):
+    """Write a raw availability file for a given timestamp."""
+    file_path = data_dir / f"court_availability_{timestamp}.csv"
+    pd.DataFrame([
+        {
+            'park_id': park_id,
+            'date': '2025-08-01',
+            'time': time,
+            'court_id': court_id,
+            'status': 'Reserve this time',
+            'reservation_link': link,
+            'is_available': True
+        }
+        for park_id, court_id, time, link in rows
+    ]).to_csv(file_path, index=False)
+    return str(file_path)
+
+def test_get_pending_files(tmp_path):
+    """Test that registered files are skipped and the rest are ordered."""
+    for name in ["court_availability_20250801_100000.csv",
+                 "court_availability_20250801_090000.csv",
+                 "court_availability_20250801_110000.csv",
+                 "notes.txt"]:
+        (tmp_path / name).touch()
+
+    session = MagicMock()
+    session.query.return_value.filter.return_value = [("court_availability_20250801_100000.csv",)]
+
+    pending = get_pending_files(str(tmp_path), session)
+    assert [os.path.basename(p) for p in pending] == [
+        "court_availability_20250801_090000.csv",
+        "court_availability_20250801_110000.csv",
+    ]
+
+def test_coalesce_snapshots():
+    """Test that only the newest snapshot of each park survives coalescing."""
+    older = pd.DataFrame([
+        {'park_id': 1, 'court_id': 5, 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'old', 'file_id': 1},
+        {'park_id': 2, 'court_id': 7, 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'other-park', 'file_id': 1},
+    ])
+    newer = pd.DataFrame([
+        {'park_id': '1', 'court_id': '5', 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'new', 'file_id': 2},
+    ])
+
+    coalesced = coalesce_snapshots([older, newer])
+
+    assert len(coalesced) == 2
+    slot = coalesced[coalesced['court_id'] == '5'].iloc[0]
+    assert slot['reservation_link'] == 'new'
+    assert slot['file_id'] == 2
+    # Parks missing from the newer snapshot keep their older rows
+    assert coalesced[coalesced['park_id'] == '2'].iloc[0]['file_id'] == 1
+
+def test_coalesce_snapshots_drops_slots_missing_from_newer_snapshot():
+    """Test that a slot gone from a park's newer snapshot doesn't come back from an older one."""
+    older = pd.DataFrame([
+        {'park_id': 1, 'court_id': 5, 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'a', 'file_id': 1},
+        {'park_id': 1, 'court_id': 6, 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'booked', 'file_id': 1},
+    ])
+    newer = pd.DataFrame([
+        {'park_id': 1, 'court_id': 5, 'date': '2025-08-01', 'time': '9:00 a.m.', 'reservation_link': 'a', 'file_id': 2},
+    ])
+
+    coalesced = coalesce_snapshots([older, newer])
+
+    assert list(coalesced['court_id']) == ['5']
+    assert list(coalesced['file_id']) == [2]
+
+@patch('src.etl.availability_loader.drop_availability_staging')
+@patch('src.etl.availability_loader.create_availability_staging')
+@patch('src.etl.availability_loader.update_file_status')
+@patch('src.etl.availability_loader.merge_availability_to_dwh')
+@patch('src.etl.availability_loader.register_file')
+@patch('src.etl.availability_loader.get_pending_files')
+def test_run_catchup_etl(mock_pending, mock_register, mock_merge, mock_update_status,
+        mock_create_staging, mock_drop_staging, tmp_path):
+    """Test loading a backlog of files in coalesced batches."""
+    files = [
+        write_snapshot(tmp_path, "20250801_090000", [('1', '5', '9:00 a.m.', 'a'), ('1', '6', '9:00 a.m.', 'b')]),
+        write_snapshot(tmp_path, "20250801_100000", [('1', '5', '9:00 a.m.', 'c')]),
+        write_snapshot(tmp_path, "20250801_110000", [('1', '5', '10:00 a.m.', 'd')]),
+    ]
+    mock_pending.return_value = files
+    mock_register.side_effect = [1, 2, 3]
+    session = MagicMock()
+
+    report = run_catchup_etl(str(tmp_path), batch_size=2, session=session)
+
+    # Two batches, each merged once
+    assert report['batches'] == 2
+    assert mock_merge.call_count == 2
+    assert report['files'] == 3
+    assert report['rows_read'] == 4
+    # First batch keeps only park 1's newer snapshot, which no longer lists court 6
+    assert report['rows_merged'] == 2
+    staged = session.execute.call_args_list[0].args[1]
+    assert sorted((row['court_id'], row['file_id']) for row in staged) == [('5', 2)]
+    # Each batch stages into, merges and drops only its own files' partitions
+    assert mock_create_staging.call_args_list[0].args[0] == [1, 2]
+    assert mock_merge.call_args_list[0].args[1] == [1, 2]
+    assert mock_drop_staging.call_args_list[1].args[0] == [3]
+    assert 'rows_per_second' in report
+
+@patch('src.etl.availability_loader.drop_availability_staging')
+@patch('src.etl.availability_loader.create_availability_staging')
+@patch('src.etl.availability_loader.update_file_status')
+@patch('src.etl.availability_loader.merge_availability_to_dwh')
+@patch('src.etl.availability_loader.register_file')
+@patch('src.etl.availability_loader.get_pending_files')
+def test_run_catchup_etl_skips_invalid_file(mock_pending, mock_register, mock_merge, mock_update_status,
+        mock_create_staging, mock_drop_staging, tmp_path):
+    """Test that an invalid file is marked failed without blocking the backlog."""
+    bad_file = tmp_path / "court_availability_20250801_080000.csv"
+    pd.DataFrame([{'court_id': '1', 'time': '9:00 a.m.'}]).to_csv(bad_file, index=False)
+    good_file = write_snapshot(tmp_path, "20250801_090000", [('1', '5', '9:00 a.m.', 'a')])
+    mock_pending.return_value = [str(bad_file), good_file]
+    mock_register.side_effect = [1, 2]
+
+    report = run_catchup_etl(str(tmp_path), session=MagicMock())
+
+    assert report['failed_files'] == 1
+    assert report['files'] == 1
+    mock_update_status.assert_any_call(1, 'failed', ANY)
+    mock_update_status.assert_any_call(2, 'processed', ANY)
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+from src.etl.backfill import run_backfill, snapshot_key
+from src.etl.csv_loader import (
+    calculate_file_hash, normalize_legacy_columns, parse_snapshot_file,
+    snapshot_time_from_filename
+)
+
+def write_file(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+CURRENT_ROW = {
+    'park_id': '12', 'date': '2025-08-18', 'time': '2:00 p.m.', 'court_id': '19',
+    'status': 'Reserve this time',
+    'reservation_link': 'https://www.nycgovparks.org/tennisreservation/reservecp/866406',
+    'is_available': True
+}
+
+def test_snapshot_time_from_filename():
+    """Test reading the scrape time from a raw file name."""
+    snapshot_time = snapshot_time_from_filename('/x/court_availability_20250811_223433.csv')
+    assert snapshot_time.strftime('%Y-%m-%d %H:%M:%S') == '2025-08-11 22:34:33'
+    assert snapshot_time.tzinfo is not None
+
+def test_normalize_legacy_columns():
+    """Test converting the pre park/court split layout."""
+    df = pd.DataFrame([
+        {'time': '6:00 a.m.', 'court': 'Court 10', 'status': 'Not available',
+         'reservation_link': None, 'court_id': 2, 'date': '2025-08-12'},
+        {'time': '7:00 a.m.', 'court': 'Court 9', 'status': 'Reserve this time',
+         'reservation_link': 'https://example.com/reserve/1', 'court_id': 2, 'date': '2025-08-12'},
+    ])
+
+    normalized = normalize_legacy_columns(df)
+
+    assert len(normalized) == 1
+    row = normalized.iloc[0]
+    assert row['park_id'] == 2
+    assert row['court_id'] == '9'
+    assert bool(row['is_available'])
+
+def test_parse_snapshot_file(tmp_path):
+    """Test parsing a raw file into snapshot rows."""
+    file_path = write_file(tmp_path / 'court_availability_20250811_142011.csv', [CURRENT_ROW])
+
+    df = parse_snapshot_file(file_path, 'abc')
+
+    assert len(df) == 1
+    assert df.iloc[0]['file_hash'] == 'abc'
+    assert df.iloc[0]['snapshot_time'].startswith('2025-08-11T14:20:11')
+    assert list(df.columns)[0] == 'snapshot_time'
+
+@patch('src.etl.backfill.record_snapshot_loads')
+@patch('src.etl.backfill.copy_dataframe')
+@patch('src.etl.backfill.get_loaded_snapshots')
+def test_run_backfill_skips_loaded_files(mock_loaded, mock_copy, mock_record, tmp_path):
+    """Test that files already in the history are skipped and bad files don't stop the run."""
+    loaded = write_file(tmp_path / 'court_availability_20250811_142011.csv', [CURRENT_ROW])
+    write_file(tmp_path / 'court_availability_20250811_152047.csv', [CURRENT_ROW, {**CURRENT_ROW, 'court_id': '20'}])
+    write_file(tmp_path / 'court_availability_20250811_152412.csv', [{**CURRENT_ROW, 'time': 'noon'}])
+    mock_loaded.return_value = {snapshot_key(calculate_file_hash(loaded), snapshot_time_from_filename(loaded))}
+    session = MagicMock()
+
+    report = run_backfill(str(tmp_path), workers=2, session=session, archive_dir=str(tmp_path / 'archive'))
+
+    assert report['files_skipped'] == 1
+    assert report['skipped_files'] == ['court_availability_20250811_142011.csv']
+    assert report['files_loaded'] == 1
+    assert report['files_failed'] == 1
+    assert report['rows_loaded'] == 2
+    mock_copy.assert_called_once()
+    assert mock_copy.call_args.args[1] == 'dwh.availability_snapshots'
+    # The load is recorded in the same transaction as its rows
+    mock_record.assert_called_once()
+    assert mock_record.call_args.args[1][0]['rows'] == 2
+    session.commit.assert_called_once()
+
+@patch('src.etl.backfill.copy_dataframe')
+@patch('src.etl.backfill.get_loaded_snapshots')
+def test_run_backfill_loads_repeated_content_at_new_times(mock_loaded, mock_copy, tmp_path):
+    """Test that a scrape repeating an earlier one's content is still a new snapshot."""
+    earlier = write_file(tmp_path / 'court_availability_20250811_142011.csv', [CURRENT_ROW])
+    write_file(tmp_path / 'court_availability_20250811_152047.csv', [CURRENT_ROW])
+    write_file(tmp_path / 'court_availability_20250811_162047.csv', [CURRENT_ROW])
+    mock_loaded.return_value = {snapshot_key(calculate_file_hash(earlier), snapshot_time_from_filename(earlier))}
+
+    report = run_backfill(str(tmp_path), workers=2, session=MagicMock(), archive_dir=str(tmp_path / 'archive'))
+
+    assert report['files_skipped'] == 1
+    assert report['files_loaded'] == 2
+    snapshot_times = sorted(call.args[0].iloc[0]['snapshot_time'] for call in mock_copy.call_args_list)
+    assert [t[11:19] for t in snapshot_times] == ['15:20:47', '16:20:47']
@@ -2,9 +2,13 @@ import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import os
+import threading
+import time
+from datetime import datetime
 from src.court_availability_finder import (
-    get_availability_data, save_availability_data, main,
-    parse_availability_table
+    get_availability_data, save_availability_data, main, request_with_network_fallback,
+    parse_availability_table, get_park_budget,
+    scrape_parks_pipelined
 )
 
 @patch('requests.get')
@@ -126,4 +130,86 @@ def test_main(mock_get, tmp_path):
     assert str(df.iloc[0]['court_id']) == '12'
     assert df.iloc[0]['court'] == 'Court 1'
     assert df.iloc[0]['status'] == 'Reserve this time'
-    assert df.iloc[0]['reservation_link'] == 'https://www.nycgovparks.org/tennisreservation/reserve/123' 
\ No newline at end of file
+    assert df.iloc[0]['reservation_link'] == 'https://www.nycgovparks.org/tennisreservation/reserve/123' 
+
+@patch('src.court_availability_finder.requests.Session')
+def test_request_with_network_fallback_caps_timeouts_at_deadline(mock_session_cls):
+    """Test that requests never wait past the deadline, and none start after it."""
+    session = mock_session_cls.return_value
+
+    request_with_network_fallback('https://example.com', {}, timeout=30, deadline=time.monotonic() + 5)
+
+    timeouts = [call.kwargs['timeout'] for call in session.get.call_args_list]
+    assert len(timeouts) == 2 and all(0 < timeout <= 5 for timeout in timeouts)
+    with pytest.raises(TimeoutError):
+        request_with_network_fallback('https://example.com', {}, deadline=time.monotonic() - 1)
+
+def test_get_park_budget():
+    """Test splitting the deadline between parks."""
+    assert get_park_budget(40, 300, 4) == 30
+    # Large park counts still get enough time for one attempt
+    assert get_park_budget(1000, 60, 4) == 6
+    # Few parks are capped at a full request timeout per network mode
+    assert get_park_budget(1, 600, 4) == 60
+
+@patch('src.court_availability_finder.fetch_and_capture_page')
+def test_scrape_parks_pipelined_keeps_partial_results_at_deadline(mock_fetch, availability_page_html):
+    """Test that parks unfinished at the deadline are yielded as stale."""
+    park_deadlines = []
+    def fake_fetch(park_id, timeout=None, controller=None, source=None, deadline=None):
+        park_deadlines.append(deadline)
+        if park_id == 'slow':
+            time.sleep(2)
+        if park_id == 'broken':
+            raise RuntimeError("blocked")
+        return availability_page_html, datetime(2026, 8, 12, 9, 0)
+    mock_fetch.side_effect = fake_fetch
+    courts_df = pd.DataFrame({'court_id': ['slow', 'fast', 'broken']})
+
+    started = time.monotonic()
+    results = list(scrape_parks_pipelined(courts_df, fetch_workers=3, parse_workers=1, deadline_seconds=1))
+
+    assert time.monotonic() - started < 2
+    # Each park's requests share a deadline within the run's
+    assert len(park_deadlines) == 3 and all(d is not None and d <= started + 1.1 for d in park_deadlines)
+    assert dict(results)['broken'] is None
+    assert len(dict(results)['fast']) == 2
+    # The cut-off park comes after everything that finished
+    assert results[-1] == ('slow', None)
+
+@patch('src.court_availability_finder.fetch_and_capture_page')
+def test_scrape_parks_pipelined_stops_fetchers_when_closed_early(mock_fetch, availability_page_html):
+    """Test that fetch threads exit instead of blocking on a queue nobody drains."""
+    mock_fetch.return_value = (availability_page_html, datetime(2026, 8, 12, 9, 0))
+    courts_df = pd.DataFrame({'court_id': [str(park_id) for park_id in range(20)]})
+    fetchers = lambda: [t for t in threading.enumerate() if t.name.startswith('scrape-fetch-')]
+
+    scraped = scrape_parks_pipelined(courts_df, fetch_workers=4, parse_workers=1)
+    next(scraped)
+    assert fetchers()
+    scraped.close()
+
+    deadline = time.monotonic() + 2
+    while fetchers() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not fetchers()
+
+@patch('src.court_availability_finder.fetch_and_capture_page')
+def test_scrape_parks_pipelined(mock_fetch, availability_page_html):
+    """Test fetching on threads and parsing in the process pool."""
+    def fake_fetch(park_id, timeout=None, controller=None, source=None, deadline=None):
+        if park_id == 'broken':
+            raise RuntimeError("blocked")
+        if park_id == 'empty':
+            return None, datetime(2026, 8, 12, 9, 0)
+        return availability_page_html, datetime(2026, 8, 12, 9, 0)
+    mock_fetch.side_effect = fake_fetch
+    courts_df = pd.DataFrame({'court_id': ['12', 'broken', 'empty', '13']})
+
+    results = dict(scrape_parks_pipelined(courts_df, fetch_workers=2, parse_workers=1))
+
+    assert results['broken'] is None
+    # An unusable page is a failed fetch, not a park without slots
+    assert results['empty'] is None
+    assert len(results['12']) == 2
+    assert {r['park_id'] for r in results['13']} == {'13'}
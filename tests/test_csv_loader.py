@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+from src.etl.csv_loader import stream_availability_to_staging
+
+def write_raw_file(path, rows):
+    pd.DataFrame([
+        {
+            'park_id': '12',
+            'date': '2025-08-01',
+            'time': f'{hour}:00 a.m.',
+            'court_id': '1',
+            'status': 'Reserve this time',
+            'reservation_link': f'https://www.nycgovparks.org/tennisreservation/reserve/{hour}',
+            'is_available': True
+        }
+        for hour in range(1, rows + 1)
+    ]).to_csv(path, index=False)
+
+@patch('src.etl.csv_loader.copy_dataframe')
+def test_stream_availability_in_chunks(mock_copy, tmp_path):
+    """Test that a raw file is validated and copied one bounded chunk at a time."""
+    file_path = tmp_path / 'court_availability_20250801_090000.csv'
+    write_raw_file(file_path, 5)
+    chunks = []
+    mock_copy.side_effect = lambda df, table, columns, session: chunks.append(df.copy())
+
+    report = stream_availability_to_staging(str(file_path), 7, MagicMock(), chunk_size=2)
+
+    assert report['rows'] == 5
+    assert report['chunks'] == 3
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    # Chunks go straight into the file's own staging partition
+    assert mock_copy.call_args.args[1] == 'staging.court_availability_f7'
+    first = chunks[0]
+    assert first['park_id'].dtype == 'category'
+    assert first['status'].dtype == 'category'
+    assert (first['file_id'] == 7).all()
+    assert str(first['date'].iloc[0]) == '2025-08-01'
+
+@patch('src.etl.csv_loader.copy_dataframe')
+def test_stream_availability_rejects_invalid_chunk(mock_copy, tmp_path):
+    """Test that an invalid chunk stops the load."""
+    file_path = tmp_path / 'court_availability_20250801_090000.csv'
+    write_raw_file(file_path, 3)
+    df = pd.read_csv(file_path)
+    df.loc[2, 'time'] = 'noon'
+    df.to_csv(file_path, index=False)
+
+    with pytest.raises(ValueError, match='Invalid time format'):
+        stream_availability_to_staging(str(file_path), 7, MagicMock(), chunk_size=2)
+
+    assert mock_copy.call_count == 1
+
+@patch('src.etl.csv_loader.copy_dataframe')
+def test_stream_availability_rejects_unavailable_slots(mock_copy, tmp_path):
+    """Test that current-layout files with unavailable slots are rejected, not filtered."""
+    file_path = tmp_path / 'court_availability_20250801_090000.csv'
+    write_raw_file(file_path, 2)
+    df = pd.read_csv(file_path)
+    df.loc[1, 'is_available'] = False
+    df.to_csv(file_path, index=False)
+
+    with pytest.raises(ValueError, match='Found unavailable slots'):
+        stream_availability_to_staging(str(file_path), 7, MagicMock(), chunk_size=2)
+
+    mock_copy.assert_not_called()
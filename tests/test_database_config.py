@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import text
+from src.database import config
+
+@pytest.fixture
+def engine_registry(monkeypatch):
+    """Give each test a fresh engine registry."""
+    for key in ('DB_WRITER_URL', 'DB_READER_URL', 'DB_READER_POOL_SIZE', 'DB_READER_STATEMENT_TIMEOUT_MS'):
+        monkeypatch.delenv(key, raising=False)
+    config.dispose_engines()
+    yield config
+    config.dispose_engines()
+
+def test_reader_and_writer_use_separate_databases(engine_registry, monkeypatch, tmp_path):
+    """Test that reader and writer sessions are routed to their own databases."""
+    monkeypatch.setenv('DB_WRITER_URL', f"sqlite:///{tmp_path / 'writer.db'}")
+    monkeypatch.setenv('DB_READER_URL', f"sqlite:///{tmp_path / 'reader.db'}")
+
+    with engine_registry.get_sessionmaker('writer')() as session:
+        session.execute(text("CREATE TABLE marker (name TEXT)"))
+        session.execute(text("INSERT INTO marker VALUES ('writer')"))
+        session.commit()
+    with engine_registry.ReaderSession() as session:
+        tables = session.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).all()
+    assert tables == []
+
+    # Engines are created once per role and shared
+    assert engine_registry.get_engine('writer') is engine_registry.engine
+    assert engine_registry.get_engine('reader') is not engine_registry.get_engine('writer')
+
+def test_reader_falls_back_to_writer_url(engine_registry, monkeypatch):
+    """Test that one database serves both roles when no reader is configured."""
+    monkeypatch.setenv('DB_WRITER_URL', 'postgresql://etl@primary/nyc_tennis')
+    assert engine_registry.get_engine_settings('reader')['url'] == 'postgresql://etl@primary/nyc_tennis'
+
+@patch('src.database.config.create_engine')
+def test_reader_engine_settings(mock_create_engine, engine_registry, monkeypatch):
+    """Test that the reader gets its own pool, a statement timeout and read-only transactions."""
+    monkeypatch.setenv('DB_READER_URL', 'postgresql://app@replica/nyc_tennis')
+    monkeypatch.setenv('DB_READER_POOL_SIZE', '20')
+    monkeypatch.setenv('DB_READER_STATEMENT_TIMEOUT_MS', '5000')
+
+    engine_registry.get_engine('reader')
+
+    kwargs = mock_create_engine.call_args.kwargs
+    assert str(mock_create_engine.call_args.args[0]) == 'postgresql://app@replica/nyc_tennis'
+    assert kwargs['pool_size'] == 20
+    assert kwargs['pool_pre_ping'] is True
+    assert kwargs['connect_args']['options'] == (
+        '-c statement_timeout=5000 -c default_transaction_read_only=on'
+    )
+
+def test_unknown_role(engine_registry):
+    with pytest.raises(ValueError):
+        engine_registry.get_engine('analytics')
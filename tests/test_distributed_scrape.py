@@ -0,0 +1,141 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import threading
+import time
+from types import SimpleNamespace
+import pandas as pd
+from src.database.models import DwhTennisCourt, ScrapeLease, StagingCourtAvailability
+from src.etl.distributed_scrape import (
+    MAX_LEASE_ATTEMPTS, claim_leases, complete_lease, finalize_run, run_worker, start_run
+)
+
+def make_records(park_id):
+    return [{
+        'park_id': park_id,
+        'date': '2025-08-01',
+        'time': '9:00 a.m.',
+        'court_id': '1',
+        'status': 'Reserve this time',
+        'reservation_link': 'https://www.nycgovparks.org/tennisreservation/reserve/1',
+        'is_available': True
+    }]
+
+@patch('src.etl.distributed_scrape.mark_stale')
+def test_claim_leases_gives_up_on_exhausted_parks(mock_mark_stale):
+    """Test that a park past MAX_LEASE_ATTEMPTS is failed instead of claimed."""
+    fresh = SimpleNamespace(park_id='12', attempts=0, status='pending', error=None)
+    exhausted = SimpleNamespace(park_id='13', attempts=MAX_LEASE_ATTEMPTS, status='leased', error=None)
+    session = MagicMock()
+    query = session.query.return_value.filter.return_value.order_by.return_value.limit.return_value
+    query.with_for_update.return_value.all.return_value = [fresh, exhausted]
+
+    claimed = claim_leases(session, 1, 'worker-a')
+
+    assert claimed == ['12']
+    query.with_for_update.assert_called_once_with(skip_locked=True)
+    assert (fresh.status, fresh.worker_id, fresh.attempts) == ('leased', 'worker-a', 1)
+    # Expiry is computed by the database, not the worker's clock
+    assert str(fresh.lease_expires_at).startswith('now() +')
+    assert exhausted.status == 'failed'
+    mock_mark_stale.assert_called_once_with('13', session)
+    session.commit.assert_called_once()
+
+@patch('src.etl.distributed_scrape.bulk_load_availability')
+@patch('src.etl.distributed_scrape._held_lease')
+def test_complete_lease_discards_lost_lease(mock_held_lease, mock_bulk_load):
+    """Test that records for a lease claimed by another worker are not staged."""
+    mock_held_lease.return_value = None
+    session = MagicMock()
+
+    assert complete_lease(session, 1, '12', 'worker-a', make_records('12')) is False
+    mock_bulk_load.assert_not_called()
+    session.rollback.assert_called_once()
+
+@patch('src.etl.distributed_scrape.release_lease')
+@patch('src.etl.distributed_scrape.complete_lease')
+@patch('src.etl.distributed_scrape.get_availability_data')
+@patch('src.etl.distributed_scrape.claim_leases')
+def test_run_worker_drains_queue(mock_claim, mock_get_data, mock_complete, mock_release):
+    """Test that a worker keeps claiming until the queue is empty."""
+    mock_claim.side_effect = [['12', '13'], ['14', '15'], []]
+    mock_get_data.side_effect = [make_records('12'), RuntimeError("blocked"), make_records('14'), None]
+    mock_complete.return_value = True
+    session = MagicMock()
+
+    report = run_worker(1, worker_id='worker-a', session=session)
+
+    assert report['parks_done'] == 2
+    assert report['parks_failed'] == 2
+    assert report['rows'] == 2
+    # Unusable pages go back to the queue instead of being recorded as empty
+    assert [call.args[2] for call in mock_release.call_args_list] == ['13', '15']
+    assert mock_complete.call_count == 2
+    session.close.assert_not_called()
+
+@patch('src.etl.distributed_scrape.update_file_status')
+@patch('src.etl.distributed_scrape.run_worker')
+@patch('src.etl.distributed_scrape.get_lease_counts')
+def test_finalize_run_only_takes_over_expired_leases(mock_counts, mock_run_worker, mock_update_status):
+    """Test that the coordinator claims only expired leases and stops at its timeout."""
+    mock_counts.return_value = {'pending': 2, 'leased': 1}
+    mock_run_worker.return_value = {'parks_done': 0}
+    session = MagicMock()
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        finalize_run(1, session, timeout_seconds=0.1)
+
+    # Polling sleeps are cut short by the timeout
+    assert time.monotonic() - started < 1
+    kwargs = mock_run_worker.call_args.kwargs
+    assert kwargs['expired_only'] is True
+    assert kwargs['deadline'] <= started + 0.2
+    mock_update_status.assert_called_once_with(1, 'failed', session)
+
+@patch('src.etl.distributed_scrape.release_lease')
+@patch('src.etl.distributed_scrape.get_availability_data')
+@patch('src.etl.distributed_scrape.claim_leases')
+def test_run_worker_releases_parks_past_its_deadline(mock_claim, mock_get_data, mock_release):
+    """Test that claimed parks are handed back once the deadline passes."""
+    mock_claim.return_value = ['12', '13']
+    session = MagicMock()
+
+    report = run_worker(1, worker_id='worker-a', session=session, expired_only=True,
+                        deadline=time.monotonic() - 1)
+
+    mock_claim.assert_not_called()
+    mock_get_data.assert_not_called()
+    assert report['parks_done'] == 0
+
+def test_concurrent_workers_claim_each_park_once(test_db, db_session):
+    """Test workers on separate connections splitting one run without overlap."""
+    park_ids = [str(i) for i in range(1, 9)]
+    for park_id in park_ids:
+        db_session.add(DwhTennisCourt(park_id=park_id, park_name=f'Park {park_id}'))
+    db_session.commit()
+    file_id = start_run(db_session, pd.DataFrame({'court_id': park_ids}))
+
+    scraped = []
+    def fake_get_data(park_id, **kwargs):
+        scraped.append(park_id)
+        return make_records(park_id)
+
+    reports = []
+    def worker():
+        session = test_db.Session()
+        try:
+            reports.append(run_worker(file_id, batch_size=1, session=session))
+        finally:
+            session.close()
+
+    with patch('src.etl.distributed_scrape.get_availability_data', side_effect=fake_get_data):
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(scraped) == sorted(park_ids)
+    assert sum(report['parks_done'] for report in reports) == len(park_ids)
+    assert db_session.query(ScrapeLease).filter_by(file_id=file_id, status='done').count() == len(park_ids)
+    assert db_session.query(StagingCourtAvailability).filter_by(file_id=file_id).count() == len(park_ids)
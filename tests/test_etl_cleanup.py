@@ -176,6 +176,32 @@ def test_cleanup_failed_files(db_session):
             if os.path.exists(file_path):
                 os.unlink(file_path)
 
+def test_cleanup_archived_files(db_session):
+    """Test that archived registry rows are dropped after their retention period."""
+    old_archived = FileRegistry(
+        filename='court_availability_20250101_090000.csv',
+        filepath='/missing/court_availability_20250101_090000.csv',
+        file_hash='a' * 64,
+        status='archived',
+        archive_path='/archive/2025-01-01.parquet',
+        load_timestamp=datetime.now() - timedelta(days=91)
+    )
+    recent_archived = FileRegistry(
+        filename='court_availability_20250301_090000.csv',
+        filepath='/missing/court_availability_20250301_090000.csv',
+        file_hash='b' * 64,
+        status='archived',
+        archive_path='/archive/2025-03-01.parquet',
+        load_timestamp=datetime.now() - timedelta(days=30)
+    )
+    db_session.add_all([old_archived, recent_archived])
+    db_session.commit()
+
+    cleanup_processed_files(db_session, days_threshold=7, archived_days_threshold=90)
+
+    filenames = [f.filename for f in db_session.query(FileRegistry).all()]
+    assert filenames == ['court_availability_20250301_090000.csv']
+
 def test_cleanup_with_transaction_rollback(db_session):
     """Test cleanup process handles transaction rollback correctly."""
     # Set up a court
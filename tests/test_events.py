@@ -0,0 +1,40 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from src.etl.events import ETL_EVENTS_CHANNEL, notify_event, publish_progress
+
+def test_notify_event_sends_json_payload():
+    """Test that an event is queued on the connection as a JSON notification."""
+    connection = MagicMock()
+
+    notify_event(connection, 'published', version=42, changes=17)
+
+    statement, params = connection.execute.call_args.args
+    assert 'pg_notify' in str(statement)
+    assert params['channel'] == ETL_EVENTS_CHANNEL
+    assert json.loads(params['payload']) == {'type': 'published', 'version': 42, 'changes': 17}
+    connection.commit.assert_not_called()
+
+def test_notify_event_rejects_oversized_payload():
+    """Test that payloads Postgres would reject fail before reaching it."""
+    with pytest.raises(ValueError):
+        notify_event(MagicMock(), 'progress', error='x' * 8000)
+
+@patch('src.etl.events.get_engine')
+def test_publish_progress_commits_right_away(mock_get_engine):
+    """Test that progress is sent on its own connection and committed immediately."""
+    connection = mock_get_engine.return_value.connect.return_value.__enter__.return_value
+
+    publish_progress(7, 'staging', rows=1500)
+
+    mock_get_engine.assert_called_once_with('writer')
+    payload = json.loads(connection.execute.call_args.args[1]['payload'])
+    assert payload == {'type': 'progress', 'run': 7, 'stage': 'staging', 'rows': 1500}
+    connection.commit.assert_called_once()
+
+@patch('src.etl.events.get_engine')
+def test_publish_progress_never_fails_the_run(mock_get_engine):
+    """Test that an unreachable database only skips the progress event."""
+    mock_get_engine.return_value.connect.side_effect = Exception('connection refused')
+
+    publish_progress(7, 'merging')
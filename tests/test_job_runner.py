@@ -0,0 +1,176 @@
+import pytest
+from unittest.mock import patch, MagicMock, ANY
+from src.etl import job_runner
+from src.etl.job_runner import (
+    submit_job, execute_job, attach_to_active_job, wait_for_job
+)
+
+@patch('src.etl.job_runner.attach_to_active_job')
+@patch('src.etl.job_runner.execute_job')
+@patch('src.etl.job_runner.try_acquire_etl_lock')
+@patch('src.etl.job_runner.engine')
+@patch('src.etl.job_runner.SessionLocal')
+def test_submit_job_attaches_when_lock_is_held(
+    mock_session_local, mock_engine, mock_try_lock, mock_execute, mock_attach
+):
+    """Test that a second request attaches to the running job."""
+    mock_try_lock.return_value = False
+    mock_attach.return_value = 42
+
+    job_id, started = submit_job('refresh')
+
+    assert (job_id, started) == (42, False)
+    mock_attach.assert_called_once_with(mock_session_local.return_value, 'refresh')
+    mock_execute.assert_not_called()
+    mock_engine.connect.return_value.close.assert_called_once()
+
+@patch('src.etl.job_runner.time.sleep')
+@patch('src.etl.job_runner.release_etl_lock')
+@patch('src.etl.job_runner.attach_to_active_job')
+@patch('src.etl.job_runner.execute_job')
+@patch('src.etl.job_runner.try_acquire_etl_lock')
+@patch('src.etl.job_runner.engine')
+@patch('src.etl.job_runner.SessionLocal')
+def test_submit_job_waits_for_other_job_type(
+    mock_session_local, mock_engine, mock_try_lock, mock_execute, mock_attach, mock_release, mock_sleep
+):
+    """Test that a request doesn't attach to a job of another type, but runs after it."""
+    mock_try_lock.side_effect = [False, False, True]
+    mock_attach.return_value = None
+    mock_execute.return_value = MagicMock(id=8)
+
+    job_id, started = submit_job('refresh')
+
+    assert (job_id, started) == (8, True)
+    assert mock_try_lock.call_count == 3
+    mock_execute.assert_called_once_with('refresh', mock_session_local.return_value, ANY)
+    mock_release.assert_called_once_with(mock_engine.connect.return_value)
+
+@patch('src.etl.job_runner.release_etl_lock')
+@patch('src.etl.job_runner.execute_job')
+@patch('src.etl.job_runner.try_acquire_etl_lock')
+@patch('src.etl.job_runner.engine')
+@patch('src.etl.job_runner.SessionLocal')
+def test_submit_job_runs_and_releases_lock(
+    mock_session_local, mock_engine, mock_try_lock, mock_execute, mock_release
+):
+    """Test that the lock holder runs the job and releases the lock."""
+    mock_try_lock.return_value = True
+    mock_execute.return_value = MagicMock(id=7)
+
+    job_id, started = submit_job('availability')
+
+    assert (job_id, started) == (7, True)
+    mock_execute.assert_called_once_with('availability', mock_session_local.return_value, ANY)
+    mock_release.assert_called_once_with(mock_engine.connect.return_value)
+
+@patch('src.etl.job_runner.time')
+@patch('src.etl.job_runner.attach_to_active_job')
+@patch('src.etl.job_runner.execute_job')
+@patch('src.etl.job_runner.try_acquire_etl_lock')
+@patch('src.etl.job_runner.engine')
+@patch('src.etl.job_runner.SessionLocal')
+def test_submit_job_gives_up_waiting_for_lock(
+    mock_session_local, mock_engine, mock_try_lock, mock_execute, mock_attach, mock_time
+):
+    """Test that a request stops waiting for another job type after the lock wait timeout."""
+    mock_try_lock.return_value = False
+    mock_attach.return_value = None
+    mock_time.monotonic.side_effect = [0, 60, job_runner.LOCK_WAIT_TIMEOUT_SECONDS]
+
+    with pytest.raises(TimeoutError):
+        submit_job('refresh')
+
+    assert mock_try_lock.call_count == 2
+    mock_execute.assert_not_called()
+    mock_engine.connect.return_value.close.assert_called_once()
+
+@patch('src.etl.job_runner.time')
+@patch('src.etl.job_runner.release_etl_lock')
+@patch('src.etl.job_runner.attach_to_active_job')
+@patch('src.etl.job_runner.execute_job')
+@patch('src.etl.job_runner.try_acquire_etl_lock')
+@patch('src.etl.job_runner.engine')
+@patch('src.etl.job_runner.SessionLocal')
+def test_submit_job_deadline_starts_at_submission(
+    mock_session_local, mock_engine, mock_try_lock, mock_execute, mock_attach, mock_release, mock_time
+):
+    """Test that time spent waiting for the lock comes out of the job's deadline."""
+    mock_try_lock.side_effect = [False, True]
+    mock_attach.return_value = None
+    mock_time.monotonic.side_effect = [1000, 1090]
+    mock_execute.return_value = MagicMock(id=9)
+
+    submit_job('refresh')
+
+    mock_execute.assert_called_once_with(
+        'refresh', mock_session_local.return_value, 1000 + job_runner.REFRESH_DEADLINE_SECONDS
+    )
+
+@patch('src.etl.job_runner.remaining_seconds')
+@patch('src.etl.pipeline.run_pipeline')
+def test_refresh_scrapes_until_the_deadline(mock_run_pipeline, mock_remaining):
+    """Test that a refresh gets only what is left of its deadline."""
+    mock_remaining.return_value = 380.0
+
+    job_runner._run_refresh(deadline=1480)
+
+    mock_remaining.assert_called_once_with(1480)
+    mock_run_pipeline.assert_called_once_with(deadline_seconds=380.0, swap=True)
+
+def test_submit_job_invalid_type():
+    """Test submitting an unknown job type."""
+    with pytest.raises(ValueError):
+        submit_job('invalid')
+
+@patch('src.etl.job_runner.reap_orphaned_jobs')
+def test_execute_job_records_failure(mock_reap):
+    """Test that a failing job is recorded instead of raised."""
+    session = MagicMock()
+    failing = MagicMock(side_effect=RuntimeError("scrape failed"))
+
+    with patch.dict(job_runner.JOB_TYPES, {'refresh': failing}):
+        job = execute_job('refresh', session)
+
+    assert job.status == 'failed'
+    assert job.error == 'scrape failed'
+    assert job.finished_at is not None
+    mock_reap.assert_called_once_with(session)
+
+@patch('src.etl.job_runner.reap_orphaned_jobs')
+def test_execute_job_records_details(mock_reap):
+    """Test that a successful job stores its result summary."""
+    session = MagicMock()
+
+    with patch.dict(job_runner.JOB_TYPES, {'scrape': lambda: {'file_path': 'a.csv'}}):
+        job = execute_job('scrape', session)
+
+    assert job.status == 'succeeded'
+    assert job.details == '{"file_path": "a.csv"}'
+
+@patch('src.etl.job_runner.time.sleep')
+@patch('src.etl.job_runner.get_active_job')
+def test_attach_waits_for_job_record(mock_get_active, mock_sleep):
+    """Test attaching while the lock holder is still recording its job."""
+    job = MagicMock(id=3, attached_requests=0)
+    mock_get_active.side_effect = [None, job]
+
+    session = MagicMock()
+    assert attach_to_active_job(session, 'refresh') == 3
+    assert job.attached_requests == 1
+    mock_get_active.assert_called_with(session, 'refresh')
+    mock_sleep.assert_called_once()
+
+@patch('src.etl.job_runner.time.sleep')
+@patch('src.etl.job_runner.get_job_status')
+def test_wait_for_job(mock_get_status, mock_sleep):
+    """Test polling a job until it finishes."""
+    mock_get_status.side_effect = [
+        {'job_id': 1, 'status': 'running'},
+        {'job_id': 1, 'status': 'succeeded'},
+    ]
+
+    status = wait_for_job(1)
+
+    assert status['status'] == 'succeeded'
+    assert mock_get_status.call_count == 2
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import patch
+import os
+from datetime import datetime
+from src.court_availability_finder import get_available_dates
+from src.etl.replay_captures import replay_captures
+from src.page_capture import CaptureStore
+
+def test_save_deduplicates_pages(tmp_path, availability_page_html):
+    """Test that identical pages are stored once but every fetch is recorded."""
+    store = CaptureStore(tmp_path)
+    first = store.save('12', availability_page_html, datetime(2026, 8, 12, 9, 0))
+    second = store.save('12', availability_page_html, datetime(2026, 8, 12, 10, 0))
+
+    assert first == second
+    assert store.load(first) == availability_page_html
+    assert len(os.listdir(os.path.dirname(store.page_path(first)))) == 1
+    assert [entry['fetched_at'] for entry in store.iter_captures()] == [
+        '2026-08-12T09:00:00', '2026-08-12T10:00:00'
+    ]
+
+def test_iter_captures_filters(tmp_path, availability_page_html):
+    """Test filtering captures by day and park."""
+    store = CaptureStore(tmp_path)
+    store.save('12', availability_page_html, datetime(2026, 8, 11, 9, 0))
+    store.save('13', availability_page_html + ' ', datetime(2026, 8, 12, 9, 0))
+
+    assert [e['park_id'] for e in store.iter_captures(start_date=datetime(2026, 8, 12).date())] == ['13']
+    assert [e['park_id'] for e in store.iter_captures(park_ids={'12'})] == ['12']
+
+def test_get_available_dates_uses_fetch_year(availability_page_html):
+    """Test that short date tabs take their year from the fetch time."""
+    dates = get_available_dates(availability_page_html, today=datetime(2026, 8, 12))
+    assert dates == {'day1': '2026-08-12', 'day2': '2026-08-13'}
+
+    # Tabs that run past New Year belong to the next year
+    dates = get_available_dates(
+        '<a data-toggle="tab" href="#d">Fri01/02</a>', today=datetime(2026, 12, 30)
+    )
+    assert dates == {'d': '2027-01-02'}
+
+def test_replay_captures(tmp_path, availability_page_html):
+    """Test re-parsing a capture set offline."""
+    store = CaptureStore(tmp_path)
+    store.save('12', availability_page_html, datetime(2026, 8, 12, 9, 0))
+
+    with patch('requests.Session') as mock_session:
+        records, summary = replay_captures(str(tmp_path), workers=1)
+        mock_session.assert_not_called()
+
+    assert summary['pages'] == 1
+    assert summary['records'] == 2
+    assert {(r['park_id'], r['date'], r['time']) for r in records} == {
+        ('12', '2026-08-12', '9:00 a.m.'), ('12', '2026-08-13', '10:00 a.m.')
+    }
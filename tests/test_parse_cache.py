@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from src import court_availability_finder
+from src.court_availability_finder import parse_availability_page
+from src.parse_cache import ParseCache
+
+FETCHED_AT = datetime(2026, 8, 12, 9, 0)
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path, parser_version=1)
+
+def test_unchanged_page_skips_parsing(cache, availability_page_html):
+    """Test that a byte-identical page reuses the cached records."""
+    first = parse_availability_page(availability_page_html, '12', FETCHED_AT, cache)
+
+    with patch.object(court_availability_finder, 'get_available_dates') as mock_dates:
+        second = parse_availability_page(availability_page_html, '12', FETCHED_AT, cache)
+
+    mock_dates.assert_not_called()
+    assert second == first
+
+def test_unchanged_page_resolves_dates_again_on_a_new_day(cache, availability_page_html):
+    """Test that a page cached on one day isn't reused with that day's dates on another."""
+    parse_availability_page(availability_page_html, '12', FETCHED_AT, cache)
+
+    with patch.object(
+        court_availability_finder, 'parse_availability_table',
+        wraps=court_availability_finder.parse_availability_table
+    ) as mock_parse:
+        records = parse_availability_page(availability_page_html, '12', FETCHED_AT.replace(year=2027), cache)
+
+    # The tabs resolve to the new year's dates, but the panes still come from the cache
+    mock_parse.assert_not_called()
+    assert {r['date'] for r in records} == {'2027-08-12', '2027-08-13'}
+
+def test_only_changed_panes_are_parsed(cache, availability_page_html):
+    """Test that panes whose HTML did not change are not parsed again."""
+    parse_availability_page(availability_page_html, '12', FETCHED_AT, cache)
+    changed = availability_page_html.replace('10:00 a.m.', '11:00 a.m.')
+
+    with patch.object(
+        court_availability_finder, 'parse_availability_table',
+        wraps=court_availability_finder.parse_availability_table
+    ) as mock_parse:
+        records = parse_availability_page(changed, '12', FETCHED_AT, cache)
+
+    assert mock_parse.call_count == 1
+    assert {(r['date'], r['time']) for r in records} == {
+        ('2026-08-12', '9:00 a.m.'), ('2026-08-13', '11:00 a.m.')
+    }
+    assert all(r['park_id'] == '12' for r in records)
+
+def test_parser_version_change_invalidates_cache(tmp_path):
+    """Test that entries written by another parser version are ignored."""
+    ParseCache(tmp_path, parser_version=1).put('12', 'abc', '2026-08-12', [], {})
+
+    assert ParseCache(tmp_path, parser_version=1).get('12') is not None
+    assert ParseCache(tmp_path, parser_version=2).get('12') is None
@@ -0,0 +1,176 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import hashlib
+import pandas as pd
+from src.etl.pipeline import run_pipeline
+
+def make_records(park_id, count):
+    """Build scraped records for one park."""
+    return [
+        {
+            'park_id': park_id,
+            'date': '2025-08-01',
+            'time': f'{hour}:00 a.m.',
+            'court_id': '1',
+            'status': 'Reserve this time',
+            'reservation_link': f'https://www.nycgovparks.org/tennisreservation/reserve/{hour}',
+            'is_available': True
+        }
+        for hour in range(1, count + 1)
+    ]
+
+@pytest.fixture(autouse=True)
+def mock_record_scrape():
+    with patch('src.etl.pipeline.record_scrape') as mock:
+        yield mock
+
+@pytest.fixture(autouse=True)
+def mock_progress():
+    with patch('src.etl.pipeline.publish_progress') as mock:
+        yield mock
+
+@pytest.fixture
+def courts_df():
+    return pd.DataFrame([
+        {'court_id': '12', 'park_name': 'Park A'},
+        {'court_id': '13', 'park_name': 'Park B'},
+    ])
+
+@patch('src.etl.pipeline.update_file_status')
+@patch('src.etl.pipeline.drop_availability_staging')
+@patch('src.etl.pipeline.create_availability_staging')
+@patch('src.etl.pipeline.merge_availability_to_dwh')
+@patch('src.etl.pipeline.scrape_parks_pipelined')
+@patch('src.etl.pipeline.Session')
+@patch('src.etl.pipeline.engine')
+def test_run_pipeline_streams_batches(
+    mock_engine, mock_session_cls, mock_scrape, mock_merge, mock_create_staging, mock_drop_staging,
+    mock_update_status, courts_df, tmp_path, mock_progress
+):
+    """Test that scraped records are staged in batches and archived once."""
+    session = mock_session_cls.return_value
+    session.add.side_effect = lambda record: setattr(record, 'id', 1)
+    mock_scrape.return_value = iter([('12', make_records('12', 3)), ('13', make_records('13', 2))])
+
+    summary = run_pipeline(batch_size=3, courts_df=courts_df, output_dir=str(tmp_path))
+
+    # One connection is shared by every step
+    mock_engine.connect.assert_called_once()
+    mock_session_cls.assert_called_once_with(bind=mock_engine.connect.return_value)
+
+    # Two staging batches: 3 rows, then the remaining 2
+    assert session.execute.call_count == 2
+    assert [len(call.args[1]) for call in session.execute.call_args_list] == [3, 2]
+    mock_create_staging.assert_called_once_with(1, session)
+    mock_merge.assert_called_once_with(session, 1, export=True)
+    mock_drop_staging.assert_called_once_with(1, session)
+    mock_update_status.assert_called_once_with(1, 'processed', session)
+    assert [call.args[1] for call in mock_progress.call_args_list] == [
+        'scraping', 'staging', 'staging', 'merging', 'completed'
+    ]
+
+    # The archive is a normal raw file with a single header
+    df = pd.read_csv(summary['file_path'])
+    assert len(df) == 5
+    assert summary['rows'] == 5
+    file_record = session.add.call_args.args[0]
+    with open(summary['file_path'], 'rb') as f:
+        assert file_record.file_hash == hashlib.sha256(f.read()).hexdigest()
+
+@patch('src.etl.pipeline.update_file_status')
+@patch('src.etl.pipeline.drop_availability_staging')
+@patch('src.etl.pipeline.create_availability_staging')
+@patch('src.etl.pipeline.merge_availability_to_dwh')
+@patch('src.etl.pipeline.scrape_parks_pipelined')
+@patch('src.etl.pipeline.Session')
+@patch('src.etl.pipeline.engine')
+def test_run_pipeline_without_archive(
+    mock_engine, mock_session_cls, mock_scrape, mock_merge, mock_create_staging, mock_drop_staging,
+    mock_update_status, courts_df, tmp_path
+):
+    """Test running the pipeline without writing the CSV archive."""
+    mock_session_cls.return_value.add.side_effect = lambda record: setattr(record, 'id', 1)
+    mock_scrape.return_value = iter([('12', make_records('12', 2))])
+
+    summary = run_pipeline(archive_csv=False, courts_df=courts_df, output_dir=str(tmp_path))
+
+    assert summary['file_path'] is None
+    assert list(tmp_path.iterdir()) == []
+    mock_merge.assert_called_once()
+
+@patch('src.etl.pipeline.update_file_status')
+@patch('src.etl.pipeline.drop_availability_staging')
+@patch('src.etl.pipeline.create_availability_staging')
+@patch('src.etl.pipeline.merge_availability_to_dwh')
+@patch('src.etl.pipeline.scrape_parks_pipelined')
+@patch('src.etl.pipeline.Session')
+@patch('src.etl.pipeline.engine')
+def test_run_pipeline_invalid_data(
+    mock_engine, mock_session_cls, mock_scrape, mock_merge, mock_create_staging, mock_drop_staging,
+    mock_update_status, courts_df, tmp_path
+):
+    """Test that invalid records fail the run and remove the partial archive."""
+    mock_session_cls.return_value.add.side_effect = lambda record: setattr(record, 'id', 1)
+    records = make_records('12', 1)
+    records[0]['time'] = 'not a time'
+    mock_scrape.return_value = iter([('12', records)])
+
+    with pytest.raises(ValueError):
+        run_pipeline(courts_df=courts_df, output_dir=str(tmp_path))
+
+    mock_merge.assert_not_called()
+    mock_update_status.assert_called_once_with(1, 'failed', mock_session_cls.return_value)
+    assert list(tmp_path.iterdir()) == []
+
+@patch('src.etl.pipeline.update_file_status')
+@patch('src.etl.pipeline.drop_availability_staging')
+@patch('src.etl.pipeline.create_availability_staging')
+@patch('src.etl.pipeline.merge_availability_to_dwh')
+@patch('src.etl.pipeline.select_parks')
+@patch('src.etl.pipeline.scrape_parks_pipelined')
+@patch('src.etl.pipeline.Session')
+@patch('src.etl.pipeline.engine')
+def test_run_pipeline_adaptive(
+    mock_engine, mock_session_cls, mock_scrape, mock_select, mock_merge, mock_create_staging, mock_drop_staging,
+    mock_update_status, courts_df, tmp_path, mock_record_scrape
+):
+    """Test that an adaptive run only scrapes the scheduled parks and records failures as skipped."""
+    mock_session_cls.return_value.add.side_effect = lambda record: setattr(record, 'id', 1)
+    mock_select.return_value = ['13']
+    mock_scrape.return_value = iter([('13', make_records('13', 1))])
+
+    summary = run_pipeline(courts_df=courts_df, output_dir=str(tmp_path), adaptive=True, request_budget=2)
+
+    scraped_df = mock_scrape.call_args.args[0]
+    assert scraped_df['court_id'].tolist() == ['13']
+    assert summary['parks'] == 1
+    mock_record_scrape.assert_called_once()
+    assert mock_record_scrape.call_args.args[0] == '13'
+
+@patch('src.etl.pipeline.update_file_status')
+@patch('src.etl.pipeline.drop_availability_staging')
+@patch('src.etl.pipeline.create_availability_staging')
+@patch('src.etl.pipeline.merge_availability_to_dwh')
+@patch('src.etl.pipeline.rank_parks')
+@patch('src.etl.pipeline.mark_stale')
+@patch('src.etl.pipeline.scrape_parks_pipelined')
+@patch('src.etl.pipeline.Session')
+@patch('src.etl.pipeline.engine')
+def test_run_pipeline_deadline_marks_stale_parks(
+    mock_engine, mock_session_cls, mock_scrape, mock_mark_stale, mock_rank, mock_merge, mock_create_staging,
+    mock_drop_staging, mock_update_status, courts_df, tmp_path
+):
+    """Test that a deadline run scrapes in priority order, loads what finished and marks the rest stale."""
+    session = mock_session_cls.return_value
+    session.add.side_effect = lambda record: setattr(record, 'id', 1)
+    mock_rank.return_value = ['13', '12']
+    mock_scrape.return_value = iter([('12', make_records('12', 2)), ('13', None)])
+
+    summary = run_pipeline(courts_df=courts_df, output_dir=str(tmp_path), deadline_seconds=60)
+
+    assert mock_scrape.call_args.args[0]['court_id'].tolist() == ['13', '12']
+    assert mock_scrape.call_args.kwargs['deadline_seconds'] == 60
+    mock_mark_stale.assert_called_once_with('13', session)
+    assert summary['stale_parks'] == ['13']
+    assert summary['rows'] == 2
+    mock_update_status.assert_called_once_with(1, 'processed', session)
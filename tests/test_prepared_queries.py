@@ -0,0 +1,51 @@
+from datetime import date
+from unittest.mock import MagicMock
+from src.database.prepared_queries import (
+    PREPARED_STATEMENTS, ensure_prepared, execute_prepared, prepare_statements, to_positional
+)
+
+def test_to_positional_leaves_casts_alone():
+    """Test that named parameters become $n placeholders without touching :: casts."""
+    sql = "SELECT x::text FROM t WHERE a = :park_id AND b = :date AND c = :park_id"
+    assert to_positional(sql, [('park_id', 'text'), ('date', 'date')]) == (
+        "SELECT x::text FROM t WHERE a = $1 AND b = $2 AND c = $1"
+    )
+
+def test_prepare_statements():
+    """Test that every hot query is prepared with typed parameters."""
+    dbapi_connection = MagicMock()
+    cursor = dbapi_connection.cursor.return_value
+
+    prepare_statements(dbapi_connection)
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert len(statements) == len(PREPARED_STATEMENTS)
+    park_slots = next(sql for sql in statements if sql.startswith('PREPARE park_slots'))
+    assert park_slots.startswith('PREPARE park_slots (text, date) AS')
+    assert 'tc.park_id = $1' in park_slots and 's.date = $2' in park_slots
+    assert ':park_id' not in park_slots
+
+def test_ensure_prepared_once_per_pooled_connection():
+    """Test that a pooled connection is only prepared the first time it is used."""
+    connection = MagicMock()
+    connection.connection.info = {}
+    cursor = connection.connection.dbapi_connection.cursor.return_value
+
+    ensure_prepared(connection)
+    ensure_prepared(connection)
+
+    assert cursor.execute.call_count == len(PREPARED_STATEMENTS)
+    assert connection.connection.info['prepared_statements'] is True
+
+def test_execute_prepared_binds_parameters_in_order():
+    """Test that EXECUTE passes the statement's parameters positionally."""
+    connection = MagicMock()
+    connection.connection.info = {'prepared_statements': True}
+    connection.execute.return_value.mappings.return_value = [{'court_id': '1'}]
+
+    rows = execute_prepared(connection, 'park_slots', {'date': date(2025, 8, 1), 'park_id': 'M1'})
+
+    statement, values = connection.execute.call_args.args
+    assert str(statement) == 'EXECUTE park_slots(:park_id, :date)'
+    assert values == {'park_id': 'M1', 'date': date(2025, 8, 1)}
+    assert rows == [{'court_id': '1'}]
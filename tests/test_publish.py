@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.etl.publish import _swap, publish_availability, PREV_SUFFIX, NEXT_SUFFIX
+
+def executed_sql(connection):
+    return [str(call.args[0]) for call in connection.execute.call_args_list]
+
+def test_swap_renames_tables_and_indexes_then_rebinds_view():
+    """Test that a publish swap renames every index with its table and rebinds the view."""
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = 'dwh.court_availability_slots_id_seq'
+
+    _swap(connection, [('', PREV_SUFFIX), (NEXT_SUFFIX, '')], drop_prev=True)
+
+    sql = executed_sql(connection)
+    renames = [statement for statement in sql if 'RENAME' in statement]
+    assert renames[0] == "ALTER TABLE dwh.court_availability_slots RENAME TO court_availability_slots_prev"
+    assert "ALTER TABLE dwh.court_availability_slots_next RENAME TO court_availability_slots" in renames
+    assert "ALTER INDEX dwh.uq_court_availability_slots_next RENAME TO uq_court_availability_slots" in renames
+    assert len(renames) == 8
+    assert sql.index("DROP TABLE IF EXISTS dwh.court_availability_slots_prev") < sql.index(renames[0])
+    assert "OWNED BY dwh.court_availability_slots.id" in sql[-2]
+    assert 'CREATE OR REPLACE VIEW dwh.court_availability' in sql[-1]
+
+def test_swap_runs_then_in_the_same_transaction():
+    """Test that work passed to the swap runs after the renames and returns its result."""
+    connection = MagicMock()
+    then = MagicMock(return_value={'version': 4})
+
+    result = _swap(connection, [('', PREV_SUFFIX), (NEXT_SUFFIX, '')], drop_prev=True, then=then)
+
+    assert result == {'version': 4}
+    then.assert_called_once_with(connection)
+    connection.begin.assert_called_once()
+
+@patch('src.etl.publish.time.sleep')
+def test_swap_retries_on_lock_timeout(mock_sleep):
+    """Test that a swap blocked by a long-running reader is retried."""
+    connection = MagicMock()
+    timeout = OperationalError('ALTER TABLE', {}, Exception('canceling statement due to lock timeout'))
+    calls = {'n': 0}
+
+    def execute(statement, *args):
+        calls['n'] += 1
+        if calls['n'] == 4:
+            raise timeout
+        return MagicMock()
+    connection.execute.side_effect = execute
+
+    _swap(connection, [('', PREV_SUFFIX), (NEXT_SUFFIX, '')], drop_prev=True)
+
+    assert connection.begin.call_count == 2
+    mock_sleep.assert_called_once_with(1)
+
+@patch('src.etl.publish.export_published')
+@patch('src.etl.publish._swap')
+@patch('src.etl.publish.build_next_availability')
+def test_publish_availability_holds_write_lock(mock_build, mock_swap, mock_export):
+    """Test that the write lock is held from the build through the swap and then released."""
+    session = MagicMock()
+    connection = session.get_bind.return_value.engine.connect.return_value.__enter__.return_value
+    mock_build.return_value = 10
+
+    report = publish_availability(session, 7)
+
+    session.commit.assert_called_once()
+    mock_build.assert_called_once_with(connection, 7)
+    assert mock_swap.call_args.args == (connection, [('', PREV_SUFFIX), (NEXT_SUFFIX, '')])
+    assert mock_swap.call_args.kwargs['drop_prev'] is True
+    # The read model is refreshed inside the swap transaction
+    with patch('src.etl.publish.refresh_park_days') as mock_refresh:
+        mock_swap.call_args.kwargs['then'](connection)
+    mock_refresh.assert_called_once_with(connection, 7)
+    sql = executed_sql(connection)
+    assert 'pg_advisory_lock' in sql[0]
+    assert 'pg_advisory_unlock' in sql[-1]
+    assert report['slots'] == 10
+    # The published version is exported once the lock is released
+    mock_export.assert_called_once_with(connection, True)
+
+def test_publish_and_rollback_swap_tables(test_db, db_session):
+    """Test that published tables are swapped in and back without losing the view."""
+    from datetime import date, timedelta
+    from src.database.models import DwhTennisCourt, DwhCourtAvailability
+    from src.etl.publish import rollback_availability
+
+    db_session.add(DwhTennisCourt(park_id='M1', park_name='Park 1'))
+    db_session.commit()
+    db_session.add(DwhCourtAvailability(
+        park_id='M1', court_id='1', date=date.today() + timedelta(days=1), time='9:00 a.m.',
+        status='Available', is_available=True
+    ))
+    db_session.commit()
+
+    report = publish_availability(db_session, [])
+    assert report['slots'] == 1
+    assert db_session.query(DwhCourtAvailability).one().time == '9:00 a.m.'
+
+    # The previous table can be swapped back, and writes still go through the view
+    with test_db.connect() as connection:
+        rollback_availability(connection)
+    db_session.query(DwhCourtAvailability).delete()
+    db_session.commit()
+    assert db_session.query(DwhCourtAvailability).count() == 0
+    db_session.execute(text("DROP TABLE dwh.court_availability_slots_prev"))
+    db_session.commit()
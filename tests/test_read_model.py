@@ -0,0 +1,112 @@
+import json
+import pytest
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+from src.database.models import (
+    DwhTennisCourt, DwhCourtAvailability, DwhParkDayAvailability, DwhDataVersion, DwhAvailabilityChange
+)
+from src.etl.read_model import export_published, refresh_park_days, rebuild_park_days
+
+def test_refresh_park_days_only_touches_staged_files():
+    """Test that a refresh is a new data version scoped to the merged files' park-days."""
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = 12
+    connection.execute.return_value.rowcount = 4
+
+    result = refresh_park_days(connection, [7, 8])
+
+    new_version, expire, refresh, count, notify, prune = connection.execute.call_args_list
+    assert new_version.args[1] == {'file_ids': [7, 8]}
+    assert 'date < current_date' in str(expire.args[0])
+    sql = str(refresh.args[0])
+    assert 'FROM staging.court_availability s WHERE s.file_id = ANY(:file_ids)' in sql
+    assert 'content_hash IS DISTINCT FROM EXCLUDED.content_hash' in sql
+    assert refresh.args[1] == {'file_ids': [7, 8], 'version': 12}
+    assert count.args[1] == {'version': 12, 'changes': 4}
+    assert json.loads(notify.args[1]['payload']) == {'type': 'published', 'version': 12, 'changes': 4}
+    assert prune.args[1]['version'] == 12
+    assert result == {'version': 12, 'changes': 4}
+    connection.commit.assert_not_called()
+
+@patch('src.etl.read_model.export_snapshot')
+def test_export_published_is_best_effort(mock_export, monkeypatch, tmp_path):
+    """Test that a published version is exported, and a failed export doesn't raise."""
+    monkeypatch.setenv('SNAPSHOT_EXPORT_DIR', str(tmp_path))
+    connection = MagicMock()
+    mock_export.return_value = {'version': '12'}
+
+    assert export_published(connection) == '12'
+    mock_export.assert_called_once_with(connection)
+    assert export_published(connection, export=False) is None
+
+    mock_export.side_effect = RuntimeError('disk full')
+    assert export_published(connection) is None
+    # The read transaction is never left open on the writer's connection
+    assert connection.rollback.call_count == 2
+
+@patch('src.etl.read_model.export_snapshot')
+def test_export_published_disabled_by_environment(mock_export):
+    """Test that SNAPSHOT_EXPORT_DIR='' turns exports after publishing off."""
+    assert export_published(MagicMock()) is None
+    mock_export.assert_not_called()
+
+def test_rebuild_park_days_builds_ordered_slots(test_db, db_session):
+    """Test that park-days hold their bookable slots in court and time order with buckets."""
+    day = date.today() + timedelta(days=1)
+    db_session.add(DwhTennisCourt(park_id='M1', park_name='Park 1'))
+    db_session.commit()
+    for court_id, time, is_available in [
+        ('2', '9:00 a.m.', True), ('1', '5:00 p.m.', True), ('1', '1:00 p.m.', True), ('1', '8:00 a.m.', False)
+    ]:
+        db_session.add(DwhCourtAvailability(
+            park_id='M1', court_id=court_id, date=day, time=time, status='Available',
+            reservation_link=f'https://www.nycgovparks.org/tennisreservation/reserve/{len(time)}{court_id}',
+            is_available=is_available
+        ))
+    db_session.commit()
+
+    with test_db.connect() as connection:
+        first = rebuild_park_days(connection)
+        assert first['changes'] == 3
+        # Nothing changed, so nothing is rewritten
+        second = rebuild_park_days(connection)
+        assert (second['version'], second['changes']) == (first['version'] + 1, 0)
+
+    park_day = db_session.query(DwhParkDayAvailability).one()
+    assert park_day.slot_count == 3
+    assert [(slot['court_id'], slot['time'], slot['bucket']) for slot in park_day.slots] == [
+        ('1', '1:00 p.m.', 'afternoon'), ('1', '5:00 p.m.', 'evening'), ('2', '9:00 a.m.', 'morning')
+    ]
+
+def test_rebuild_park_days_records_slot_changes(test_db, db_session):
+    """Test that each version records the slots it added, removed and changed."""
+    day = date.today() + timedelta(days=1)
+    db_session.add(DwhTennisCourt(park_id='M1', park_name='Park 1'))
+    db_session.commit()
+    link = 'https://www.nycgovparks.org/tennisreservation/reserve/1'
+    for time in ['9:00 a.m.', '10:00 a.m.']:
+        db_session.add(DwhCourtAvailability(
+            park_id='M1', court_id='1', date=day, time=time, status='Available',
+            reservation_link=link, is_available=True
+        ))
+    db_session.commit()
+    with test_db.connect() as connection:
+        rebuild_park_days(connection)
+
+    nine, ten = db_session.query(DwhCourtAvailability).order_by(DwhCourtAvailability.id).all()
+    nine.status = 'Reserve'
+    db_session.delete(ten)
+    db_session.add(DwhCourtAvailability(
+        park_id='M1', court_id='2', date=day, time='9:00 a.m.', status='Available',
+        reservation_link=link, is_available=True
+    ))
+    db_session.commit()
+    with test_db.connect() as connection:
+        version = rebuild_park_days(connection)['version']
+
+    changes = db_session.query(DwhAvailabilityChange).filter_by(version=version).all()
+    assert sorted((change.court_id, change.time, change.change) for change in changes) == [
+        ('1', '10:00 a.m.', 'removed'), ('1', '9:00 a.m.', 'changed'), ('2', '9:00 a.m.', 'added')
+    ]
+    assert next(change.slot for change in changes if change.change == 'changed')['status'] == 'Reserve'
+    assert db_session.get(DwhDataVersion, version).changes == 3
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import requests
+from src.request_throttle import AimdController, throttled_request
+
+def make_response(status_code, headers=None):
+    response = MagicMock(status_code=status_code)
+    response.headers = headers or {}
+    return response
+
+def test_additive_increase():
+    """Test that the limit grows by about one per round of healthy responses."""
+    controller = AimdController(initial=2, max_limit=4)
+    for _ in range(2):
+        controller.on_success(0.5)
+    assert int(controller.limit) == 2
+    controller.on_success(0.5)
+    assert int(controller.limit) == 3
+
+    for _ in range(50):
+        controller.on_success(0.5)
+    assert controller.limit == 4
+
+def test_multiplicative_decrease_once_per_round_trip():
+    """Test that a burst of throttled responses only halves the limit once."""
+    controller = AimdController(initial=8)
+    controller.on_success(1.0)
+    controller.on_throttle()
+    controller.on_throttle()
+
+    assert int(controller.limit) == 4
+    assert controller.stats()['throttled'] == 2
+
+def test_latency_spike_decreases_limit():
+    """Test that a response far slower than the average counts as congestion."""
+    controller = AimdController(initial=8)
+    controller._last_decrease = -100
+    for _ in range(5):
+        controller.on_success(0.1)
+    limit = controller.limit
+
+    with patch('src.request_throttle.time.monotonic', return_value=1000):
+        controller.on_success(1.0)
+
+    assert controller.limit == limit / 2
+
+@patch('src.request_throttle.time.sleep')
+def test_throttled_request_retries_with_backoff(mock_sleep):
+    """Test retrying 429s and honouring Retry-After."""
+    controller = AimdController()
+    send = MagicMock(side_effect=[
+        make_response(429, {'Retry-After': '7'}),
+        requests.ConnectionError("reset"),
+        make_response(200),
+    ])
+
+    response = throttled_request(controller, send)
+
+    assert response.status_code == 200
+    assert send.call_count == 3
+    assert mock_sleep.call_args_list[0].args[0] == 7
+    stats = controller.stats()
+    assert stats['retries'] == 2
+    assert stats['failed'] == 0
+
+@patch('src.request_throttle.time.sleep')
+def test_throttled_request_gives_up(mock_sleep):
+    """Test that the last throttled response is returned once retries run out."""
+    controller = AimdController()
+    send = MagicMock(return_value=make_response(503))
+
+    response = throttled_request(controller, send, max_retries=2)
+
+    assert response.status_code == 503
+    assert send.call_count == 3
+    assert controller.stats()['failed'] == 1
+
+@patch('src.request_throttle.time.sleep')
+def test_throttled_request_backoff_stays_within_deadline(mock_sleep):
+    """Test that backoff sleeps are capped by the deadline and no retry starts after it."""
+    controller = AimdController()
+    send = MagicMock(return_value=make_response(429, {'Retry-After': '20'}))
+
+    with patch('src.request_throttle.time.monotonic', side_effect=[0, 1, 1, 1, 2, 11, 11]):
+        response = throttled_request(controller, send, deadline=10)
+
+    assert response.status_code == 429
+    # Half of the 9s left, not the 20s Retry-After
+    assert mock_sleep.call_args_list[0].args[0] == 4.5
+    assert send.call_count == 2
+    assert controller.stats()['failed'] == 1
@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta, date
+import json
+import math
+import pytz
+from src.database.models import ParkScrapeState
+from src.etl.scrape_scheduler import (
+    slot_change_score, scrape_priority, rank_parks, select_parks, record_scrape,
+    MAX_STALENESS, NEAR_TERM_WEIGHT
+)
+
+ET = pytz.timezone('America/New_York')
+NOW = ET.localize(datetime(2025, 8, 11, 12, 0))
+
+def make_record(court_id, slot_date, time='9:00 a.m.'):
+    return {'court_id': court_id, 'date': slot_date, 'time': time}
+
+def test_slot_change_score_weights_near_term_dates():
+    """Test that near-term changes count more than far-off ones."""
+    previous = {'1|2025-08-11|9:00 a.m.', '1|2025-08-18|9:00 a.m.'}
+    current = {'1|2025-08-18|9:00 a.m.', '2|2025-08-19|9:00 a.m.'}
+
+    score = slot_change_score(previous, current, date(2025, 8, 11))
+
+    assert score == NEAR_TERM_WEIGHT + 1.0
+
+def test_scrape_priority():
+    """Test ranking by change rate and time since last scrape."""
+    assert scrape_priority(None, NOW) == math.inf
+
+    stale = ParkScrapeState(park_id='1', change_rate=0.0, last_scraped_at=NOW - MAX_STALENESS)
+    assert scrape_priority(stale, NOW) == math.inf
+
+    hot = ParkScrapeState(park_id='2', change_rate=10.0, last_scraped_at=NOW - timedelta(hours=1))
+    cold = ParkScrapeState(park_id='3', change_rate=0.0, last_scraped_at=NOW - timedelta(hours=5))
+    assert scrape_priority(hot, NOW) > scrape_priority(cold, NOW)
+
+def test_select_parks_respects_budget():
+    """Test that the request budget caps the number of parks scraped."""
+    session = MagicMock()
+    session.query.return_value.filter.return_value = [
+        ParkScrapeState(park_id='1', change_rate=0.0, last_scraped_at=NOW - timedelta(hours=1)),
+        ParkScrapeState(park_id='2', change_rate=5.0, last_scraped_at=NOW - timedelta(hours=1)),
+    ]
+
+    selected = select_parks(['1', '2', '3'], session, request_budget=4, now=NOW)
+
+    # Park 3 was never scraped, then the hot park 2
+    assert selected == ['3', '2']
+    # Ranking keeps every park
+    assert rank_parks(['1', '2', '3'], session, now=NOW) == ['3', '2', '1']
+
+def test_record_scrape_new_park():
+    """Test recording the first scrape of a park."""
+    session = MagicMock()
+    session.get.return_value = None
+
+    state = record_scrape('1', [make_record('5', '2025-08-12')], session, scraped_at=NOW)
+
+    session.add.assert_called_once_with(state)
+    assert state.last_scraped_at == NOW
+    assert state.change_rate == 0.0
+    assert json.loads(state.slot_keys) == ['5|2025-08-12|9:00 a.m.']
+
+def test_record_scrape_updates_change_rate():
+    """Test that observed changes raise the park's change rate."""
+    previous = ParkScrapeState(
+        park_id='1',
+        change_rate=0.0,
+        last_scraped_at=NOW - timedelta(hours=2),
+        slot_keys=json.dumps(['5|2025-08-20|9:00 a.m.'])
+    )
+    session = MagicMock()
+    session.get.return_value = previous
+
+    state = record_scrape('1', [], session, scraped_at=NOW)
+
+    # One far-off slot disappeared over two hours
+    assert state.change_rate == pytest.approx(0.3 * 0.5)
+    assert state.last_changed_at == NOW
+    assert state.slot_keys == '[]'
+
+    # A quiet scrape decays the rate without moving last_changed_at
+    rate = state.change_rate
+    state = record_scrape('1', [], session, scraped_at=NOW + timedelta(hours=1))
+    assert state.change_rate == pytest.approx(0.7 * rate)
+    assert state.last_changed_at == NOW
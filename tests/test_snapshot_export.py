@@ -0,0 +1,51 @@
+import gzip
+import hashlib
+import json
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from src.etl.snapshot_export import export_snapshot, MANIFEST_NAME
+
+def snapshot_data(park_slots):
+    overview = {'version': 3, 'parks': [{'park_id': 'M1', 'park_name': 'Park 1', 'lat': Decimal('40.7831')}]}
+    parks = {
+        park_id: {'park_id': park_id, 'days': {date(2025, 8, 1).isoformat(): slots}}
+        for park_id, slots in park_slots.items()
+    }
+    return overview, parks
+
+@patch('src.etl.snapshot_export.load_snapshot_data')
+def test_export_snapshot_writes_hashed_precompressed_files(mock_load, tmp_path):
+    """Test that every data file is content-addressed, precompressed and listed in the manifest."""
+    slots = [{'court_id': '1', 'time': '9:00 a.m.', 'bucket': 'morning'}]
+    mock_load.return_value = snapshot_data({'M1': slots})
+
+    manifest = export_snapshot(connection=object(), export_dir=tmp_path, version='v1')
+
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest
+    entry = manifest['parks']['M1']
+    raw = (tmp_path / entry['path']).read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    assert entry['sha256'] == digest
+    assert entry['path'] == f"files/park-M1-{digest[:16]}.json"
+    assert 'gz' in entry['encodings']
+    assert gzip.decompress((tmp_path / (entry['path'] + '.gz')).read_bytes()) == raw
+    assert json.loads(raw)['days']['2025-08-01'] == slots
+    overview = json.loads((tmp_path / manifest['overview']['path']).read_bytes())
+    assert overview['parks'][0]['lat'] == 40.7831
+
+@patch('src.etl.snapshot_export.load_snapshot_data')
+def test_export_snapshot_keeps_unchanged_files_and_prunes_old_versions(mock_load, tmp_path):
+    """Test that unchanged parks keep their URL and files older than the previous manifest are deleted."""
+    manifests = []
+    for version, m2_time in enumerate(['9:00 a.m.', '10:00 a.m.', '11:00 a.m.']):
+        mock_load.return_value = snapshot_data({'M1': [], 'M2': [{'court_id': '1', 'time': m2_time}]})
+        manifests.append(export_snapshot(connection=object(), export_dir=tmp_path, version=str(version)))
+
+    first, second, third = manifests
+    assert first['parks']['M1']['path'] == third['parks']['M1']['path']
+    assert len({manifest['parks']['M2']['path'] for manifest in manifests}) == 3
+    files = {path.name for path in (tmp_path / 'files').iterdir()}
+    assert second['parks']['M2']['path'].split('/')[-1] in files
+    assert first['parks']['M2']['path'].split('/')[-1] not in files
+    assert not any(name.endswith('.tmp') for name in files)
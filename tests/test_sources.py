@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+import json
+from datetime import datetime
+import pandas as pd
+from src import sources
+from src.court_availability_finder import get_availability_data, scrape_parks_pipelined
+from src.sources import get_source
+from src.sources.base import SourceAdapter
+from src.sources.nyc_parks import NycParksSource
+
+class FakeClubSource(SourceAdapter):
+    """A JSON reservation API with its own field names."""
+
+    name = 'fake_club'
+
+    def load_parks(self):
+        return pd.DataFrame({'court_id': ['club-1']})
+
+    def fetch(self, park_id, timeout, controller=None, deadline=None):
+        return json.dumps([{'day': '2026-08-12', 'start': '9:00 a.m.', 'court': 3, 'book': 'https://club/3'}])
+
+    def parse(self, page, park_id, fetched_at, cache=None):
+        return json.loads(page)
+
+    def normalize(self, record, park_id):
+        return {
+            'park_id': park_id,
+            'date': record['day'],
+            'time': record['start'],
+            'court_id': record['court'],
+            'status': 'Reserve this time',
+            'reservation_link': record['book'],
+            'is_available': True,
+        }
+
+@pytest.fixture
+def fake_source():
+    with patch.dict(sources.SOURCES, {'fake_club': 'tests.test_sources:FakeClubSource'}):
+        yield
+    sources._instances.pop('fake_club', None)
+
+def test_get_source():
+    """Test looking up registered adapters."""
+    assert isinstance(get_source(), NycParksSource)
+    with pytest.raises(ValueError):
+        get_source('unknown')
+
+def test_adapter_records_are_normalized(fake_source):
+    """Test that an adapter's records come out as slot records."""
+    records = get_availability_data('club-1', source='fake_club')
+
+    assert records == [{
+        'park_id': 'club-1',
+        'date': '2026-08-12',
+        'time': '9:00 a.m.',
+        'court_id': '3',
+        'status': 'Reserve this time',
+        'reservation_link': 'https://club/3',
+        'is_available': True,
+    }]
+
+def test_adapter_uses_shared_runtime(fake_source):
+    """Test that a new source runs through the pipelined scraper unchanged."""
+    courts_df = get_source('fake_club').load_parks()
+
+    results = dict(scrape_parks_pipelined(courts_df, fetch_workers=1, parse_workers=1, source='fake_club'))
+
+    assert [r['court_id'] for r in results['club-1']] == ['3']